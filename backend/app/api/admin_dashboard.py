@@ -2,34 +2,46 @@
 
 from datetime import date, datetime, timezone
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Response
 from sqlalchemy.orm import Session
 
+from backend.app.core.responses import FastJSONResponse, fast_response
 from backend.app.core.security import get_current_user
 from backend.app.db.session import get_db
+from backend.app.dependencies.conditional import report_etag
+from backend.app.dependencies.student_lists import student_list_params
 from backend.app.schemas.admin_reporting import OwnerDashboardSummary, StudentDashboardList
 from backend.app.services.dashboard_service import get_owner_dashboard_summary, get_student_dashboard_list
+from backend.app.services.student_kpis import refresh_student_kpis_task
 
-router = APIRouter(prefix="/admin/dashboard", tags=["dashboard"])
+router = APIRouter(prefix="/admin/dashboard", tags=["dashboard"], dependencies=[Depends(report_etag)])
 
 
-@router.get("/summary", response_model=OwnerDashboardSummary)
+@router.get("/summary", response_model=OwnerDashboardSummary, response_class=FastJSONResponse)
 async def get_owner_dashboard_summary_endpoint(
+    response: Response,
     today: date | None = None,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     """Owner dashboard summary cards."""
     effective_today = today or datetime.now(timezone.utc).date()
-    return get_owner_dashboard_summary(db=db, owner_id=current_user.id, today=effective_today)
+    report = get_owner_dashboard_summary(db=db, owner_id=current_user.id, today=effective_today)
+    return fast_response(OwnerDashboardSummary, report, response)
 
 
-@router.get("/students", response_model=StudentDashboardList)
+@router.get("/students", response_model=StudentDashboardList, response_class=FastJSONResponse)
 async def get_student_dashboard_list_endpoint(
+    response: Response,
+    background_tasks: BackgroundTasks,
     today: date | None = None,
+    params: dict = Depends(student_list_params),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    """Per-student dashboard rows for the current owner."""
+    """One sorted, filtered page of per-student dashboard rows for the current owner."""
     effective_today = today or datetime.now(timezone.utc).date()
-    return get_student_dashboard_list(db=db, owner_id=current_user.id, today=effective_today)
+    report = get_student_dashboard_list(db=db, owner_id=current_user.id, today=effective_today, **params)
+    # The read never writes; stale KPI snapshots are rebuilt after the response is sent.
+    background_tasks.add_task(refresh_student_kpis_task, current_user.id, effective_today)
+    return fast_response(StudentDashboardList, report, response)
@@ -2,11 +2,15 @@
 
 from datetime import date, datetime, timezone
 
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from backend.app.core.responses import FastJSONResponse, fast_response
 from backend.app.core.security import get_current_user
 from backend.app.db.session import get_db
+from backend.app.dependencies.conditional import lead_report_etag, report_etag
+from backend.app.dependencies.student_lists import student_list_params
 from backend.app.models.user import User
 from backend.app.schemas.admin_reporting import ActivitySummary, AgingSummary
 from backend.app.services.activity_reporting import get_activity_summary
@@ -19,77 +23,133 @@ from backend.app.schemas.admin_reporting import (
     ParentReportWithNarrative,
     OwnerDashboardSummary,
     StudentDashboardList,
+    LeadFunnelReport,
 )
 from backend.app.services.invoice_pipeline_reporting import get_invoice_pipeline_summary
+from backend.app.services.lead_funnel_reporting import get_lead_funnel
 from backend.app.services.payment_analytics_reporting import get_payment_analytics
-from backend.app.services.student_analytics_reporting import get_student_analytics
 from backend.app.services.parent_report_service import get_parent_report
 from backend.app.services.parent_report_narrative_service import get_parent_report_with_narrative
-from backend.app.services.parent_report_export_service import get_parent_report_export_bytes
+from backend.app.services.parent_report_batch_service import iter_parent_reports_zip
+from backend.app.services.parent_report_export_service import iter_parent_report_export
+from backend.app.services.jobs import INLINE_WAIT_SECONDS, serve_job
 from backend.app.services.dashboard_service import get_owner_dashboard_summary, get_student_dashboard_list
 from backend.app.services.reports import get_financial_summary_for_owner
+from backend.app.services.student_kpis import refresh_student_kpis_task
 
 router = APIRouter(prefix="/admin/reports", tags=["admin-reports"])
+# Every report except the lead funnel shares the students/sessions/billing ETag.
+reports = APIRouter(dependencies=[Depends(report_etag)])
 
 
-@router.get("/financial-summary")
+def _inline_wait(request: Request) -> float:
+    # "Prefer: respond-async" asks for the 202 + job straight away.
+    return 0 if "respond-async" in request.headers.get("prefer", "") else INLINE_WAIT_SECONDS
+
+
+def _check_range(start_date: date | None, end_date: date | None) -> None:
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must be on or before end_date")
+
+
+@reports.get("/financial-summary")
 async def financial_summary(
     start_date: date | None = None,
     end_date: date | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    _check_range(start_date, end_date)
     summary = get_financial_summary_for_owner(db, current_user.id, start_date, end_date)
     return summary
 
 
-@router.get("/activity-summary", response_model=ActivitySummary)
+@reports.get("/activity-summary", response_model=ActivitySummary, response_class=FastJSONResponse)
 async def activity_summary(
+    response: Response,
     start_date: date | None = None,
-    end_date: date | None = None,  # accepted for compatibility but not used
+    end_date: date | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return get_activity_summary(db, owner_id=current_user.id, start_date=start_date)
+    _check_range(start_date, end_date)
+    report = get_activity_summary(db, owner_id=current_user.id, start_date=start_date, end_date=end_date)
+    return fast_response(ActivitySummary, report, response)
 
 
-@router.get("/aging-summary", response_model=AgingSummary)
+@reports.get("/aging-summary", response_model=AgingSummary, response_class=FastJSONResponse)
 async def aging_summary(
+    response: Response,
     as_of: date | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return get_aging_summary(db, owner_id=current_user.id, as_of=as_of)
+    report = get_aging_summary(db, owner_id=current_user.id, as_of=as_of)
+    return fast_response(AgingSummary, report, response)
 
 
-@router.get("/invoice-pipeline", response_model=InvoicePipelineSummary)
+@reports.get("/invoice-pipeline", response_model=InvoicePipelineSummary, response_class=FastJSONResponse)
 async def invoice_pipeline(
+    response: Response,
     today: date | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return get_invoice_pipeline_summary(db, owner_id=current_user.id, today=today)
+    report = get_invoice_pipeline_summary(db, owner_id=current_user.id, today=today)
+    return fast_response(InvoicePipelineSummary, report, response)
 
 
-@router.get("/payment-analytics", response_model=PaymentAnalytics)
+@reports.get("/payment-analytics", response_model=PaymentAnalytics, response_class=FastJSONResponse)
 async def payment_analytics(
+    response: Response,
     today: date | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return get_payment_analytics(db, owner_id=current_user.id, today=today)
+    report = get_payment_analytics(db, owner_id=current_user.id, today=today)
+    return fast_response(PaymentAnalytics, report, response)
 
 
-@router.get("/student-analytics", response_model=StudentAnalyticsReport)
+@reports.get("/student-analytics", response_model=StudentAnalyticsReport, response_class=FastJSONResponse)
 async def student_analytics(
+    request: Request,
+    response: Response,
     today: date | None = None,
+    params: dict = Depends(student_list_params),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return get_student_analytics(db, owner_id=current_user.id, today=today)
+    """Per-student analytics for one page of students, sorted and filtered on their KPIs.
 
+    Computed by a ``student_analytics`` job; see ``serve_job`` for the 202 case.
+    """
+    effective_today = today or datetime.now(timezone.utc).date()
+    return await serve_job(
+        db,
+        owner_id=current_user.id,
+        kind="student_analytics",
+        params={**params, "today": effective_today},
+        headers=dict(response.headers),
+        wait=_inline_wait(request),
+    )
 
-@router.get("/parent-report/{student_id}", response_model=ParentReport)
+
+@router.get(
+    "/lead-funnel",
+    response_model=LeadFunnelReport,
+    response_class=FastJSONResponse,
+    dependencies=[Depends(lead_report_etag)],
+)
+async def lead_funnel(
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    report = get_lead_funnel(db, owner_id=current_user.id)
+    return fast_response(LeadFunnelReport, report, response)
+
+
+@reports.get("/parent-report/{student_id}", response_model=ParentReport)
 async def parent_report(
     student_id: int,
     today: date | None = None,
@@ -109,7 +169,7 @@ async def parent_report(
     )
 
 
-@router.get("/parent-report/{student_id}/narrative", response_model=ParentReportWithNarrative)
+@reports.get("/parent-report/{student_id}/narrative", response_model=ParentReportWithNarrative)
 async def parent_report_narrative(
     student_id: int,
     today: date | None = None,
@@ -129,48 +189,100 @@ async def parent_report_narrative(
     )
 
 
-@router.get(
+@reports.get(
     "/parent-report/{student_id}/export/pdf",
     response_class=Response,
 )
 async def parent_report_export_pdf(
     student_id: int,
+    request: Request,
+    response: Response,
     today: date | None = None,
     start_date: date | None = None,
     end_date: date | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    """The parent report as a PDF, streamed page by page from the render (or the cache).
+
+    With ``Prefer: respond-async`` it is rendered by a ``parent_report_export``
+    job instead and the answer is 202 with the job to poll.
+    """
     effective_today = today or date.today()
-    pdf_bytes = get_parent_report_export_bytes(
-        db=db,
+    headers = {
+        **response.headers,
+        "Content-Disposition": f'attachment; filename="parent_report_{student_id}.pdf"',
+    }
+    if _inline_wait(request) == 0:
+        return await serve_job(
+            db,
+            owner_id=current_user.id,
+            kind="parent_report_export",
+            params={"student_id": student_id, "today": effective_today, "start_date": start_date, "end_date": end_date},
+            headers=headers,
+            wait=0,
+        )
+    chunks = iter_parent_report_export(
+        db,
         owner_id=current_user.id,
         student_id=student_id,
         today=effective_today,
         start_date=start_date,
         end_date=end_date,
     )
+    return StreamingResponse(chunks, media_type="application/pdf", headers=headers)
+
+
+@reports.get("/parent-reports/export.zip", response_class=StreamingResponse)
+async def parent_reports_export_zip(
+    response: Response,
+    today: date | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """All active students' parent reports, one file per student, streamed as a ZIP."""
+    effective_today = today or date.today()
+    chunks = iter_parent_reports_zip(
+        db,
+        owner_id=current_user.id,
+        today=effective_today,
+        start_date=start_date,
+        end_date=end_date,
+    )
     headers = {
-        "Content-Disposition": f'attachment; filename="parent_report_{student_id}.pdf"'
+        **response.headers,
+        "Content-Disposition": f'attachment; filename="parent_reports_{effective_today.isoformat()}.zip"',
     }
-    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+    return StreamingResponse(chunks, media_type="application/zip", headers=headers)
 
 
-@router.get("/dashboard/summary", response_model=OwnerDashboardSummary)
+@reports.get("/dashboard/summary", response_model=OwnerDashboardSummary, response_class=FastJSONResponse)
 async def owner_dashboard_summary(
+    response: Response,
     today: date | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     effective_today = today or datetime.now(timezone.utc).date()
-    return get_owner_dashboard_summary(db=db, owner_id=current_user.id, today=effective_today)
+    report = get_owner_dashboard_summary(db=db, owner_id=current_user.id, today=effective_today)
+    return fast_response(OwnerDashboardSummary, report, response)
 
 
-@router.get("/dashboard/students", response_model=StudentDashboardList)
+@reports.get("/dashboard/students", response_model=StudentDashboardList, response_class=FastJSONResponse)
 async def student_dashboard_list(
+    response: Response,
+    background_tasks: BackgroundTasks,
     today: date | None = None,
+    params: dict = Depends(student_list_params),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     effective_today = today or datetime.now(timezone.utc).date()
-    return get_student_dashboard_list(db=db, owner_id=current_user.id, today=effective_today)
+    report = get_student_dashboard_list(db=db, owner_id=current_user.id, today=effective_today, **params)
+    background_tasks.add_task(refresh_student_kpis_task, current_user.id, effective_today)
+    return fast_response(StudentDashboardList, report, response)
+
+
+router.include_router(reports)
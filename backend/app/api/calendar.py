@@ -0,0 +1,26 @@
+"""Calendar endpoints: sessions by day or week."""
+
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from backend.app.core.security import get_current_user
+from backend.app.db.session import get_db
+from backend.app.models.user import User
+from backend.app.schemas.session import CalendarView
+from backend.app.services.schedule import get_calendar
+
+router = APIRouter(prefix="/calendar", tags=["calendar"])
+
+
+@router.get("/", response_model=CalendarView)
+async def read_calendar(
+    view: Literal["day", "week"] = "week",
+    day: date = Query(..., alias="date"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Active sessions in the day or Monday-based week containing ``date``, with overlapping pairs."""
+    return get_calendar(db, owner_id=current_user.id, view=view, day=day)
@@ -0,0 +1,46 @@
+"""Streaming data exports for accountants."""
+
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.app.core.security import get_current_user
+from backend.app.db.session import SessionLocal
+from backend.app.models.user import User
+from backend.app.services.exports import (
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+    export_filename,
+    export_media_type,
+    iter_export,
+)
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+@router.get("/{dataset}", response_class=StreamingResponse)
+async def export_dataset(
+    dataset: str,
+    format: str = "csv",
+    gzip: bool = False,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    current_user: User = Depends(get_current_user),
+):
+    """Stream ``sessions``, ``invoices`` (with items) or ``payments`` as CSV or NDJSON."""
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail="Unknown export")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+    chunks = iter_export(
+        SessionLocal,
+        owner_id=current_user.id,
+        dataset=dataset,
+        fmt=format,
+        compress=gzip,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    headers = {"Content-Disposition": f'attachment; filename="{export_filename(dataset, format, gzip)}"'}
+    return StreamingResponse(chunks, media_type=export_media_type(format, gzip), headers=headers)
@@ -0,0 +1,33 @@
+"""Submit background jobs, poll their status and download results."""
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+
+from backend.app.core.security import get_current_user
+from backend.app.db.session import get_db
+from backend.app.models.user import User
+from backend.app.schemas.job import JobCreate, JobRead
+from backend.app.services.jobs import enqueue_job, get_owned_job
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("", response_model=JobRead, status_code=202)
+async def submit_job(job_in: JobCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return enqueue_job(db, owner_id=current_user.id, kind=job_in.kind, params=job_in.params)
+
+
+@router.get("/{job_id}", response_model=JobRead)
+async def get_job(job_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return get_owned_job(db, job_id, current_user.id)
+
+
+@router.get("/{job_id}/result", response_class=Response)
+async def download_job_result(job_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    job = get_owned_job(db, job_id, current_user.id)
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail="Job has not finished")
+    headers = {"Content-Disposition": f'attachment; filename="{job.result_filename}"'}
+    return Response(content=job.result, media_type=job.result_media_type, headers=headers)
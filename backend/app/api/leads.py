@@ -50,7 +50,7 @@ async def create_lead(lead_in: LeadCreate, db: Session = Depends(get_db), curren
     db.add(lead)
     db.commit()
     db.refresh(lead)
-    log_event(db, lead.id, current_user.id, "lead_created", "Lead created")
+    log_event(db, lead.id, current_user.id, "lead_created", "Lead created", to_status=lead.status)
     return lead
 
 
@@ -136,7 +136,15 @@ async def update_lead(lead_id: int, lead_in: LeadUpdate, db: Session = Depends(g
     db.commit()
     db.refresh(lead)
     if "status" in changed_fields:
-        log_event(db, lead.id, current_user.id, "status_changed", f"Status changed from {old_status} to {lead.status}")
+        log_event(
+            db,
+            lead.id,
+            current_user.id,
+            "status_changed",
+            f"Status changed from {old_status} to {lead.status}",
+            from_status=old_status,
+            to_status=lead.status,
+        )
     non_status_changes = [f for f in changed_fields if f != "status"]
     if non_status_changes:
         description = "Lead updated: " + "; ".join(f"{f} changed" for f in non_status_changes)
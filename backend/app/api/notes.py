@@ -1,8 +1,11 @@
 """Lead notes endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
+from backend.app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, keyset_page, parse_cursor
 from backend.app.dependencies.auth import get_current_user
 from backend.app.db.session import get_db
 from backend.app.models.lead import Lead
@@ -40,13 +43,17 @@ async def create_note(
 @router.get("/{lead_id}/notes", response_model=list[NoteRead])
 async def list_notes(
     lead_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    """Oldest-first page of a lead's notes; ``X-Next-Cursor`` is set when more notes follow."""
     _get_owned_lead(db, lead_id, current_user.id)
-    return (
-        db.query(Note)
-        .filter(Note.lead_id == lead_id, Note.owner_id == current_user.id)
-        .order_by(Note.created_at.asc())
-        .all()
-    )
+    # Ownership is checked on the lead; filtering on lead_id alone keeps the scan on the per-lead index.
+    query = db.query(Note).filter(Note.lead_id == lead_id)
+    notes, next_cursor = keyset_page(query, Note.created_at, Note.id, cursor=parse_cursor(cursor), limit=limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return notes
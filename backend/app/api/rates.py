@@ -10,6 +10,7 @@ from backend.app.db.session import get_db
 from backend.app.models.rate_history import RateHistory
 from backend.app.models.user import User
 from backend.app.schemas.rate_history import RateHistoryCreate, RateHistoryRead
+from backend.app.services.rate_resolution import get_owner_rates, invalidate_owner_rates
 
 router = APIRouter(prefix="/rates", tags=["rates"])
 
@@ -23,6 +24,7 @@ async def create_rate(rate_in: RateHistoryCreate, db: Session = Depends(get_db),
     )
     db.add(rate)
     db.commit()
+    invalidate_owner_rates(current_user.id)
     db.refresh(rate)
     return rate
 
@@ -38,14 +40,9 @@ async def list_rates(db: Session = Depends(get_db), current_user: User = Depends
 
 
 @router.get("/current")
-async def get_current_rate(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    now = datetime.now(timezone.utc)
-    rate = (
-        db.query(RateHistory)
-        .filter(RateHistory.owner_id == current_user.id, RateHistory.effective_at <= now)
-        .order_by(RateHistory.effective_at.desc())
-        .first()
-    )
-    if rate:
-        return {"rate_per_hour": float(rate.rate_per_hour)}
-    return {"rate_per_hour": 60.0}
+async def get_current_rate(
+    at: datetime | None = None, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+):
+    """Hourly rate effective now, or at ``at`` for pricing past or future sessions."""
+    when = at or datetime.now(timezone.utc)
+    return {"rate_per_hour": float(get_owner_rates(db, current_user.id).hourly_rate_at(when))}
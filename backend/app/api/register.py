@@ -5,13 +5,10 @@ from sqlalchemy.orm import Session
 
 from backend.app.api import auth  # ensures router package export
 from backend.app.core.security import get_password_hash
-from backend.app.db.base import Base
-from backend.app.db.session import SessionLocal, engine, get_db
+from backend.app.db.session import get_db
 from backend.app.models.user import User
 from backend.app.schemas.user import UserCreate, UserRead
 
-Base.metadata.create_all(bind=engine)
-
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
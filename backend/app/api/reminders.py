@@ -1,16 +1,19 @@
 """Reminder endpoints for follow-up tasks on leads."""
 
 from datetime import datetime, timezone
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
+from backend.app.core.pagination import NEXT_CURSOR_HEADER, parse_cursor
 from backend.app.dependencies.auth import get_current_user
 from backend.app.db.session import get_db
 from backend.app.models.lead import Lead
 from backend.app.models.reminder import Reminder
 from backend.app.models.user import User
-from backend.app.schemas.reminder import ReminderCreate, ReminderRead, ReminderUpdate
+from backend.app.schemas.reminder import DueReminders, ReminderCreate, ReminderRead, ReminderUpdate
+from backend.app.services.reminders import DUE_REMINDERS_LIMIT, get_due_reminders, reminder_scheduler
 from backend.app.services.timeline import log_event
 
 router = APIRouter(prefix="/reminders", tags=["reminders"])
@@ -47,6 +50,7 @@ async def create_reminder(
     db.add(reminder)
     db.commit()
     db.refresh(reminder)
+    reminder_scheduler.schedule(reminder.id, reminder.due_at)
     log_event(db, lead.id, current_user.id, "reminder_created", f"Reminder created: {reminder.title}")
     return reminder
 
@@ -66,6 +70,28 @@ async def list_reminders(
     )
 
 
+@router.get("/due", response_model=DueReminders)
+async def list_due_reminders(
+    response: Response,
+    until: Optional[datetime] = Query(None, description="Upper bound (exclusive); defaults to the end of today, UTC"),
+    include_overdue: bool = True,
+    cursor: Optional[str] = None,
+    limit: int = Query(DUE_REMINDERS_LIMIT, ge=1, le=DUE_REMINDERS_LIMIT),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Open reminders across all of the owner's leads, overdue first, ordered by due time.
+
+    ``X-Next-Cursor`` is set when more reminders follow; pass it back as ``cursor`` for the next page.
+    """
+    result = get_due_reminders(
+        db, current_user.id, until=until, include_overdue=include_overdue, cursor=parse_cursor(cursor), limit=limit
+    )
+    if result["next_cursor"]:
+        response.headers[NEXT_CURSOR_HEADER] = result["next_cursor"]
+    return result
+
+
 @router.put("/{reminder_id}", response_model=ReminderRead)
 async def update_reminder(
     reminder_id: int,
@@ -78,6 +104,7 @@ async def update_reminder(
         reminder.title = reminder_in.title
     if reminder_in.due_at is not None:
         reminder.due_at = reminder_in.due_at
+        reminder.notified_due_at = None
     if reminder_in.completed is not None and reminder_in.completed != reminder.completed:
         reminder.completed = reminder_in.completed
         if reminder.completed:
@@ -88,6 +115,10 @@ async def update_reminder(
             reminder.completed_at = None
     db.commit()
     db.refresh(reminder)
+    if reminder.completed:
+        reminder_scheduler.cancel(reminder.id)
+    else:
+        reminder_scheduler.schedule(reminder.id, reminder.due_at)
     return reminder
 
 
@@ -101,5 +132,6 @@ async def delete_reminder(
     lead_id = reminder.lead_id
     db.delete(reminder)
     db.commit()
+    reminder_scheduler.cancel(reminder_id)
     log_event(db, lead_id, current_user.id, "reminder_deleted", f"Reminder deleted: {reminder_id}")
     return {"status": "deleted", "id": reminder_id}
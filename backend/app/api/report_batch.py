@@ -0,0 +1,25 @@
+"""Batch endpoint returning several owner reports in one round trip."""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from backend.app.core.responses import FastJSONResponse, fast_response
+from backend.app.core.security import get_current_user
+from backend.app.db.session import get_db
+from backend.app.models.user import User
+from backend.app.schemas.admin_reporting import ReportBatchRequest, ReportBatchResponse
+from backend.app.services.report_batch import run_report_batch
+
+# No ETag dependency here: the result depends on the request body, not the URL.
+router = APIRouter(prefix="/admin/reports", tags=["admin-reports"])
+
+
+@router.post("/batch", response_model=ReportBatchResponse, response_class=FastJSONResponse)
+def report_batch(
+    batch_in: ReportBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Compute the requested reports from one snapshot; each result carries its own status and timing."""
+    report = run_report_batch(db, owner_id=current_user.id, reports=[item.model_dump() for item in batch_in.reports])
+    return fast_response(ReportBatchResponse, report)
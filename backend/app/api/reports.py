@@ -3,13 +3,14 @@
 from datetime import date
 from typing import List
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Path, Query
 from sqlalchemy.orm import Session
 
 from backend.app.core.security import get_current_user
 from backend.app.db.session import get_db
 from backend.app.models.user import User
-from backend.app.schemas.reports import MonthlyRevenueRow
+from backend.app.schemas.reports import MonthlyRevenueRow, PeriodCloseResult, PeriodSnapshotRead, ReportingPeriod
+from backend.app.services.period_close import close_periods, closed_through, list_period_snapshots, reopen_periods
 from backend.app.services.reports import get_monthly_revenue_for_user
 
 router = APIRouter(prefix="/reports", tags=["reports"])
@@ -23,3 +24,30 @@ async def get_monthly_revenue(
     current_user: User = Depends(get_current_user),
 ):
     return get_monthly_revenue_for_user(db, current_user, from_date, to_date)
+
+
+@router.get("/periods", response_model=List[PeriodSnapshotRead])
+async def list_closed_periods(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """Closed months with their frozen figures, newest first."""
+    return list_period_snapshots(db, current_user.id)
+
+
+@router.post("/periods/close", response_model=PeriodCloseResult)
+async def close_period(
+    period: ReportingPeriod, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+):
+    """Freeze this month's figures, closing any earlier open months first."""
+    closed = close_periods(db, current_user.id, through=(period.year, period.month))
+    watermark = closed_through(db, current_user.id)
+    return {"closed": closed, "closed_through": {"year": watermark[0], "month": watermark[1]} if watermark else None}
+
+
+@router.delete("/periods/{year}/{month}")
+async def reopen_period(
+    year: int,
+    month: int = Path(..., ge=1, le=12),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Reopen a closed month and every month after it."""
+    return {"reopened": reopen_periods(db, current_user.id, since=(year, month))}
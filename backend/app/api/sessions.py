@@ -1,19 +1,38 @@
 """Session endpoints for CoreBox CRM."""
 
 from decimal import Decimal
-from datetime import datetime, timezone, date
+from datetime import datetime, timedelta, timezone, date
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from backend.app.core.security import get_current_user
+from backend.app.core.time import date_range_filters
 from backend.app.db.session import get_db
-from backend.app.models.rate_history import RateHistory
-from backend.app.models.rate_settings import RateSettings
-from backend.app.models.session import Session as SessionModel
+from backend.app.models.session import Session as SessionModel, session_bounds
 from backend.app.models.student import Student
 from backend.app.models.user import User
-from backend.app.schemas.session import SessionCreate, SessionRead, SessionUpdate
+from backend.app.schemas.session import (
+    MAX_SERIES_OCCURRENCES,
+    SessionCreate,
+    SessionRead,
+    SessionRepricingReport,
+    SessionRepricingRequest,
+    SessionSeriesCreate,
+    SessionSeriesCreated,
+    SessionUpdate,
+)
+from backend.app.services.data_versions import bump_versions
+from backend.app.services.rate_resolution import SESSION_DURATIONS, OwnerRates, get_owner_rates
+from backend.app.services.repricing import reprice_sessions
+from backend.app.services.schedule import (
+    INACTIVE_STATUSES,
+    MAX_SESSION_MINUTES,
+    SCHEDULE_CONFLICTS_HEADER,
+    find_schedule_conflicts,
+)
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
@@ -43,51 +62,18 @@ def _get_owned_session(db: Session, session_id: int, user_id: int) -> SessionMod
 
 
 def _get_current_rate(db: Session, user_id: int) -> float:
-    now = datetime.now(timezone.utc)
-    rate = (
-        db.query(RateHistory)
-        .filter(RateHistory.owner_id == user_id, RateHistory.effective_at <= now)
-        .order_by(RateHistory.effective_at.desc())
-        .first()
-    )
-    if rate:
-        return float(rate.rate_per_hour)
-    return 60.0
-
-
-def _get_rate_settings(db: Session, owner_id: int) -> RateSettings | None:
-    settings = db.query(RateSettings).filter(RateSettings.owner_id == owner_id).first()
-    if settings:
-        return settings
-    settings = RateSettings(owner_id=owner_id)
-    db.add(settings)
-    db.commit()
-    db.refresh(settings)
-    return settings
+    return float(get_owner_rates(db, user_id).hourly_rate_at(datetime.now(timezone.utc)))
 
 
-def _select_rate(settings: RateSettings | None, plan: str, duration_minutes: int) -> float:
-    if settings is None:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Session rates are not configured.")
-
-    if duration_minutes not in (30, 45, 60):
+def _select_rate(rates: OwnerRates, plan: str, duration_minutes: int) -> float:
+    if duration_minutes not in SESSION_DURATIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Unsupported session duration. Allowed durations are 30, 45, or 60 minutes.",
         )
 
-    plan_key = plan or "regular"
-    rate_lookup = {
-        ("regular", 60): settings.regular_rate_60,
-        ("regular", 45): settings.regular_rate_45,
-        ("regular", 30): settings.regular_rate_30,
-        ("discount", 60): settings.discount_rate_60,
-        ("discount", 45): settings.discount_rate_45,
-        ("discount", 30): settings.discount_rate_30,
-    }
-
-    rate_value = rate_lookup.get((plan_key, duration_minutes))
-    if rate_value is None or float(rate_value) <= 0:
+    rate_value = rates.session_rate(plan, duration_minutes)
+    if rate_value is None or rate_value <= 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Rate for this duration and plan is not configured. Please set it in Session Rates.",
@@ -108,39 +94,132 @@ def _serialize_session(session_obj: SessionModel, current_user: User) -> dict:
     return data
 
 
-@router.post("/", response_model=SessionRead, status_code=status.HTTP_201_CREATED)
-async def create_session(session_in: SessionCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    student = _get_owned_student(db, session_in.student_id, current_user.id)
-    settings = _get_rate_settings(db, current_user.id)
+def _resolve_plan_and_rate(db: Session, student: Student, owner_id: int, duration_minutes: int) -> tuple[str, float]:
     parent_user = student.parent_links[0].parent_user if getattr(student, "parent_links", None) else None
     plan = getattr(parent_user, "rate_plan", None) or "regular"
+    return plan, _select_rate(get_owner_rates(db, owner_id), plan, duration_minutes)
 
-    selected_rate = _select_rate(settings, plan, session_in.duration_minutes)
-    rate_to_use = session_in.rate_per_hour if session_in.rate_per_hour is not None else selected_rate
-    cost_total = selected_rate
-    session_obj = SessionModel(
-        owner_id=current_user.id,
-        student_id=student.id,
-        subject=session_in.subject,
-        duration_minutes=session_in.duration_minutes,
-        session_date=session_in.session_date,
-        start_time=session_in.start_time,
-        notes=session_in.notes,
-        rate_per_hour=rate_to_use,
-        cost_total=cost_total,
-        attendance=session_in.attendance or "present",
-        session_type=session_in.session_type,
-        attendance_status=session_in.attendance_status or "scheduled",
-        billing_status=session_in.billing_status or "not_applicable",
-        is_billable=session_in.is_billable if session_in.is_billable is not None else True,
-        rate_plan=plan,
-    )
+
+def _session_values(session_in: SessionCreate, owner_id: int, plan: str, selected_rate: float) -> dict:
+    return {
+        "owner_id": owner_id,
+        "student_id": session_in.student_id,
+        "subject": session_in.subject,
+        "duration_minutes": session_in.duration_minutes,
+        "session_date": session_in.session_date,
+        "start_time": session_in.start_time,
+        "notes": session_in.notes,
+        "rate_per_hour": session_in.rate_per_hour if session_in.rate_per_hour is not None else selected_rate,
+        "cost_total": selected_rate,
+        "attendance": session_in.attendance or "present",
+        "session_type": session_in.session_type,
+        "attendance_status": session_in.attendance_status or "scheduled",
+        "billing_status": session_in.billing_status or "not_applicable",
+        "is_billable": session_in.is_billable if session_in.is_billable is not None else True,
+        "rate_plan": plan,
+    }
+
+
+def _check_schedule(
+    db: Session,
+    owner_id: int,
+    intervals: list[tuple[datetime, datetime]],
+    on_conflict: str,
+    response: Response,
+    exclude_ids: tuple[int, ...] = (),
+) -> None:
+    """Report overlaps with existing sessions in a response header, or reject them with 409."""
+    conflicts = find_schedule_conflicts(db, owner_id, intervals, exclude_ids=exclude_ids)
+    if not conflicts:
+        return
+    if on_conflict == "reject":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Session overlaps existing sessions: {', '.join(str(session_id) for session_id in conflicts)}",
+        )
+    response.headers[SCHEDULE_CONFLICTS_HEADER] = ",".join(str(session_id) for session_id in conflicts)
+
+
+def series_dates(series_in: SessionSeriesCreate) -> list[datetime]:
+    step = timedelta(weeks=2 if series_in.frequency == "biweekly" else 1)
+    first = series_in.session_date
+    if series_in.count is not None:
+        return [first + step * k for k in range(series_in.count)]
+    dates = []
+    current = first
+    while current.date() <= series_in.end_date:
+        dates.append(current)
+        current += step
+    return dates
+
+
+@router.post("/", response_model=SessionRead, status_code=status.HTTP_201_CREATED)
+async def create_session(
+    session_in: SessionCreate,
+    response: Response,
+    on_conflict: Literal["allow", "reject"] = "allow",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    student = _get_owned_student(db, session_in.student_id, current_user.id)
+    plan, selected_rate = _resolve_plan_and_rate(db, student, current_user.id, session_in.duration_minutes)
+    values = _session_values(session_in, current_user.id, plan, selected_rate)
+    if values["attendance_status"] not in INACTIVE_STATUSES:
+        bounds = session_bounds(session_in.session_date, session_in.start_time, session_in.duration_minutes)
+        _check_schedule(db, current_user.id, [bounds], on_conflict, response)
+    session_obj = SessionModel(**values)
     db.add(session_obj)
     db.commit()
     db.refresh(session_obj)
     return _serialize_session(session_obj, current_user)
 
 
+@router.post("/series", response_model=SessionSeriesCreated, status_code=status.HTTP_201_CREATED)
+async def create_session_series(
+    series_in: SessionSeriesCreate,
+    response: Response,
+    on_conflict: Literal["allow", "reject"] = "allow",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Create every occurrence of a recurring series in one transaction; the rate is resolved once."""
+    dates = series_dates(series_in)
+    if len(dates) > MAX_SERIES_OCCURRENCES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A series can have at most {MAX_SERIES_OCCURRENCES} sessions.",
+        )
+    student = _get_owned_student(db, series_in.student_id, current_user.id)
+    plan, selected_rate = _resolve_plan_and_rate(db, student, current_user.id, series_in.duration_minutes)
+    values = _session_values(series_in, current_user.id, plan, selected_rate)
+    bounds = [session_bounds(session_date, series_in.start_time, series_in.duration_minutes) for session_date in dates]
+    if values["attendance_status"] not in INACTIVE_STATUSES:
+        _check_schedule(db, current_user.id, bounds, on_conflict, response)
+    # Bulk INSERT skips the mapper events, so the calendar bounds are set here.
+    rows = [
+        {**values, "session_date": session_date, "starts_at": starts_at, "ends_at": ends_at}
+        for session_date, (starts_at, ends_at) in zip(dates, bounds)
+    ]
+    # One multi-row INSERT; RETURNING order is not guaranteed, but ids are assigned in row order.
+    ids = sorted(db.scalars(insert(SessionModel).returning(SessionModel.id), rows))
+    # Bulk INSERT skips the flush hooks, so bump the data version explicitly.
+    bump_versions(db, current_user.id, "sessions", student_ids=[series_in.student_id])
+    db.commit()
+    return {"ids": ids, "count": len(ids), "first_session_date": dates[0], "last_session_date": dates[-1]}
+
+
+@router.post("/reprice", response_model=SessionRepricingReport)
+async def reprice_unbilled_sessions(
+    request_in: SessionRepricingRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+):
+    """Re-price unbilled sessions at the current rates; ``dry_run`` only reports the diff."""
+    if request_in.start_date and request_in.end_date and request_in.start_date > request_in.end_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must be on or before end_date")
+    if request_in.student_id is not None:
+        _get_owned_student(db, request_in.student_id, current_user.id)
+    return reprice_sessions(db, owner_id=current_user.id, **request_in.model_dump())
+
+
 @router.get("/", response_model=list[SessionRead])
 async def list_sessions(
     student_id: int | None = None,
@@ -154,12 +233,7 @@ async def list_sessions(
     if student_id is not None:
         _get_owned_student(db, student_id, current_user.id)
         query = query.filter(SessionModel.student_id == student_id)
-    if start_date is not None:
-        start_dt = datetime.combine(start_date, datetime.min.time()).replace(tzinfo=timezone.utc)
-        query = query.filter(SessionModel.session_date >= start_dt)
-    if end_date is not None:
-        end_dt = datetime.combine(end_date, datetime.max.time()).replace(tzinfo=timezone.utc)
-        query = query.filter(SessionModel.session_date <= end_dt)
+    query = query.filter(*date_range_filters(SessionModel.session_date, start_date, end_date))
     query = query.order_by(SessionModel.session_date.desc(), SessionModel.created_at.desc())
     sessions = query.all()
     return [_serialize_session(sess, current_user) for sess in sessions]
@@ -172,8 +246,20 @@ async def get_session(session_id: int, db: Session = Depends(get_db), current_us
 
 
 @router.put("/{session_id}", response_model=SessionRead)
-async def update_session(session_id: int, session_in: SessionUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def update_session(
+    session_id: int,
+    session_in: SessionUpdate,
+    response: Response,
+    on_conflict: Literal["allow", "reject"] = "allow",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
     session_obj = _get_owned_session(db, session_id, current_user.id)
+    if session_in.duration_minutes is not None and not 0 < session_in.duration_minutes <= MAX_SESSION_MINUTES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Session duration must be between 1 and {MAX_SESSION_MINUTES} minutes.",
+        )
     update_fields = {
         "subject": session_in.subject,
         "duration_minutes": session_in.duration_minutes,
@@ -192,6 +278,10 @@ async def update_session(session_id: int, session_in: SessionUpdate, db: Session
         if value is not None:
             setattr(session_obj, field, value)
     session_obj.cost_total = calculate_cost_total(session_obj.duration_minutes, session_obj.rate_per_hour)
+    if session_obj.attendance_status not in INACTIVE_STATUSES:
+        bounds = session_bounds(session_obj.session_date, session_obj.start_time, session_obj.duration_minutes)
+        with db.no_autoflush:
+            _check_schedule(db, current_user.id, [bounds], on_conflict, response, exclude_ids=(session_obj.id,))
     db.commit()
     db.refresh(session_obj)
     return _serialize_session(session_obj, current_user)
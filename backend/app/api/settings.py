@@ -7,6 +7,7 @@ from backend.app.dependencies.auth import get_current_user, get_db
 from backend.app.models.rate_settings import RateSettings
 from backend.app.models.user import User
 from backend.app.schemas.rate_settings import RateSettingsRead, RateSettingsUpdate
+from backend.app.services.rate_resolution import invalidate_owner_rates
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
@@ -78,5 +79,6 @@ async def update_rate_settings(
     if payload.discount_rate_30 is not None:
         settings.discount_rate_30 = payload.discount_rate_30
     db.commit()
+    invalidate_owner_rates(current_user.id)
     db.refresh(settings)
     return settings
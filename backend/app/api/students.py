@@ -12,6 +12,7 @@ from pydantic import BaseModel
 
 from backend.app.dependencies.auth import get_current_user
 from backend.app.db.session import get_db
+from backend.app.dependencies.conditional import make_owner_etag
 from backend.app.models.lead import Lead
 from backend.app.models.session import Session as SessionModel
 from backend.app.models.student import Student
@@ -23,6 +24,7 @@ from backend.app.schemas.student import StudentAnonymizeResponse, StudentCreate,
 from backend.app.services.student_anonymization import anonymize_student
 
 router = APIRouter(prefix="/students", tags=["students"])
+students_etag = make_owner_etag(get_current_user, domains=("students",))
 
 
 class StudentSessionSummary(BaseModel):
@@ -93,7 +95,7 @@ async def create_student(student_in: StudentCreate, db: Session = Depends(get_db
     return student
 
 
-@router.get("/", response_model=list[StudentRead])
+@router.get("/", response_model=list[StudentRead], dependencies=[Depends(students_etag)])
 async def list_students(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     students = (
         db.query(Student)
@@ -0,0 +1,35 @@
+"""Lightweight change-tracking endpoints for clients and caches."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from backend.app.core.security import get_current_user
+from backend.app.db.session import get_db
+from backend.app.models.user import User
+from backend.app.schemas.sync import DataVersions, SyncChanges
+from backend.app.services.data_versions import get_owner_data_versions
+from backend.app.services.sync_changes import decode_sync_token, get_changes_since
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("/versions", response_model=DataVersions)
+async def get_data_versions(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """Per-domain data versions; a client refetches a domain only when its number moves."""
+    return {"owner_id": current_user.id, "versions": get_owner_data_versions(db, current_user.id)}
+
+
+@router.get("/changes", response_model=SyncChanges)
+async def get_sync_changes(
+    since: Optional[str] = Query(None, description="Token returned by the previous call; omit for a full snapshot"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Leads, students, sessions and invoices created, updated or deleted since ``since``."""
+    try:
+        since_at = decode_sync_token(since) if since else None
+    except (ValueError, OverflowError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    return get_changes_since(db, owner_id=current_user.id, since=since_at)
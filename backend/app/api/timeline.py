@@ -1,14 +1,18 @@
 """Lead timeline endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
+from backend.app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, keyset_page, parse_cursor
 from backend.app.dependencies.auth import get_current_user
 from backend.app.db.session import get_db
 from backend.app.models.lead import Lead
 from backend.app.models.timeline import TimelineEvent
 from backend.app.models.user import User
-from backend.app.schemas.timeline import TimelineEventRead
+from backend.app.schemas.timeline import ActivityEventRead, TimelineEventRead
+from backend.app.services.activity_feed import FEED_MAX_LEADS, get_recent_activity
 
 router = APIRouter(prefix="/leads", tags=["timeline"])
 
@@ -20,16 +24,42 @@ def _get_owned_lead(db: Session, lead_id: int, user_id: int) -> Lead:
     return lead
 
 
+@router.get("/activity/recent", response_model=list[ActivityEventRead])
+async def get_recent_activity_feed(
+    response: Response,
+    lead_id: list[int] = Query(default=[], description="Limit the feed to these leads"),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Newest timeline events across the owner's leads; follow ``X-Next-Cursor`` for older ones."""
+    if len(lead_id) > FEED_MAX_LEADS:
+        raise HTTPException(status_code=400, detail=f"At most {FEED_MAX_LEADS} lead_id values are allowed")
+    events, next_cursor = get_recent_activity(
+        db, owner_id=current_user.id, lead_ids=lead_id, cursor=parse_cursor(cursor), limit=limit
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return events
+
+
 @router.get("/{lead_id}/timeline", response_model=list[TimelineEventRead])
 async def get_timeline(
     lead_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    """Oldest-first page of a lead's timeline; ``X-Next-Cursor`` is set when more events follow."""
     _get_owned_lead(db, lead_id, current_user.id)
-    return (
-        db.query(TimelineEvent)
-        .filter(TimelineEvent.lead_id == lead_id, TimelineEvent.owner_id == current_user.id)
-        .order_by(TimelineEvent.created_at.asc(), TimelineEvent.id.asc())
-        .all()
+    # Ownership is checked on the lead; filtering on lead_id alone keeps the scan on the per-lead index.
+    query = db.query(TimelineEvent).filter(TimelineEvent.lead_id == lead_id)
+    events, next_cursor = keyset_page(
+        query, TimelineEvent.created_at, TimelineEvent.id, cursor=parse_cursor(cursor), limit=limit
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return events
@@ -0,0 +1,80 @@
+"""Management commands: ``python -m backend.app.cli <command>``."""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from backend.app.core.dev_seed import ensure_default_dev_owner
+from backend.app.core.settings import get_settings
+from backend.app.db.init_db import init_db
+from backend.app.db.session import SessionLocal
+from backend.app.models.invoice import Invoice
+from backend.app.services.period_close import close_periods
+from backend.app.services.retention import CHUNK_SIZE, run_retention
+
+
+def _init_db(args: argparse.Namespace) -> None:
+    for line in init_db():
+        print(line)
+    print("Database schema is up to date.")
+
+
+def _seed_dev(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        ensure_default_dev_owner(db, force=True)
+    finally:
+        db.close()
+    print("Default dev owners are present.")
+
+
+def _retention(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        stats = run_retention(db, archive_dir=Path(args.archive_dir), chunk_size=args.chunk_size)
+    finally:
+        db.close()
+    print(json.dumps(stats, indent=2))
+
+
+def _previous_month() -> str:
+    now = datetime.now(timezone.utc)
+    return f"{now.year - 1}-12" if now.month == 1 else f"{now.year}-{now.month - 1:02d}"
+
+
+def _close_periods(args: argparse.Namespace) -> None:
+    year, month = (int(part) for part in args.through.split("-"))
+    db = SessionLocal()
+    try:
+        owner_ids = [owner_id for (owner_id,) in db.query(Invoice.owner_id).distinct().order_by(Invoice.owner_id)]
+        closed = {owner_id: len(close_periods(db, owner_id, through=(year, month))) for owner_id in owner_ids}
+    finally:
+        db.close()
+    print(json.dumps({"through": args.through, "months_closed": closed}, indent=2))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.cli", description="CoreBox CRM management commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("init-db", help="Create missing tables and upgrade existing ones").set_defaults(func=_init_db)
+    commands.add_parser("seed-dev", help="Create the default development owners").set_defaults(func=_seed_dev)
+    retention = commands.add_parser("retention", help="Compact, archive and delete old timeline events and audit logs")
+    retention.add_argument("--archive-dir", default=get_settings().archive_dir, help="Where NDJSON.gz archives are written")
+    retention.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per delete transaction")
+    retention.set_defaults(func=_retention)
+    close = commands.add_parser("close-periods", help="Snapshot every owner's open months up to a month that has ended")
+    close.add_argument("--through", default=_previous_month(), help="Last month to close, as YYYY-MM (default: last month)")
+    close.set_defaults(func=_close_periods)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@ import os
 from sqlalchemy.orm import Session
 
 from backend.app.core.security import get_password_hash
+from backend.app.core.settings import get_settings
 from backend.app.models.user import User
 
 
@@ -13,28 +14,23 @@ DEFAULT_DEV_USERS = [
 ]
 
 
-def ensure_default_dev_owner(db: Session) -> None:
+def ensure_default_dev_owner(db: Session, force: bool = False) -> None:
     """
     Create a default owner user for local development if it does not exist.
-    Skips execution when running under pytest to avoid altering test expectations.
+    Only runs in the development environment (or when ``force`` is set) and
+    skips execution when running under pytest to avoid altering test expectations.
+    A single query checks for existing users, so bcrypt only runs when
+    something is actually missing.
     """
-    if os.getenv("PYTEST_CURRENT_TEST"):
+    if not force and (os.getenv("PYTEST_CURRENT_TEST") or get_settings().environment != "development"):
         return
 
-    created = False
-    for email in DEFAULT_DEV_USERS:
-        existing = db.query(User).filter(User.email == email).first()
-        if existing:
-            continue
-
-        user = User(
-            email=email,
-            hashed_password=get_password_hash(DEFAULT_DEV_PASSWORD),
-            is_active=True,
-            is_admin=False,
-        )
-        db.add(user)
-        created = True
-
-    if created:
-        db.commit()
+    existing = {email for (email,) in db.query(User.email).filter(User.email.in_(DEFAULT_DEV_USERS)).all()}
+    missing = [email for email in DEFAULT_DEV_USERS if email not in existing]
+    if not missing:
+        return
+
+    hashed_password = get_password_hash(DEFAULT_DEV_PASSWORD)
+    for email in missing:
+        db.add(User(email=email, hashed_password=hashed_password, is_active=True, is_admin=False))
+    db.commit()
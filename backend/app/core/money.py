@@ -0,0 +1,47 @@
+"""Integer-cents money helpers for reporting aggregation.
+
+Reports sum many rows; carrying amounts as ``int`` cents keeps the hot loops on
+plain integer arithmetic. Values are converted to the ``"0.00"`` string format
+only when a payload is serialized.
+"""
+
+from decimal import Decimal
+
+CENT = Decimal("0.01")
+
+
+def to_cents(value) -> int:
+    """Convert a money value (Decimal, int, float, str or None) to integer cents.
+
+    Rounds half-even to two places, matching ``Decimal(str(value)).quantize(CENT)``.
+    """
+    if value is None:
+        return 0
+    if type(value) is int:
+        return value * 100
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.quantize(CENT).scaleb(2))
+
+
+def format_cents(cents: int) -> str:
+    """Render integer cents as a two-decimal string, e.g. ``12345 -> "123.45"``."""
+    if cents < 0:
+        whole, frac = divmod(-cents, 100)
+        return f"-{whole}.{frac:02d}"
+    whole, frac = divmod(cents, 100)
+    return f"{whole}.{frac:02d}"
+
+
+def cents_to_decimal(cents: int) -> Decimal:
+    """Return integer cents as a two-place Decimal."""
+    return Decimal(cents).scaleb(-2)
+
+
+def divide_cents(cents: int, divisor: int) -> int:
+    """Divide cents by a positive integer, rounding half-even like ``Decimal.quantize``."""
+    quotient, remainder = divmod(cents, divisor)
+    doubled = remainder * 2
+    if doubled > divisor or (doubled == divisor and quotient % 2 == 1):
+        quotient += 1
+    return quotient
@@ -0,0 +1,73 @@
+"""Keyset (cursor) pagination over ``(created_at, id)`` ordered rows.
+
+A cursor is an opaque token for the last row of a page. The next page
+continues strictly after it, so pages stay stable while new rows are added and
+each page is a bounded range scan of a ``(..., created_at, id)`` index rather
+than an OFFSET walk.
+"""
+
+import base64
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+Cursor = Tuple[datetime, int]
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes holding UTC wall time.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{_as_utc(created_at).isoformat()}|{row_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Return ``(created_at, id)`` for a token; raises ValueError for malformed tokens."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode("ascii")
+        moment, row_id = raw.split("|")
+        return _as_utc(datetime.fromisoformat(moment)), int(row_id)
+    except (UnicodeDecodeError, TypeError) as exc:  # binascii.Error is a ValueError
+        raise ValueError("Invalid cursor") from exc
+
+
+def parse_cursor(token: Optional[str]) -> Optional[Cursor]:
+    """Decode a ``cursor`` query parameter, answering 400 for malformed tokens."""
+    if token is None:
+        return None
+    try:
+        return decode_cursor(token)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def after_cursor(created_column, id_column, cursor: Cursor, *, descending: bool = False):
+    """Filter for rows strictly after ``cursor`` in (created_at, id) order."""
+    moment, row_id = cursor
+    if descending:
+        return or_(created_column < moment, and_(created_column == moment, id_column < row_id))
+    return or_(created_column > moment, and_(created_column == moment, id_column > row_id))
+
+
+def keyset_page(query, created_column, id_column, *, cursor: Optional[Cursor], limit: int, descending: bool = False):
+    """Return ``(rows, next_cursor)`` for one page of ``query``; ``next_cursor`` is None on the last page."""
+    if cursor is not None:
+        query = query.filter(after_cursor(created_column, id_column, cursor, descending=descending))
+    if descending:
+        query = query.order_by(created_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(created_column.asc(), id_column.asc())
+    rows: List = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(getattr(rows[-1], created_column.key), getattr(rows[-1], id_column.key))
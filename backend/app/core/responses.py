@@ -0,0 +1,80 @@
+"""Fast JSON responses for large report payloads.
+
+Report services already return plain dicts shaped like their response schemas,
+so re-validating them through ``response_model`` only costs time. Endpoints can
+opt in by returning ``fast_response(Schema, data)``: the payload is projected
+onto the schema's fields by a serializer compiled once per schema and encoded
+with orjson when it is installed.
+"""
+
+import json
+import typing
+from functools import lru_cache
+from typing import Any, Callable
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+_MISSING = object()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, falling back to the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _model_from_annotation(annotation) -> tuple[type[BaseModel] | None, bool]:
+    """Return (nested model, is_list) for ``Model``, ``list[Model]`` and optional variants."""
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    origin = typing.get_origin(annotation)
+    if origin in (list, typing.List) and args:
+        model, _ = _model_from_annotation(args[0])
+        return model, model is not None
+    if origin is not None and len(args) == 1:
+        return _model_from_annotation(args[0])
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def get_serializer(model: type[BaseModel]) -> Callable[[dict], dict]:
+    """Compile a dict -> dict projection for ``model`` (cached per process)."""
+    fields = []
+    for name, field in model.model_fields.items():
+        default = _MISSING if field.is_required() else field.get_default(call_default_factory=True)
+        nested, is_list = _model_from_annotation(field.annotation)
+        fields.append((name, default, get_serializer(nested) if nested is not None else None, is_list))
+
+    def serialize(data: dict) -> dict:
+        out = {}
+        for name, default, nested, is_list in fields:
+            value = data[name] if default is _MISSING else data.get(name, default)
+            if nested is not None and value is not None:
+                value = [nested(item) for item in value] if is_list else nested(value)
+            out[name] = value
+        return out
+
+    return serialize
+
+
+def fast_response(model: type[BaseModel], data: dict, response: Response | None = None, **kwargs) -> FastJSONResponse:
+    """Serialize service-shaped ``data`` for ``model`` without re-validation.
+
+    Pass the endpoint's injected ``response`` to keep headers set by
+    dependencies; FastAPI does not merge them into returned Response objects.
+    """
+    result = FastJSONResponse(get_serializer(model)(data), **kwargs)
+    if response is not None:
+        result.headers.raw.extend(response.headers.raw)
+    return result
@@ -1,13 +1,19 @@
+import os
+
+
 class Settings:
     def __init__(self):
         self.app_name = "CoreBox CRM"
         self.api_version = "1.0.0"
-        self.environment = "development"
+        self.environment = os.getenv("COREBOX_ENV", "development")
+        # Opt-in: startup only seeds the default dev owners when this is set (see also `cli seed-dev`).
+        self.seed_dev_users = os.getenv("COREBOX_SEED_DEV_USERS", "").lower() in ("1", "true", "yes")
         self.secret_key = "CHANGE_ME"
         self.SECRET_KEY = self.secret_key
         self.access_token_expire_minutes = 30
         self.ACCESS_TOKEN_EXPIRE_MINUTES = self.access_token_expire_minutes
-        self.database_url = "sqlite:///./corebox.db"
+        self.database_url = os.getenv("COREBOX_DATABASE_URL", "sqlite:///./corebox.db")
+        self.archive_dir = os.getenv("COREBOX_ARCHIVE_DIR", "./archive")
 
 
 _settings_instance = None
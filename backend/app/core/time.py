@@ -1,8 +1,36 @@
 """Time utilities for timezone-aware UTC datetimes."""
 
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Optional
 
 
 def utc_now() -> datetime:
     """Return a timezone-aware UTC datetime for defaults and onupdate hooks."""
     return datetime.now(UTC)
+
+
+def day_start(day: date) -> datetime:
+    """Return midnight UTC at the start of ``day``."""
+    return datetime.combine(day, time.min, tzinfo=UTC)
+
+
+def date_range_bounds(start_date: Optional[date], end_date: Optional[date]) -> tuple[Optional[datetime], Optional[datetime]]:
+    """Return half-open ``[lower, upper)`` UTC timestamps covering whole days ``start_date..end_date``."""
+    lower = day_start(start_date) if start_date else None
+    upper = day_start(end_date + timedelta(days=1)) if end_date else None
+    return lower, upper
+
+
+def date_range_filters(column, start_date: Optional[date] = None, end_date: Optional[date] = None) -> list:
+    """Filters keeping rows whose timestamp ``column`` falls on ``start_date..end_date`` (inclusive days).
+
+    The bare column is compared against timestamp bounds, never wrapped in
+    ``func.date()``, so an index on it can serve the range.
+    """
+    lower, upper = date_range_bounds(start_date, end_date)
+    filters = []
+    if lower is not None:
+        filters.append(column >= lower)
+    if upper is not None:
+        filters.append(column < upper)
+    return filters
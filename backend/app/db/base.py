@@ -17,3 +17,8 @@ from backend.app.models.payment import Payment  # noqa: F401
 from backend.app.models.parent_link import ParentStudentLink  # noqa: F401
 from backend.app.models.audit_log import AuditLog  # noqa: F401
 from backend.app.models.rate_settings import RateSettings  # noqa: F401
+from backend.app.models.data_version import OwnerDataVersion, StudentDataVersion  # noqa: F401
+from backend.app.models.sync_tombstone import SyncTombstone  # noqa: F401
+from backend.app.models.job import Job  # noqa: F401
+from backend.app.models.period_snapshot import PeriodSnapshot  # noqa: F401
+from backend.app.models.student_kpi import StudentKpi  # noqa: F401
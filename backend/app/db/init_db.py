@@ -0,0 +1,16 @@
+"""Explicit schema creation and upgrade, run once per deploy instead of on import."""
+
+from typing import List
+
+from sqlalchemy.engine import Engine
+
+from backend.app.db.base import Base
+from backend.app.db.migrations import upgrade_schema
+from backend.app.db.session import engine as default_engine
+
+
+def init_db(engine: Engine | None = None) -> List[str]:
+    """Create missing tables, then upgrade existing ones; return the upgrades applied."""
+    engine = engine or default_engine
+    Base.metadata.create_all(bind=engine)
+    return upgrade_schema(engine)
@@ -0,0 +1,205 @@
+"""In-place upgrades for databases created before a column or index existed.
+
+``create_all`` only creates missing tables; it never touches a table that is
+already there. ``upgrade_schema`` adds the columns later models put on
+existing tables, backfills them from the data already present, rewrites
+values older code stored in a different format, and creates the models'
+indexes that existing tables lack. Every step checks the live schema or data
+first, so it is safe to run on every deploy.
+"""
+
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import bindparam, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateIndex
+
+from backend.app.db.base import Base
+from backend.app.models.session import session_bounds
+
+
+class AddedColumn(NamedTuple):
+    table: str
+    column: str
+    # SQL literal existing rows get for a NOT NULL column before the backfill runs.
+    default: Optional[str] = None
+    backfill: Optional[Callable[[Connection], None]] = None
+
+
+def _backfill_lead_updated_at(conn: Connection) -> None:
+    conn.execute(text("UPDATE leads SET updated_at = created_at"))
+
+
+BACKFILL_CHUNK_SIZE = 1000
+
+_STATUS_CHANGE = re.compile(r"^Status changed from (\S+) to (\S+)$")
+
+
+def _backfill_timeline_statuses(conn: Connection) -> None:
+    """Fill from/to status on existing lead_created and status_changed events.
+
+    Status changes are parsed from their description. A lead_created event gets
+    the status the lead's first change moved away from, or the lead's current
+    status when it never changed.
+    """
+    events = Base.metadata.tables["timeline_events"]
+    leads = Base.metadata.tables["leads"]
+    set_statuses = (
+        update(events)
+        .where(events.c.id == bindparam("event_id"))
+        .values(from_status=bindparam("from_value"), to_status=bindparam("to_value"))
+    )
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(events.c.id, events.c.description)
+            .where(events.c.event_type == "status_changed", events.c.id > last_id)
+            .order_by(events.c.id)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        params = []
+        for row in rows:
+            match = _STATUS_CHANGE.match(row.description)
+            if match:
+                params.append({"event_id": row.id, "from_value": match[1], "to_value": match[2]})
+        if params:
+            conn.execute(set_statuses, params)
+
+    ordered_changes = (
+        select(events.c.lead_id, events.c.from_status)
+        .where(events.c.event_type == "status_changed", events.c.from_status.isnot(None))
+        .order_by(events.c.created_at, events.c.id)
+    )
+    first_from: Dict[int, str] = {}
+    for lead_id, from_status in conn.execute(ordered_changes):
+        first_from.setdefault(lead_id, from_status)
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(events.c.id, events.c.lead_id, leads.c.status)
+            .join(leads, leads.c.id == events.c.lead_id)
+            .where(events.c.event_type == "lead_created", events.c.id > last_id)
+            .order_by(events.c.id)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        conn.execute(
+            set_statuses,
+            [
+                {"event_id": row.id, "from_value": None, "to_value": first_from.get(row.lead_id, row.status)}
+                for row in rows
+            ],
+        )
+
+
+def _backfill_session_bounds(conn: Connection) -> None:
+    """Derive starts_at / ends_at for existing sessions, as the model's save hook does."""
+    sessions = Base.metadata.tables["sessions"]
+    set_bounds = (
+        update(sessions)
+        .where(sessions.c.id == bindparam("session_id"))
+        .values(starts_at=bindparam("starts_value"), ends_at=bindparam("ends_value"))
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(sessions.c.id, sessions.c.session_date, sessions.c.start_time, sessions.c.duration_minutes)
+            .where(sessions.c.starts_at.is_(None), sessions.c.id > last_id)
+            .order_by(sessions.c.id)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        params = []
+        for row in rows:
+            starts_at, ends_at = session_bounds(row.session_date, row.start_time, row.duration_minutes)
+            params.append({"session_id": row.id, "starts_value": starts_at, "ends_value": ends_at})
+        conn.execute(set_bounds, params)
+
+
+def _normalize_note_created_at(conn: Connection) -> int:
+    """Give second-precision notes.created_at values the microseconds SQLAlchemy writes.
+
+    Notes used to take ``created_at`` from SQLite's CURRENT_TIMESTAMP
+    (``2026-01-01 10:00:00``). Pagination cursors bind ``...10:00:00.000000``,
+    and SQLite compares the two as text, so same-second notes were skipped.
+    """
+    if conn.dialect.name != "sqlite":
+        return 0  # other databases store real timestamps
+    result = conn.execute(
+        text("UPDATE notes SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+    )
+    return result.rowcount
+
+
+# Rewrites of values stored in an older format: (table.column, fix returning rows changed).
+NORMALIZED_VALUES: List[Tuple[str, Callable[[Connection], int]]] = [
+    ("notes.created_at", _normalize_note_created_at),
+]
+
+
+ADDED_COLUMNS: List[AddedColumn] = [
+    AddedColumn("leads", "updated_at", "'1970-01-01 00:00:00'", _backfill_lead_updated_at),
+    AddedColumn("jobs", "error_status"),
+    AddedColumn("jobs", "worker_id"),
+    AddedColumn("jobs", "heartbeat_at"),
+    AddedColumn("reminders", "notified_due_at"),
+    AddedColumn("timeline_events", "from_status"),
+    # Added second so the backfill can fill both columns.
+    AddedColumn("timeline_events", "to_status", backfill=_backfill_timeline_statuses),
+    AddedColumn("sessions", "starts_at"),
+    AddedColumn("sessions", "ends_at", backfill=_backfill_session_bounds),
+    # Version 0 marks existing snapshots stale; the next refresh rebuilds them.
+    AddedColumn("student_kpis", "data_version", "0"),
+]
+
+
+def _add_column(conn: Connection, step: AddedColumn) -> None:
+    column = Base.metadata.tables[step.table].c[step.column]
+    ddl = f"ALTER TABLE {step.table} ADD COLUMN {step.column} {column.type.compile(dialect=conn.dialect)}"
+    if not column.nullable:
+        ddl += f" NOT NULL DEFAULT {step.default}"
+    conn.execute(text(ddl))
+    if step.backfill is not None:
+        step.backfill(conn)
+
+
+def upgrade_schema(engine: Engine) -> List[str]:
+    """Add missing columns and indexes to existing tables; return a line per change made.
+
+    Legacy values in ``NORMALIZED_VALUES`` are rewritten on the way. Run after
+    ``create_all``: tables it creates already have every column and index.
+    """
+    applied = []
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        tables = set(inspector.get_table_names())
+        columns = {table: {c["name"] for c in inspector.get_columns(table)} for table in tables}
+        indexes = {table: {i["name"] for i in inspector.get_indexes(table)} for table in tables}
+        for step in ADDED_COLUMNS:
+            if step.table in tables and step.column not in columns[step.table]:
+                _add_column(conn, step)
+                applied.append(f"Added {step.table}.{step.column}")
+        for target, normalize in NORMALIZED_VALUES:
+            if target.split(".")[0] in tables:
+                changed = normalize(conn)
+                if changed:
+                    applied.append(f"Normalized {changed} {target} values")
+        # Indexes go last: some cover the columns added above.
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                if index.name not in indexes[table.name]:
+                    conn.execute(CreateIndex(index, if_not_exists=True))
+                    applied.append(f"Created index {index.name}")
+    return applied
@@ -1,10 +1,21 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from backend.app.core.settings import get_settings
 
 settings = get_settings()
 engine = create_engine(settings.database_url)
+
+if engine.dialect.name == "sqlite" and engine.url.database not in (None, "", ":memory:"):
+
+    @event.listens_for(engine, "connect")
+    def _enable_wal(dbapi_connection, connection_record):
+        # WAL lets report snapshots (db/snapshot.py) read while requests write.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
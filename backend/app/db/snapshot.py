@@ -0,0 +1,85 @@
+"""Consistent read snapshots for reports that run several queries.
+
+A report such as the financial summary reads invoices, then payments, then
+the data stamp it is cached under. Run one after another on a plain session,
+a payment committed in between can make those figures disagree. Decorating
+the report with ``@read_snapshot`` runs it on its own connection inside a
+single read transaction, so every query sees the same committed version of
+the data:
+
+* SQLite opens the transaction with ``BEGIN``; in WAL mode (see
+  ``db/session.py``) readers take no locks that block writers.
+* Postgres and other servers use ``REPEATABLE READ`` (read-only on Postgres).
+
+The transaction is always rolled back, so reports must not write inside it.
+Nested reports reuse the outer snapshot. When the caller's session has
+flushed but uncommitted changes, the report runs on that session instead so
+it still sees them.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+_SNAPSHOT_KEY = "read_snapshot"
+_PENDING_WRITES_KEY = "read_snapshot_pending_writes"
+
+F = TypeVar("F", bound=Callable)
+
+
+def _begin_snapshot(connection: Connection) -> None:
+    if connection.dialect.name == "sqlite":
+        # pysqlite only opens a transaction before writes, so SELECTs would
+        # otherwise each see the latest commit.
+        if not connection.connection.dbapi_connection.in_transaction:
+            connection.exec_driver_sql("BEGIN")
+        return
+    options = {"isolation_level": "REPEATABLE READ"}
+    if connection.dialect.name == "postgresql":
+        options["postgresql_readonly"] = True
+    connection.execution_options(**options)
+
+
+@contextmanager
+def snapshot_session(db: Session) -> Iterator[Session]:
+    """Yield a session whose reads all come from one consistent snapshot."""
+    if db.info.get(_SNAPSHOT_KEY) or db.info.get(_PENDING_WRITES_KEY):
+        yield db
+        return
+    connection = db.get_bind().connect()
+    try:
+        _begin_snapshot(connection)
+        snapshot = Session(bind=connection, autoflush=False, info={_SNAPSHOT_KEY: True})
+        try:
+            yield snapshot
+        finally:
+            snapshot.close()
+            connection.rollback()
+    finally:
+        connection.close()
+
+
+def read_snapshot(func: F) -> F:
+    """Run a report ``func(db, ...)`` inside ``snapshot_session(db)``."""
+
+    @wraps(func)
+    def wrapper(db: Session, *args, **kwargs):
+        with snapshot_session(db) as snapshot:
+            return func(snapshot, *args, **kwargs)
+
+    return wrapper
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_pending_writes(session: Session, flush_context) -> None:
+    session.info[_PENDING_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_pending_writes(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_PENDING_WRITES_KEY, None)
@@ -0,0 +1,65 @@
+"""Conditional GET support (ETag / If-None-Match) for owner-scoped reads."""
+
+import hashlib
+from datetime import datetime, timezone
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from backend.app.core.security import get_current_user
+from backend.app.db.session import get_db
+from backend.app.models.user import User
+from backend.app.services.data_versions import DOMAINS, get_owner_data_version
+
+
+def build_etag(request: Request, owner_id: int, version: int) -> str:
+    """Derive a weak ETag from the path, query, owner data version and current date.
+
+    The UTC date is part of the key because reports default ``today``/``as_of``
+    to the current date when the caller does not pass one.
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    today = datetime.now(timezone.utc).date().isoformat()
+    digest = hashlib.sha1(f"{request.url.path}?{query}|{today}".encode("utf-8")).hexdigest()[:16]
+    return f'W/"{owner_id}-{version}-{digest}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    return any((tag[2:] if tag.startswith("W/") else tag) == opaque for tag in candidates)
+
+
+def make_owner_etag(user_dependency=get_current_user, domains=DOMAINS):
+    """Build a dependency that answers 304 before the endpoint runs when the owner's data is unchanged.
+
+    ``user_dependency`` should be the router's own current-user dependency so
+    the user lookup is shared with the endpoint; ``domains`` limits the ETag to
+    the data versions the endpoint actually reads.
+    """
+
+    def owner_etag(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(user_dependency),
+    ) -> str:
+        version = get_owner_data_version(db, current_user.id, domains)
+        etag = build_etag(request, current_user.id, version)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+        return etag
+
+    return owner_etag
+
+
+# Owner reports read students, sessions and billing data but never leads.
+report_etag = make_owner_etag(domains=("students", "sessions", "billing"))
+# The lead funnel is the one report built from leads and their timeline.
+lead_report_etag = make_owner_etag(domains=("leads",))
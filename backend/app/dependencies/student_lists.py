@@ -0,0 +1,33 @@
+"""Query parameters shared by the paged student KPI listings."""
+
+from datetime import date
+from decimal import Decimal
+
+from fastapi import Query
+
+from backend.app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+def student_list_params(
+    sort_by: str = "student_id",
+    sort_order: str = "asc",
+    skip: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status: str | None = None,
+    min_outstanding: Decimal | None = Query(None, ge=0),
+    min_consistency: int | None = Query(None, ge=0, le=100),
+    max_consistency: int | None = Query(None, ge=0, le=100),
+    last_session_before: date | None = None,
+) -> dict:
+    """Sort, paging and filter arguments for ``page_student_kpis``."""
+    return {
+        "sort_by": sort_by,
+        "sort_order": sort_order,
+        "skip": skip,
+        "limit": limit,
+        "status": status,
+        "min_outstanding": min_outstanding,
+        "min_consistency": min_consistency,
+        "max_consistency": max_consistency,
+        "last_session_before": last_session_before,
+    }
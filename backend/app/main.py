@@ -1,8 +1,12 @@
 # Codex local edit test
 # Initial CoreBox CRM backend entrypoint ??" minimal FastAPI app.
 
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from backend.app.core.settings import get_settings
 from backend.app.api import auth
 from backend.app.api import register
@@ -14,6 +18,7 @@ from backend.app.api import timeline
 from backend.app.api import reminders
 from backend.app.api import students
 from backend.app.api import sessions
+from backend.app.api import calendar
 from backend.app.api import dashboard
 from backend.app.api import admin_dashboard
 from backend.app.api import rates
@@ -27,6 +32,7 @@ from backend.app.api import payments
 from backend.app.api import reports
 from backend.app.api import revenue
 from backend.app.api import admin_reports
+from backend.app.api import report_batch
 from backend.app.api import enrollments
 from backend.app.api import parent
 from backend.app.api import admin_parents
@@ -34,71 +40,136 @@ from backend.app.api import parent_portal
 from backend.app.api import parents
 from backend.app.api import owner
 from backend.app.api import settings as settings_api
+from backend.app.api import sync
+from backend.app.api import jobs
+from backend.app.api import exports
 from backend.app.core.dev_seed import ensure_default_dev_owner
+from backend.app.core.pagination import NEXT_CURSOR_HEADER
 from backend.app.db.session import SessionLocal
+from backend.app.services import data_versions  # noqa: F401  (registers data version flush hooks)
+from backend.app.services.jobs import job_runner
+from backend.app.services.reminders import reminder_scheduler
+from backend.app.services.schedule import SCHEDULE_CONFLICTS_HEADER
 
-app = FastAPI()
-settings = get_settings()
+logger = logging.getLogger(__name__)
 
-origins = [
+ORIGINS = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
 ]
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(auth.router)
-app.include_router(register.router)
-app.include_router(login.router)
-app.include_router(protected.router)
-app.include_router(leads.router)
-app.include_router(notes.router)
-app.include_router(timeline.router)
-app.include_router(reminders.router)
-app.include_router(students.router)
-app.include_router(sessions.router)
-app.include_router(dashboard.router)
-app.include_router(admin_dashboard.router)
-app.include_router(rates.router)
-app.include_router(preferences.router)
-app.include_router(profile.router)
-app.include_router(admin_users.router)
-app.include_router(invoice_templates.router)
-app.include_router(invoices.router)
-app.include_router(admin_invoices.router)
-app.include_router(payments.router)
-app.include_router(reports.router)
-app.include_router(revenue.router)
-app.include_router(admin_reports.router)
-app.include_router(enrollments.router)
-app.include_router(parent.router)
-app.include_router(admin_parents.router)
-app.include_router(parent_portal.router)
-app.include_router(parents.router)
-app.include_router(owner.router)
-app.include_router(settings_api.router)
-
-
-@app.get("/")
-def read_root():
-    return {"app": "CoreBox CRM backend", "status": "ok"}
+# Response headers the browser client may read across origins.
+EXPOSE_HEADERS = [NEXT_CURSOR_HEADER, SCHEDULE_CONFLICTS_HEADER]
+
+ROUTERS = [
+    auth,
+    register,
+    login,
+    protected,
+    leads,
+    notes,
+    timeline,
+    reminders,
+    students,
+    sessions,
+    calendar,
+    dashboard,
+    admin_dashboard,
+    rates,
+    preferences,
+    profile,
+    admin_users,
+    invoice_templates,
+    invoices,
+    admin_invoices,
+    payments,
+    reports,
+    revenue,
+    admin_reports,
+    report_batch,
+    enrollments,
+    parent,
+    admin_parents,
+    parent_portal,
+    parents,
+    owner,
+    settings_api,
+    sync,
+    jobs,
+    exports,
+]
 
 
-@app.get("/health")
-def health_check():
-    return {"status": "ok"}
+MISSING_SCHEMA_WARNING = "Database schema missing; run `python -m backend.app.cli init-db`"
 
 
-@app.on_event("startup")
-def seed_default_dev_owner():
+def seed_default_dev_owner() -> None:
+    if not get_settings().seed_dev_users:
+        return
     db = SessionLocal()
     try:
         ensure_default_dev_owner(db)
+    except (OperationalError, ProgrammingError):
+        # Startup never creates tables; point at the explicit step instead of crashing.
+        logger.warning(MISSING_SCHEMA_WARNING)
     finally:
         db.close()
+
+
+def start_job_runner() -> None:
+    try:
+        job_runner.start()
+    except (OperationalError, ProgrammingError):
+        logger.warning(MISSING_SCHEMA_WARNING)
+
+
+def start_reminder_scheduler() -> None:
+    try:
+        reminder_scheduler.start()
+    except (OperationalError, ProgrammingError):
+        logger.warning(MISSING_SCHEMA_WARNING)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    seed_default_dev_owner()
+    start_job_runner()
+    start_reminder_scheduler()
+    try:
+        yield
+    finally:
+        reminder_scheduler.stop()
+        job_runner.shutdown()
+
+
+def read_root():
+    return {"app": "CoreBox CRM backend", "status": "ok"}
+
+
+def health_check():
+    return {"status": "ok"}
+
+
+def create_app() -> FastAPI:
+    """Build the ASGI app. Importing this module has no database side effects."""
+    settings = get_settings()
+    app = FastAPI(title=settings.app_name, version=settings.api_version, lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=EXPOSE_HEADERS,
+    )
+
+    for module in ROUTERS:
+        app.include_router(module.router)
+
+    app.add_api_route("/", read_root, methods=["GET"])
+    app.add_api_route("/health", health_check, methods=["GET"])
+    return app
+
+
+app = create_app()
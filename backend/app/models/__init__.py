@@ -12,3 +12,8 @@ from .invoice_template import InvoiceTemplate
 from .invoice import Invoice
 from .payment import Payment
 from .audit_log import AuditLog
+from .data_version import OwnerDataVersion, StudentDataVersion
+from .sync_tombstone import SyncTombstone
+from .job import Job
+from .period_snapshot import PeriodSnapshot
+from .student_kpi import StudentKpi
@@ -0,0 +1,25 @@
+"""Per-owner, per-domain and per-student data version counters used for change detection."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+
+from backend.app.core.time import utc_now
+from backend.app.db.base_class import Base
+
+
+class OwnerDataVersion(Base):
+    __tablename__ = "owner_data_versions"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    domain = Column(String(20), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=utc_now, onupdate=utc_now)
+
+
+class StudentDataVersion(Base):
+    __tablename__ = "student_data_versions"
+
+    # No foreign key: a student's sessions and the student can go in one flush,
+    # and the counter is bumped after the student row is already deleted.
+    student_id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=utc_now, onupdate=utc_now)
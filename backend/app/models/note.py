@@ -1,6 +1,8 @@
 """Note model for CoreBox CRM leads."""
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import relationship
 
 from backend.app.db.base_class import Base
@@ -8,11 +10,13 @@ from backend.app.db.base_class import Base
 
 class Note(Base):
     __tablename__ = "notes"
+    __table_args__ = (Index("ix_notes_lead_created_at_id", "lead_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     lead_id = Column(Integer, ForeignKey("leads.id"), nullable=False)
     owner_id = Column(Integer, nullable=False)
     content = Column(String, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set in Python so stored values keep microseconds and compare exactly against pagination cursors.
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now())
 
     lead = relationship("Lead", back_populates="lead_notes")
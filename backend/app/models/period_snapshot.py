@@ -0,0 +1,25 @@
+"""Frozen month-end financial figures per owner, written when a month is closed."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, UniqueConstraint
+
+from backend.app.core.time import utc_now
+from backend.app.db.base_class import Base
+
+
+class PeriodSnapshot(Base):
+    __tablename__ = "period_snapshots"
+    __table_args__ = (UniqueConstraint("owner_id", "year", "month", name="uq_period_snapshots_owner_month"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    # Payments received during the month.
+    revenue = Column(Numeric(12, 2), nullable=False, default=0)
+    payment_count = Column(Integer, nullable=False, default=0)
+    # Invoices issued during the month, with what had been paid on them / was still due at close.
+    invoiced = Column(Numeric(12, 2), nullable=False, default=0)
+    paid = Column(Numeric(12, 2), nullable=False, default=0)
+    outstanding = Column(Numeric(12, 2), nullable=False, default=0)
+    invoice_count = Column(Integer, nullable=False, default=0)
+    closed_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
@@ -2,7 +2,7 @@
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from backend.app.db.base_class import Base
@@ -10,6 +10,12 @@ from backend.app.db.base_class import Base
 
 class Reminder(Base):
     __tablename__ = "reminders"
+    __table_args__ = (
+        # Owner-wide due/overdue listing.
+        Index("ix_reminders_owner_completed_due_at", "owner_id", "completed", "due_at"),
+        # Scheduler horizon scan across owners.
+        Index("ix_reminders_completed_due_at", "completed", "due_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     lead_id = Column(Integer, ForeignKey("leads.id"), nullable=False)
@@ -19,6 +25,8 @@ class Reminder(Base):
     completed = Column(Boolean, nullable=False, default=False)
     created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    # Due time the scheduler last announced; claimed with a conditional UPDATE so one worker sends it.
+    notified_due_at = Column(DateTime(timezone=True), nullable=True)
 
     lead = relationship("Lead", back_populates="reminders")
     owner = relationship("User", back_populates="reminders", foreign_keys=[owner_id])
@@ -1,8 +1,8 @@
 """Session model for CoreBox CRM."""
 
-from datetime import datetime
+from datetime import date, datetime, time, timedelta, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, Numeric, String, Text, Time
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, Time, event
 from sqlalchemy.orm import relationship
 
 from backend.app.db.base_class import Base
@@ -11,6 +11,10 @@ from backend.app.core.time import utc_now
 
 class Session(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        Index("ix_sessions_owner_starts_at", "owner_id", "starts_at", "ends_at"),
+        Index("ix_sessions_owner_session_date", "owner_id", "session_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -28,9 +32,27 @@ class Session(Base):
     billing_status = Column(String(20), nullable=False, default="not_applicable")
     is_billable = Column(Boolean, nullable=False, default=True)
     rate_plan = Column(String(20), nullable=False, default="regular")
+    # Derived from session_date, start_time and duration_minutes (UTC) for calendar range queries.
+    starts_at = Column(DateTime, nullable=True)
+    ends_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, nullable=False, default=utc_now)
     updated_at = Column(DateTime, nullable=False, default=utc_now, onupdate=utc_now)
 
     owner = relationship("User", back_populates="sessions", foreign_keys=[owner_id])
     student = relationship("Student", back_populates="sessions", foreign_keys=[student_id])
     invoice_items = relationship("InvoiceItem", back_populates="session", cascade="all, delete-orphan")
+
+
+def session_bounds(session_date: datetime | date, start_time: time, duration_minutes: int) -> tuple[datetime, datetime]:
+    """Return the naive UTC (starts_at, ends_at) for a session's date, start time and duration."""
+    if isinstance(session_date, datetime) and session_date.tzinfo is not None:
+        session_date = session_date.astimezone(timezone.utc)
+    day = session_date.date() if isinstance(session_date, datetime) else session_date
+    starts_at = datetime.combine(day, start_time.replace(tzinfo=None))
+    return starts_at, starts_at + timedelta(minutes=duration_minutes)
+
+
+@event.listens_for(Session, "before_insert")
+@event.listens_for(Session, "before_update")
+def _set_schedule_bounds(mapper, connection, target: Session) -> None:
+    target.starts_at, target.ends_at = session_bounds(target.session_date, target.start_time, target.duration_minutes)
@@ -0,0 +1,35 @@
+"""Precomputed per-student KPIs behind the student dashboard list."""
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, Numeric
+
+from backend.app.core.time import utc_now
+from backend.app.db.base_class import Base
+
+
+class StudentKpi(Base):
+    __tablename__ = "student_kpis"
+    __table_args__ = (
+        Index("ix_student_kpis_owner_outstanding", "owner_id", "total_outstanding"),
+        Index("ix_student_kpis_owner_consistency", "owner_id", "consistency_score"),
+        Index("ix_student_kpis_owner_last_session", "owner_id", "last_session_date"),
+    )
+
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    total_sessions = Column(Integer, nullable=False, default=0)
+    total_minutes = Column(Integer, nullable=False, default=0)
+    # Invoiced is the sum of nominal session rates; paid counts payments on non-void invoices.
+    total_invoiced = Column(Numeric(12, 2), nullable=False, default=0)
+    total_paid = Column(Numeric(12, 2), nullable=False, default=0)
+    total_outstanding = Column(Numeric(12, 2), nullable=False, default=0)
+    first_session_date = Column(Date, nullable=True)
+    last_session_date = Column(Date, nullable=True)
+    # Rolling figures over the eight ISO weeks ending with the week starting ``as_of_week``.
+    sessions_last_8_weeks = Column(Integer, nullable=False, default=0)
+    hours_last_8_weeks = Column(Numeric(10, 2), nullable=False, default=0)
+    consistency_score = Column(Integer, nullable=False, default=0)
+    streak_weeks = Column(Integer, nullable=False, default=0)
+    as_of_week = Column(Date, nullable=False)
+    # Owner's students/sessions/billing data version the figures were computed from.
+    data_version = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
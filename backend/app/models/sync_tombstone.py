@@ -0,0 +1,17 @@
+"""Tombstones recording deleted rows for delta sync clients."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+
+from backend.app.core.time import utc_now
+from backend.app.db.base_class import Base
+
+
+class SyncTombstone(Base):
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (Index("ix_sync_tombstones_owner_deleted_at", "owner_id", "deleted_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
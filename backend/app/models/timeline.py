@@ -2,7 +2,7 @@
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from backend.app.db.base_class import Base
@@ -10,12 +10,23 @@ from backend.app.db.base_class import Base
 
 class TimelineEvent(Base):
     __tablename__ = "timeline_events"
+    __table_args__ = (
+        # Per-lead timeline pages.
+        Index("ix_timeline_events_lead_created_at_id", "lead_id", "created_at", "id"),
+        # Owner-wide recent activity.
+        Index("ix_timeline_events_owner_created_at_id", "owner_id", "created_at", "id"),
+        # Lead funnel reporting.
+        Index("ix_timeline_events_owner_to_status_lead", "owner_id", "to_status", "lead_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     lead_id = Column(Integer, ForeignKey("leads.id"), nullable=False)
     owner_id = Column(Integer, nullable=False)
     event_type = Column(String, nullable=False)
     description = Column(String, nullable=False)
+    # Set on lead_created / status_changed events; the lead's status before and after.
+    from_status = Column(String, nullable=True)
+    to_status = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
 
     lead = relationship("Lead", back_populates="timeline")
@@ -1,6 +1,8 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+
+MAX_BATCH_REPORTS = 12
 
 
 class ActivityStudentSummary(BaseModel):
@@ -167,6 +169,7 @@ class StudentAnalyticsEntry(BaseModel):
 
 class StudentAnalyticsReport(BaseModel):
     as_of: str
+    total: int | None = None
     students: list[StudentAnalyticsEntry]
 
     model_config = ConfigDict(from_attributes=True)
@@ -373,6 +376,55 @@ class StudentDashboardRow(BaseModel):
 
 class StudentDashboardList(BaseModel):
     as_of: str
+    total: int
     students: list[StudentDashboardRow]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# Lead funnel schemas
+
+
+class LeadFunnelStage(BaseModel):
+    stage: str
+    current_count: int
+    reached_count: int
+    conversion_rate_to_next: str | None
+    median_hours_in_stage: str | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LeadFunnelReport(BaseModel):
+    total_leads: int
+    closed_lost_count: int
+    overall_conversion_rate: str | None
+    stages: List[LeadFunnelStage]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Report batch schemas
+
+
+class ReportBatchItem(BaseModel):
+    name: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+
+class ReportBatchRequest(BaseModel):
+    reports: List[ReportBatchItem] = Field(min_length=1, max_length=MAX_BATCH_REPORTS)
+
+
+class ReportBatchResult(BaseModel):
+    name: str
+    status: Literal["ok", "error"]
+    status_code: int
+    elapsed_ms: float
+    data: Any = None
+    error: Optional[str] = None
+
+
+class ReportBatchResponse(BaseModel):
+    results: List[ReportBatchResult]
+    elapsed_ms: float
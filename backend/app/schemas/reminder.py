@@ -59,3 +59,12 @@ class ReminderRead(ReminderBase):
         return data
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class DueReminders(BaseModel):
+    """Open reminders for an owner: overdue before ``as_of``, due from ``as_of`` until ``until``."""
+
+    as_of: datetime
+    until: datetime
+    overdue: list[ReminderRead]
+    due: list[ReminderRead]
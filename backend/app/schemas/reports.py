@@ -1,5 +1,7 @@
+from datetime import datetime
 from decimal import Decimal
-from pydantic import BaseModel, ConfigDict
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class MonthlyRevenueRow(BaseModel):
@@ -10,3 +12,27 @@ class MonthlyRevenueRow(BaseModel):
     total_revenue: Decimal
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ReportingPeriod(BaseModel):
+    """A calendar month (UTC)."""
+
+    year: int = Field(..., ge=2000, le=9999)
+    month: int = Field(..., ge=1, le=12)
+
+
+class PeriodSnapshotRead(BaseModel):
+    year: int
+    month: int
+    revenue: str
+    payment_count: int
+    invoiced: str
+    paid: str
+    outstanding: str
+    invoice_count: int
+    closed_at: datetime
+
+
+class PeriodCloseResult(BaseModel):
+    closed: list[PeriodSnapshotRead]
+    closed_through: ReportingPeriod | None = None
@@ -1,9 +1,11 @@
 """Session schemas for CoreBox CRM."""
 
-from datetime import datetime, time
+from datetime import date, datetime, time
 from typing import Literal, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+MAX_SERIES_OCCURRENCES = 100
 
 
 class SessionBase(BaseModel):
@@ -25,6 +27,29 @@ class SessionCreate(SessionBase):
     student_id: int
 
 
+class SessionSeriesCreate(SessionCreate):
+    """A weekly or biweekly series starting at ``session_date``, ending after ``count`` sessions or on ``end_date``."""
+
+    frequency: Literal["weekly", "biweekly"] = "weekly"
+    count: Optional[int] = Field(None, ge=1, le=MAX_SERIES_OCCURRENCES)
+    end_date: Optional[date] = None
+
+    @model_validator(mode="after")
+    def check_series_end(self):
+        if (self.count is None) == (self.end_date is None):
+            raise ValueError("Provide exactly one of count or end_date")
+        if self.end_date is not None and self.end_date < self.session_date.date():
+            raise ValueError("end_date must not be before session_date")
+        return self
+
+
+class SessionSeriesCreated(BaseModel):
+    ids: list[int]
+    count: int
+    first_session_date: datetime
+    last_session_date: datetime
+
+
 class SessionUpdate(BaseModel):
     subject: Optional[str] = None
     duration_minutes: Optional[int] = None
@@ -53,3 +78,65 @@ class SessionRead(SessionBase):
     is_billable: bool
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CalendarSession(BaseModel):
+    id: int
+    student_id: int
+    subject: str
+    starts_at: datetime
+    ends_at: datetime
+    duration_minutes: int
+    attendance_status: str
+    session_type: Optional[str] = None
+
+
+class CalendarDay(BaseModel):
+    date: date
+    sessions: list[CalendarSession]
+
+
+class CalendarView(BaseModel):
+    view: Literal["day", "week"]
+    start_date: date
+    end_date: date
+    days: list[CalendarDay]
+    # Pairs of session ids in this window whose times overlap.
+    conflicts: list[tuple[int, int]]
+
+
+class SessionRepricingRequest(BaseModel):
+    """Which unbilled sessions to re-price and where the new rates come from."""
+
+    pricing: Literal["settings", "history"] = "settings"
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    plan: Optional[Literal["regular", "discount"]] = None
+    student_id: Optional[int] = None
+    dry_run: bool = False
+
+
+class SessionRepricingChange(BaseModel):
+    session_id: int
+    student_id: int
+    session_date: datetime
+    rate_plan: Optional[str] = None
+    duration_minutes: int
+    old_rate_per_hour: Optional[str] = None
+    new_rate_per_hour: str
+    old_cost_total: Optional[str] = None
+    new_cost_total: str
+
+
+class SessionRepricingReport(BaseModel):
+    dry_run: bool
+    pricing: str
+    matched: int
+    changed: int
+    unpriced: int
+    updated: int
+    old_total: str
+    new_total: str
+    delta: str
+    changes: list[SessionRepricingChange]
+    changes_truncated: bool
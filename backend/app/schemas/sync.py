@@ -0,0 +1,43 @@
+"""Schemas for client sync endpoints."""
+
+from pydantic import BaseModel, ConfigDict
+
+from backend.app.schemas.invoice import InvoiceRead
+from backend.app.schemas.lead import LeadRead
+from backend.app.schemas.session import SessionRead
+from backend.app.schemas.student import StudentRead
+
+
+class DataVersions(BaseModel):
+    owner_id: int
+    versions: dict[str, int]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class _EntityChanges(BaseModel):
+    deleted: list[int] = []
+
+
+class LeadChanges(_EntityChanges):
+    updated: list[LeadRead] = []
+
+
+class StudentChanges(_EntityChanges):
+    updated: list[StudentRead] = []
+
+
+class SessionChanges(_EntityChanges):
+    updated: list[SessionRead] = []
+
+
+class InvoiceChanges(_EntityChanges):
+    updated: list[InvoiceRead] = []
+
+
+class SyncChanges(BaseModel):
+    token: str
+    leads: LeadChanges
+    students: StudentChanges
+    sessions: SessionChanges
+    invoices: InvoiceChanges
@@ -2,6 +2,8 @@
 
 from datetime import datetime
 
+from typing import Optional
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -9,6 +11,12 @@ class TimelineEventRead(BaseModel):
     id: int
     event_type: str
     description: str
+    from_status: Optional[str] = None
+    to_status: Optional[str] = None
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ActivityEventRead(TimelineEventRead):
+    lead_id: int
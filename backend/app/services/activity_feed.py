@@ -0,0 +1,56 @@
+"""Owner-wide recent activity: timeline events across leads, newest first.
+
+Without a lead filter the feed is one range scan of
+``ix_timeline_events_owner_created_at_id``, which already yields the owner's
+events merged across leads in (created_at, id) order. For a chosen set of
+leads it is a k-way merge: each lead contributes a lazy newest-first stream
+read from ``ix_timeline_events_lead_created_at_id`` and ``heapq.merge``
+interleaves them, so only about one page per lead is ever read.
+"""
+
+import heapq
+from itertools import islice
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.app.core.pagination import Cursor, after_cursor, encode_cursor, keyset_page
+from backend.app.models.lead import Lead
+from backend.app.models.timeline import TimelineEvent
+
+FEED_MAX_LEADS = 50
+
+
+def _lead_events_desc(db: Session, lead_id: int, cursor: Optional[Cursor], page_size: int) -> Iterator[TimelineEvent]:
+    while True:
+        query = db.query(TimelineEvent).filter(TimelineEvent.lead_id == lead_id)
+        if cursor is not None:
+            query = query.filter(after_cursor(TimelineEvent.created_at, TimelineEvent.id, cursor, descending=True))
+        rows = query.order_by(TimelineEvent.created_at.desc(), TimelineEvent.id.desc()).limit(page_size).all()
+        yield from rows
+        if len(rows) < page_size:
+            return
+        cursor = (rows[-1].created_at, rows[-1].id)
+
+
+def get_recent_activity(
+    db: Session,
+    *,
+    owner_id: int,
+    lead_ids: Optional[Sequence[int]] = None,
+    cursor: Optional[Cursor] = None,
+    limit: int = 50,
+) -> Tuple[List[TimelineEvent], Optional[str]]:
+    """Return one page of the newest timeline events and the cursor for the next page."""
+    if not lead_ids:
+        query = db.query(TimelineEvent).filter(TimelineEvent.owner_id == owner_id)
+        return keyset_page(query, TimelineEvent.created_at, TimelineEvent.id, cursor=cursor, limit=limit, descending=True)
+
+    owned = [lead_id for (lead_id,) in db.query(Lead.id).filter(Lead.owner_id == owner_id, Lead.id.in_(set(lead_ids)))]
+    streams = [_lead_events_desc(db, lead_id, cursor, limit + 1) for lead_id in owned]
+    merged = heapq.merge(*streams, key=lambda event: (event.created_at, event.id), reverse=True)
+    rows = list(islice(merged, limit + 1))
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
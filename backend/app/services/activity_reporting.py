@@ -1,92 +1,106 @@
-"""Activity reporting helpers for sessions and students."""
+"""Activity reporting helpers for sessions and students.
+
+Sessions, invoices and payments are aggregated per student in SQL over the
+requested ``[start_date, end_date]`` window, so the work follows the size of
+the window rather than the owner's whole history. Summaries are cached per
+owner and range until the owner's student, session or billing data changes.
+"""
 
 from datetime import date
 from decimal import Decimal
-from typing import Dict
+from typing import Dict, Tuple
 
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from backend.app.core.cache import LRUCache
+from backend.app.core.money import format_cents, to_cents
+from backend.app.core.time import date_range_filters
+from backend.app.db.snapshot import read_snapshot
 from backend.app.models.invoice import Invoice
 from backend.app.models.payment import Payment
 from backend.app.models.session import Session as SessionModel
 from backend.app.models.student import Student
+from backend.app.services.data_versions import get_owner_data_stamp
+
+ACTIVITY_CACHE_DOMAINS = ("students", "sessions", "billing")
 
+_activity_cache = LRUCache(maxsize=512)
 
-def get_activity_summary(db: Session, *, owner_id: int, start_date: date | None = None) -> Dict:
-    """Return aggregated activity summary for an owner."""
-    session_query = db.query(SessionModel).filter(SessionModel.owner_id == owner_id)
-    if start_date:
-        session_query = session_query.filter(func.date(SessionModel.session_date) >= start_date)
-    sessions = session_query.all()
 
-    session_count = len(sessions)
-    total_minutes = sum((s.duration_minutes or 0) for s in sessions)
-    total_hours = Decimal(total_minutes) / Decimal("60")
+def _hours(minutes: int) -> str:
+    return str((Decimal(minutes) / Decimal("60")).quantize(Decimal("0.01")))
 
-    invoice_query = db.query(Invoice).filter(Invoice.owner_id == owner_id)
-    if start_date:
-        invoice_query = invoice_query.filter(func.date(Invoice.created_at) >= start_date)
-    invoices = invoice_query.all()
-    invoice_ids = [inv.id for inv in invoices]
 
-    total_invoiced = sum((inv.total_amount or Decimal("0.00") for inv in invoices), Decimal("0.00"))
-    total_outstanding = sum(
-        (Decimal(str(inv.balance_due or 0)) for inv in invoices),
-        Decimal("0.00"),
+def _sessions_by_student(db: Session, owner_id: int, start_date, end_date) -> Dict[int, Tuple[int, int]]:
+    rows = (
+        db.query(SessionModel.student_id, func.count(SessionModel.id), func.coalesce(func.sum(SessionModel.duration_minutes), 0))
+        .filter(SessionModel.owner_id == owner_id, *date_range_filters(SessionModel.session_date, start_date, end_date))
+        .group_by(SessionModel.student_id)
     )
+    return {student_id: (count, int(minutes)) for student_id, count, minutes in rows}
 
-    total_paid = Decimal("0.00")
-    if invoice_ids:
-        pay_sum = (
-            db.query(func.coalesce(func.sum(Payment.amount), 0))
-            .filter(Payment.invoice_id.in_(invoice_ids))
-            .scalar()
-        )
-        total_paid = Decimal(str(pay_sum or 0))
 
-    # Per-student aggregation
-    students = db.query(Student).filter(Student.owner_id == owner_id).all()
-    student_summaries = []
-    for student in students:
-        stu_sessions = [s for s in sessions if s.student_id == student.id]
-        stu_minutes = sum((s.duration_minutes or 0) for s in stu_sessions)
-        stu_hours = Decimal(stu_minutes) / Decimal("60")
-
-        stu_invoices = [inv for inv in invoices if inv.student_id == student.id]
-        stu_invoice_ids = [inv.id for inv in stu_invoices]
-        stu_total_invoiced = sum((inv.total_amount or Decimal("0.00") for inv in stu_invoices), Decimal("0.00"))
-        stu_outstanding = sum(
-            (Decimal(str(inv.balance_due or 0)) for inv in stu_invoices),
-            Decimal("0.00"),
-        )
-        stu_paid = Decimal("0.00")
-        if stu_invoice_ids:
-            stu_pay_sum = (
-                db.query(func.coalesce(func.sum(Payment.amount), 0))
-                .filter(Payment.invoice_id.in_(stu_invoice_ids))
-                .scalar()
-            )
-            stu_paid = Decimal(str(stu_pay_sum or 0))
+def _invoices_by_student(db: Session, owner_id: int, start_date, end_date) -> Dict[int, Tuple[int, int]]:
+    rows = (
+        db.query(Invoice.student_id, func.coalesce(func.sum(Invoice.total_amount), 0), func.coalesce(func.sum(Invoice.balance_due), 0))
+        .filter(Invoice.owner_id == owner_id, *date_range_filters(Invoice.created_at, start_date, end_date))
+        .group_by(Invoice.student_id)
+    )
+    return {student_id: (to_cents(invoiced), to_cents(outstanding)) for student_id, invoiced, outstanding in rows}
+
 
+def _payments_by_student(db: Session, owner_id: int, start_date, end_date) -> Dict[int, int]:
+    """Payments received against the invoices issued in the window, whenever they were paid."""
+    rows = (
+        db.query(Invoice.student_id, func.coalesce(func.sum(Payment.amount), 0))
+        .join(Invoice, Payment.invoice_id == Invoice.id)
+        .filter(Invoice.owner_id == owner_id, *date_range_filters(Invoice.created_at, start_date, end_date))
+        .group_by(Invoice.student_id)
+    )
+    return {student_id: to_cents(paid) for student_id, paid in rows}
+
+
+def _compute_activity_summary(db: Session, owner_id: int, start_date: date | None, end_date: date | None) -> Dict:
+    sessions = _sessions_by_student(db, owner_id, start_date, end_date)
+    invoices = _invoices_by_student(db, owner_id, start_date, end_date)
+    payments = _payments_by_student(db, owner_id, start_date, end_date)
+
+    students = db.query(Student.id, Student.student_name).filter(Student.owner_id == owner_id).order_by(Student.id)
+    student_summaries = []
+    for student_id, student_name in students:
+        session_count, minutes = sessions.get(student_id, (0, 0))
+        invoiced, outstanding = invoices.get(student_id, (0, 0))
         student_summaries.append(
             {
-                "student_id": student.id,
-                "student_display_name": student.student_name,
-                "session_count": len(stu_sessions),
-                "hours": str(stu_hours.quantize(Decimal("0.01"))),
-                "total_invoiced": str(stu_total_invoiced.quantize(Decimal("0.01"))),
-                "total_paid": str(stu_paid.quantize(Decimal("0.01"))),
-                "total_outstanding": str(stu_outstanding.quantize(Decimal("0.01"))),
+                "student_id": student_id,
+                "student_display_name": student_name,
+                "session_count": session_count,
+                "hours": _hours(minutes),
+                "total_invoiced": format_cents(invoiced),
+                "total_paid": format_cents(payments.get(student_id, 0)),
+                "total_outstanding": format_cents(outstanding),
             }
         )
 
-    summary = {
-        "session_count": session_count,
-        "total_hours": str(total_hours.quantize(Decimal("0.01"))),
-        "total_invoiced": str(total_invoiced.quantize(Decimal("0.01"))),
-        "total_paid": str(total_paid.quantize(Decimal("0.01"))),
-        "total_outstanding": str(total_outstanding.quantize(Decimal("0.01"))),
+    return {
+        "session_count": sum(count for count, _ in sessions.values()),
+        "total_hours": _hours(sum(minutes for _, minutes in sessions.values())),
+        "total_invoiced": format_cents(sum(invoiced for invoiced, _ in invoices.values())),
+        "total_paid": format_cents(sum(payments.values())),
+        "total_outstanding": format_cents(sum(outstanding for _, outstanding in invoices.values())),
         "students": student_summaries,
     }
+
+
+@read_snapshot
+def get_activity_summary(
+    db: Session, *, owner_id: int, start_date: date | None = None, end_date: date | None = None
+) -> Dict:
+    """Return aggregated activity summary for an owner over an optional inclusive date range."""
+    key = (owner_id, start_date, end_date, get_owner_data_stamp(db, owner_id, ACTIVITY_CACHE_DOMAINS))
+    summary = _activity_cache.get(key)
+    if summary is None:
+        summary = _compute_activity_summary(db, owner_id, start_date, end_date)
+        _activity_cache.set(key, summary)
     return summary
@@ -2,21 +2,24 @@
 
 from datetime import date, datetime, timezone
 from decimal import Decimal
-from typing import Dict
+from typing import Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
+from backend.app.core.money import format_cents, to_cents
+from backend.app.db.snapshot import read_snapshot
 from backend.app.models.invoice import Invoice
 from backend.app.models.student import Student
 
 
-def _init_buckets() -> Dict[str, Decimal]:
+def _init_buckets() -> Dict[str, int]:
+    # Bucket totals are carried as integer cents until serialization.
     return {
-        "current": Decimal("0.00"),
-        "days_1_30": Decimal("0.00"),
-        "days_31_60": Decimal("0.00"),
-        "days_61_90": Decimal("0.00"),
-        "days_90_plus": Decimal("0.00"),
+        "current": 0,
+        "days_1_30": 0,
+        "days_31_60": 0,
+        "days_61_90": 0,
+        "days_90_plus": 0,
     }
 
 
@@ -32,25 +35,37 @@ def _bucket_for_days(days_past_due: int) -> str:
     return "days_90_plus"
 
 
-def get_aging_summary(db: Session, *, owner_id: int, as_of: date | None = None) -> dict:
-    """Compute aging summary for an owner scoped by outstanding invoices."""
+CLOSED_STATUSES = ("paid", "void", "written_off")
+
+
+@read_snapshot
+def get_aging_summary(
+    db: Session, *, owner_id: int, as_of: date | None = None, invoices: Optional[List[Invoice]] = None
+) -> dict:
+    """Compute aging summary for an owner scoped by outstanding invoices.
+
+    ``invoices`` may be the owner's invoices already loaded by the caller.
+    """
     as_of_date = as_of or datetime.now(timezone.utc).date()
 
-    invoices = (
-        db.query(Invoice)
-        .filter(
-            Invoice.owner_id == owner_id,
-            Invoice.balance_due > Decimal("0.00"),
-            Invoice.status.notin_(["paid", "void", "written_off"]),
+    if invoices is None:
+        invoices = (
+            db.query(Invoice)
+            .filter(
+                Invoice.owner_id == owner_id,
+                Invoice.balance_due > Decimal("0.00"),
+                Invoice.status.notin_(CLOSED_STATUSES),
+            )
+            .all()
         )
-        .all()
-    )
+    else:
+        invoices = [inv for inv in invoices if inv.balance_due > Decimal("0.00") and inv.status not in CLOSED_STATUSES]
 
     totals = _init_buckets()
-    per_student: Dict[int, Dict[str, Decimal]] = {}
+    per_student: Dict[int, Dict[str, int]] = {}
 
     for inv in invoices:
-        balance = Decimal(str(inv.balance_due or 0)).quantize(Decimal("0.01"))
+        balance = to_cents(inv.balance_due)
         due_date = inv.due_date.date() if inv.due_date else None
         if due_date is None:
             bucket = "current"
@@ -73,14 +88,14 @@ def get_aging_summary(db: Session, *, owner_id: int, as_of: date | None = None)
                 {
                     "student_id": student_id,
                     "student_display_name": student.student_name if student else "Unknown",
-                    "buckets": {k: str(v.quantize(Decimal("0.01"))) for k, v in buckets.items()},
+                    "buckets": {k: format_cents(v) for k, v in buckets.items()},
                 }
             )
 
     summary = {
         "as_of": as_of_date.isoformat(),
         "currency": "USD",
-        "totals": {k: str(v.quantize(Decimal("0.01"))) for k, v in totals.items()},
+        "totals": {k: format_cents(v) for k, v in totals.items()},
         "students": students_rows,
     }
     return summary
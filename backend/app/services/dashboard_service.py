@@ -2,19 +2,32 @@
 
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+from typing import List, Optional
 
+from backend.app.db.snapshot import read_snapshot
+from backend.app.models.invoice import Invoice
+from backend.app.models.payment import Payment
 from backend.app.services.activity_reporting import get_activity_summary
 from backend.app.services.aging_reporting import get_aging_summary
 from backend.app.services.invoice_pipeline_reporting import get_invoice_pipeline_summary
 from backend.app.services.payment_analytics_reporting import get_payment_analytics
 from backend.app.services.reports import get_financial_summary_for_owner
-from backend.app.services.student_analytics_reporting import get_student_analytics
+from backend.app.services.student_kpis import list_student_kpis
 
 
-def get_owner_dashboard_summary(db, *, owner_id: int, today: date) -> dict:
+@read_snapshot
+def get_owner_dashboard_summary(
+    db,
+    *,
+    owner_id: int,
+    today: date,
+    invoices: Optional[List[Invoice]] = None,
+    payments: Optional[List[Payment]] = None,
+) -> dict:
+    """Summary cards; ``invoices`` / ``payments`` may be the owner's rows preloaded by the caller."""
     # Financial card
     financial_all = get_financial_summary_for_owner(db, owner_id=owner_id)
-    pay_analytics = get_payment_analytics(db, owner_id=owner_id, today=today)
+    pay_analytics = get_payment_analytics(db, owner_id=owner_id, today=today, payments=payments)
 
     financial_card = {
         "total_invoiced_all_time": financial_all["total_invoiced"],
@@ -35,7 +48,7 @@ def get_owner_dashboard_summary(db, *, owner_id: int, today: date) -> dict:
     }
 
     # AR card
-    aging = get_aging_summary(db, owner_id=owner_id)
+    aging = get_aging_summary(db, owner_id=owner_id, invoices=invoices)
     ar_totals = aging.get("totals", {})
     ar_card = {
         "current": ar_totals.get("current", "0.00"),
@@ -46,7 +59,7 @@ def get_owner_dashboard_summary(db, *, owner_id: int, today: date) -> dict:
     }
 
     # Pipeline card
-    pipeline = get_invoice_pipeline_summary(db, owner_id=owner_id, today=today)
+    pipeline = get_invoice_pipeline_summary(db, owner_id=owner_id, today=today, invoices=invoices)
     statuses = pipeline.get("statuses", {})
     due_windows = pipeline.get("due_windows", {})
     pipeline_card = {
@@ -67,24 +80,9 @@ def get_owner_dashboard_summary(db, *, owner_id: int, today: date) -> dict:
     }
 
 
-def get_student_dashboard_list(db, *, owner_id: int, today: date) -> dict:
-    analytics = get_student_analytics(db, owner_id=owner_id, today=today)
-    rows = []
-    for stu in analytics.get("students", []):
-        kpis = stu.get("kpis", {})
-        rows.append(
-            {
-                "student_id": stu.get("student_id"),
-                "student_display_name": stu.get("student_display_name"),
-                "parent_display_name": stu.get("parent_display_name"),
-                "total_sessions_all_time": kpis.get("total_sessions", 0),
-                "total_hours_all_time": kpis.get("total_hours", "0.00"),
-                "consistency_score_0_100": kpis.get("consistency_score_0_100", 0),
-                "current_session_streak_weeks": kpis.get("current_session_streak_weeks", 0),
-                "total_invoiced_all_time": kpis.get("total_invoiced", "0.00"),
-                "total_paid_all_time": kpis.get("total_paid", "0.00"),
-                "total_outstanding_all_time": kpis.get("total_outstanding", "0.00"),
-            }
-        )
+def get_student_dashboard_list(db, *, owner_id: int, today: date, **params) -> dict:
+    """One page of per-student dashboard KPIs, read from the ``student_kpis`` snapshots.
 
-    return {"as_of": today.isoformat(), "students": rows}
+    ``params`` are the sort, paging and filter arguments of ``page_student_kpis``.
+    """
+    return list_student_kpis(db, owner_id=owner_id, today=today, **params)
@@ -0,0 +1,215 @@
+"""Per-owner, per-domain data versions bumped whenever owner-scoped rows are written.
+
+An ``after_flush`` hook increments ``owner_data_versions`` inside the same
+transaction as the write, so readers (ETags, caches, sync clients) can cheaply
+tell whether anything changed for an owner without re-running queries. Each
+read is a primary-key lookup on ``(owner_id, domain)``.
+
+Parent links and a parent's rate plan have no owner of their own but show up in
+student listings, so they bump the ``students`` domain of the linked students'
+owners.
+
+Session, invoice and payment writes also bump ``student_data_versions`` for the
+students they belong to, in the same upsert-per-flush way, so per-student
+snapshots (the dashboard KPIs) can tell exactly which students changed.
+"""
+
+from itertools import chain
+from typing import Callable, Dict, Iterable, Tuple
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from backend.app.core.time import utc_now
+from backend.app.models.data_version import OwnerDataVersion, StudentDataVersion
+from backend.app.models.invoice import Invoice
+from backend.app.models.invoice_item import InvoiceItem
+from backend.app.models.lead import Lead
+from backend.app.models.note import Note
+from backend.app.models.parent_link import ParentStudentLink
+from backend.app.models.payment import Payment
+from backend.app.models.rate_history import RateHistory
+from backend.app.models.rate_settings import RateSettings
+from backend.app.models.reminder import Reminder
+from backend.app.models.session import Session as SessionModel
+from backend.app.models.student import Student
+from backend.app.models.timeline import TimelineEvent
+from backend.app.models.user import User
+
+DOMAINS = ("leads", "students", "sessions", "billing", "rates")
+
+DOMAIN_BY_MODEL = {
+    Lead: "leads",
+    Note: "leads",
+    TimelineEvent: "leads",
+    Reminder: "leads",
+    Student: "students",
+    SessionModel: "sessions",
+    Invoice: "billing",
+    InvoiceItem: "billing",
+    Payment: "billing",
+    RateSettings: "rates",
+    RateHistory: "rates",
+}
+
+
+def _link_owners(session: Session, link: ParentStudentLink) -> Iterable[int]:
+    return session.connection().execute(select(Student.owner_id).where(Student.id == link.student_id)).scalars()
+
+
+def _parent_owners(session: Session, user: User) -> Iterable[int]:
+    # Only a parent's rate plan is shown with their students; new and deleted
+    # parents reach the listing through their links.
+    if user in session.new or user in session.deleted or not inspect(user).attrs.rate_plan.history.has_changes():
+        return ()
+    return session.connection().execute(
+        select(Student.owner_id)
+        .join(ParentStudentLink, ParentStudentLink.student_id == Student.id)
+        .where(ParentStudentLink.parent_user_id == user.id)
+        .distinct()
+    ).scalars()
+
+
+# Rows without an owner_id: model -> (domain, owners whose listings show the row)
+LINKED_DOMAIN_BY_MODEL: Dict[type, Tuple[str, Callable[[Session, object], Iterable[int]]]] = {
+    ParentStudentLink: ("students", _link_owners),
+    User: ("students", _parent_owners),
+}
+
+
+def _own_student(session: Session, obj) -> Iterable[int]:
+    # The history also holds the previous student when a row is moved to another;
+    # it is empty when the column was expired and left untouched.
+    return inspect(obj).attrs.student_id.history.sum() or (obj.student_id,)
+
+
+def _payment_student(session: Session, payment: Payment) -> Iterable[int]:
+    return session.connection().execute(select(Invoice.student_id).where(Invoice.id == payment.invoice_id)).scalars()
+
+
+# model -> students whose figures (sessions, invoiced, paid) the row counts towards
+STUDENTS_BY_MODEL: Dict[type, Callable[[Session, object], Iterable[int]]] = {
+    SessionModel: _own_student,
+    Invoice: _own_student,
+    Payment: _payment_student,
+}
+
+
+def get_owner_data_versions(db: Session, owner_id: int) -> Dict[str, int]:
+    """Return every domain's version for an owner (0 for domains never written)."""
+    rows = (
+        db.query(OwnerDataVersion.domain, OwnerDataVersion.version)
+        .filter(OwnerDataVersion.owner_id == owner_id)
+        .all()
+    )
+    versions = {domain: 0 for domain in DOMAINS}
+    versions.update({domain: version for domain, version in rows})
+    return versions
+
+
+def get_owner_data_version(db: Session, owner_id: int, domains: Iterable[str] = DOMAINS) -> int:
+    """Return a combined version for the given domains.
+
+    Every domain counter only grows, so their sum changes whenever any of them
+    does and can be used directly as a cache or ETag key.
+    """
+    domains = tuple(domains)
+    query = db.query(OwnerDataVersion.version).filter(OwnerDataVersion.owner_id == owner_id)
+    if len(domains) == 1:
+        query = query.filter(OwnerDataVersion.domain == domains[0])
+    else:
+        query = query.filter(OwnerDataVersion.domain.in_(domains))
+    return sum(version for (version,) in query.all())
+
+
+def get_owner_data_stamp(db: Session, owner_id: int, domains: Iterable[str] = DOMAINS) -> Tuple[int, str | None]:
+    """Return (combined version, last bump time) for use in in-process cache keys.
+
+    The timestamp keeps keys from colliding if the database is recreated and
+    the counters start again from zero.
+    """
+    version, last_updated = (
+        db.query(func.coalesce(func.sum(OwnerDataVersion.version), 0), func.max(OwnerDataVersion.updated_at))
+        .filter(OwnerDataVersion.owner_id == owner_id, OwnerDataVersion.domain.in_(tuple(domains)))
+        .one()
+    )
+    return int(version), last_updated.isoformat() if last_updated else None
+
+
+def _upsert_insert(dialect_name: str):
+    # Imported on use: the postgresql package pulls in every driver's dialect.
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def bump_owner_data_versions(connection, keys: Iterable[Tuple[int, str]]) -> None:
+    """Increment the version for each ``(owner_id, domain)`` pair, creating missing rows.
+
+    One ``INSERT ... ON CONFLICT DO UPDATE``, so two transactions making an
+    owner's first write at once both count instead of one hitting the primary key.
+    """
+    table = OwnerDataVersion.__table__
+    now = utc_now()
+    rows = [
+        {"owner_id": owner_id, "domain": domain, "version": 1, "updated_at": now}
+        for owner_id, domain in sorted(set(keys))
+    ]
+    if not rows:
+        return
+    statement = _upsert_insert(connection.dialect.name)(table).values(rows)
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.owner_id, table.c.domain],
+            set_={"version": table.c.version + 1, "updated_at": statement.excluded.updated_at},
+        )
+    )
+
+
+def bump_student_data_versions(connection, student_ids: Iterable[int]) -> None:
+    """Increment each student's version with the same single upsert as ``bump_owner_data_versions``."""
+    table = StudentDataVersion.__table__
+    now = utc_now()
+    rows = [{"student_id": student_id, "version": 1, "updated_at": now} for student_id in sorted(set(student_ids))]
+    if not rows:
+        return
+    statement = _upsert_insert(connection.dialect.name)(table).values(rows)
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.student_id],
+            set_={"version": table.c.version + 1, "updated_at": statement.excluded.updated_at},
+        )
+    )
+
+
+def bump_versions(db: Session, owner_id: int, *domains: str, student_ids: Iterable[int] = ()) -> None:
+    """Bump versions explicitly for writes that bypass the ORM flush (bulk UPDATE/DELETE)."""
+    bump_owner_data_versions(db.connection(), ((owner_id, domain) for domain in domains))
+    bump_student_data_versions(db.connection(), student_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_versions_after_flush(session: Session, flush_context) -> None:
+    keys = set()
+    student_ids = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        domain = DOMAIN_BY_MODEL.get(type(obj))
+        linked = LINKED_DOMAIN_BY_MODEL.get(type(obj))
+        if domain is None and linked is None:
+            continue
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        students = STUDENTS_BY_MODEL.get(type(obj))
+        if students is not None:
+            student_ids.update(student_id for student_id in students(session, obj) if student_id is not None)
+        if domain is None:
+            domain, owners = linked
+            keys.update((owner_id, domain) for owner_id in owners(session, obj) if owner_id is not None)
+        elif obj.owner_id is not None:
+            keys.add((obj.owner_id, domain))
+    if keys:
+        bump_owner_data_versions(session.connection(), keys)
+    if student_ids:
+        bump_student_data_versions(session.connection(), student_ids)
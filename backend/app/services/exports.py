@@ -0,0 +1,230 @@
+"""Streaming CSV / NDJSON exports of sessions, invoices (with items) and payments.
+
+Rows are read with a server-side cursor in ``yield_per`` batches, encoded
+and flushed in ~64 KiB chunks (optionally gzip-compressed), so memory use does
+not grow with the size of the export. The generator opens its own database
+session because it keeps running after the request handler has returned.
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.app.core.time import date_range_filters
+from backend.app.models.invoice import Invoice
+from backend.app.models.invoice_item import InvoiceItem
+from backend.app.models.payment import Payment
+from backend.app.models.session import Session as SessionModel
+
+EXPORT_FORMATS = ("csv", "ndjson")
+CHUNK_BYTES = 64 * 1024
+YIELD_PER = 2_000
+
+SESSION_COLUMNS = (
+    SessionModel.id,
+    SessionModel.student_id,
+    SessionModel.subject,
+    SessionModel.session_date,
+    SessionModel.start_time,
+    SessionModel.duration_minutes,
+    SessionModel.rate_per_hour,
+    SessionModel.cost_total,
+    SessionModel.rate_plan,
+    SessionModel.attendance_status,
+    SessionModel.billing_status,
+    SessionModel.is_billable,
+)
+INVOICE_COLUMNS = (
+    Invoice.id,
+    Invoice.student_id,
+    Invoice.status,
+    Invoice.total_amount,
+    Invoice.amount_paid,
+    Invoice.balance_due,
+    Invoice.due_date,
+    Invoice.created_at,
+)
+INVOICE_ITEM_COLUMNS = (
+    InvoiceItem.id.label("item_id"),
+    InvoiceItem.session_id.label("item_session_id"),
+    InvoiceItem.description.label("item_description"),
+    InvoiceItem.rate_per_hour.label("item_rate_per_hour"),
+    InvoiceItem.duration_minutes.label("item_duration_minutes"),
+    InvoiceItem.cost_total.label("item_cost_total"),
+)
+PAYMENT_COLUMNS = (
+    Payment.id,
+    Payment.invoice_id,
+    Payment.amount,
+    Payment.method,
+    Payment.received_at,
+    Payment.notes,
+)
+
+
+def _sessions_statement(owner_id: int, start_date: Optional[date], end_date: Optional[date]):
+    return (
+        select(*SESSION_COLUMNS)
+        .where(SessionModel.owner_id == owner_id, *date_range_filters(SessionModel.session_date, start_date, end_date))
+        .order_by(SessionModel.id)
+    )
+
+
+def _invoices_statement(owner_id: int, start_date: Optional[date], end_date: Optional[date]):
+    return (
+        select(*INVOICE_COLUMNS, *INVOICE_ITEM_COLUMNS)
+        .outerjoin(InvoiceItem, InvoiceItem.invoice_id == Invoice.id)
+        .where(Invoice.owner_id == owner_id, *date_range_filters(Invoice.created_at, start_date, end_date))
+        .order_by(Invoice.id, InvoiceItem.id)
+    )
+
+
+def _payments_statement(owner_id: int, start_date: Optional[date], end_date: Optional[date]):
+    return (
+        select(*PAYMENT_COLUMNS)
+        .where(Payment.owner_id == owner_id, *date_range_filters(Payment.received_at, start_date, end_date))
+        .order_by(Payment.id)
+    )
+
+
+EXPORT_DATASETS: Dict[str, Callable] = {
+    "sessions": _sessions_statement,
+    "invoices": _invoices_statement,
+    "payments": _payments_statement,
+}
+
+
+def _converter(sql_type, for_json: bool):
+    """Per-column value converter chosen once from the column type (None = pass through)."""
+    try:
+        python_type = sql_type.python_type
+    except NotImplementedError:
+        return None
+    if issubclass(python_type, (datetime, date, time)):
+        return lambda value: None if value is None else value.isoformat()
+    if for_json and issubclass(python_type, Decimal):
+        return lambda value: None if value is None else str(value)
+    return None
+
+
+def _iter_rows(db: Session, statement, yield_per: int, for_json: bool) -> Tuple[List[str], Iterator[list]]:
+    """Column names and a lazy iterator of rows converted to plain values, ``yield_per`` at a time."""
+    result = db.connection().execute(statement.execution_options(yield_per=yield_per))
+    columns = list(result.keys())
+    converters = [_converter(column.type, for_json) for column in statement.selected_columns]
+    if not any(converters):
+        return columns, (list(row) for partition in result.partitions() for row in partition)
+    pairs = list(enumerate(converters))
+
+    def converted() -> Iterator[list]:
+        for partition in result.partitions():
+            for row in partition:
+                values = list(row)
+                for index, convert in pairs:
+                    if convert is not None:
+                        values[index] = convert(values[index])
+                yield values
+
+    return columns, converted()
+
+
+def _nest_invoice_items(columns: List[str], rows: Iterable[list]) -> Iterator[dict]:
+    """Fold consecutive joined rows of one invoice into a record with an ``items`` list."""
+    split = len(INVOICE_COLUMNS)
+    invoice_keys, item_keys = columns[:split], [key[len("item_"):] for key in columns[split:]]
+    current = None
+    for row in rows:
+        if current is None or current["id"] != row[0]:
+            if current is not None:
+                yield current
+            current = dict(zip(invoice_keys, row[:split]))
+            current["items"] = []
+        if row[split] is not None:
+            current["items"].append(dict(zip(item_keys, row[split:])))
+    if current is not None:
+        yield current
+
+
+def _encode_csv(columns: List[str], rows: Iterable[list]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _encode_ndjson(records: Iterable[dict]) -> Iterator[str]:
+    parts: List[str] = []
+    size = 0
+    for record in records:
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        parts.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield "".join(parts)
+            parts, size = [], 0
+    yield "".join(parts)
+
+
+def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_export(
+    session_factory: Callable[[], Session],
+    *,
+    owner_id: int,
+    dataset: str,
+    fmt: str = "csv",
+    compress: bool = False,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    yield_per: int = YIELD_PER,
+) -> Iterator[bytes]:
+    """Yield the encoded export chunk by chunk."""
+    statement = EXPORT_DATASETS[dataset](owner_id, start_date, end_date)
+
+    def encoded() -> Iterator[bytes]:
+        db = session_factory()
+        try:
+            columns, rows = _iter_rows(db, statement, yield_per, for_json=fmt == "ndjson")
+            if fmt == "csv":
+                texts = _encode_csv(columns, rows)
+            elif dataset == "invoices":
+                texts = _encode_ndjson(_nest_invoice_items(columns, rows))
+            else:
+                texts = _encode_ndjson(dict(zip(columns, row)) for row in rows)
+            for text in texts:
+                if text:
+                    yield text.encode("utf-8")
+        finally:
+            db.close()
+
+    return _gzip(encoded()) if compress else encoded()
+
+
+def export_filename(dataset: str, fmt: str, compress: bool) -> str:
+    return f"{dataset}.{fmt}" + (".gz" if compress else "")
+
+
+def export_media_type(fmt: str, compress: bool) -> str:
+    if compress:
+        return "application/gzip"
+    return "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson"
@@ -1,11 +1,11 @@
 """Invoice pipeline reporting for owners."""
 
 from datetime import date, datetime, timezone
-from decimal import Decimal
-from typing import Dict
+from typing import Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
+from backend.app.core.money import format_cents, to_cents
 from backend.app.models.invoice import Invoice
 
 
@@ -14,16 +14,16 @@ STATUS_KEYS = ["draft", "issued", "paid", "partially_paid", "void"]
 
 def _init_status_buckets() -> Dict[str, dict]:
     return {
-        key: {"count": 0, "total_amount": Decimal("0.00"), "total_outstanding": Decimal("0.00")}
+        key: {"count": 0, "total_amount": 0, "total_outstanding": 0}
         for key in STATUS_KEYS
     }
 
 
 def _init_due_windows() -> Dict[str, dict]:
     return {
-        "past_due": {"count": 0, "total_outstanding": Decimal("0.00")},
-        "due_next_7_days": {"count": 0, "total_outstanding": Decimal("0.00")},
-        "due_next_30_days": {"count": 0, "total_outstanding": Decimal("0.00")},
+        "past_due": {"count": 0, "total_outstanding": 0},
+        "due_next_7_days": {"count": 0, "total_outstanding": 0},
+        "due_next_30_days": {"count": 0, "total_outstanding": 0},
     }
 
 
@@ -44,21 +44,25 @@ def get_invoice_pipeline_summary(
     *,
     owner_id: int,
     today: date | None = None,
+    invoices: Optional[List[Invoice]] = None,
 ) -> dict:
+    """Invoice counts and totals per status and due window; ``invoices`` may be preloaded by the caller."""
     as_of_date = today or datetime.now(timezone.utc).date()
-    invoices = db.query(Invoice).filter(Invoice.owner_id == owner_id).all()
+    if invoices is None:
+        invoices = db.query(Invoice).filter(Invoice.owner_id == owner_id).all()
 
     statuses = _init_status_buckets()
     due_windows = _init_due_windows()
 
-    total_invoiced = Decimal("0.00")
-    total_outstanding = Decimal("0.00")
+    # Money totals are integer cents until the payload is built.
+    total_invoiced = 0
+    total_outstanding = 0
     invoice_count = 0
 
     for inv in invoices:
         status_key = _map_status(inv.status or "issued")
-        total_amount = Decimal(str(inv.total_amount or 0)).quantize(Decimal("0.01"))
-        outstanding = Decimal(str(inv.balance_due or 0)).quantize(Decimal("0.01"))
+        total_amount = to_cents(inv.total_amount)
+        outstanding = to_cents(inv.balance_due)
 
         bucket = statuses[status_key]
         bucket["count"] += 1
@@ -92,22 +96,22 @@ def get_invoice_pipeline_summary(
         "as_of": as_of_date.isoformat(),
         "currency": "USD",
         "summary": {
-            "total_invoiced": str(total_invoiced.quantize(Decimal("0.01"))),
-            "total_outstanding": str(total_outstanding.quantize(Decimal("0.01"))),
+            "total_invoiced": format_cents(total_invoiced),
+            "total_outstanding": format_cents(total_outstanding),
             "invoice_count": invoice_count,
         },
         "statuses": {
             key: {
                 "count": data["count"],
-                "total_amount": str(data["total_amount"].quantize(Decimal("0.01"))),
-                "total_outstanding": str(data["total_outstanding"].quantize(Decimal("0.01"))),
+                "total_amount": format_cents(data["total_amount"]),
+                "total_outstanding": format_cents(data["total_outstanding"]),
             }
             for key, data in statuses.items()
         },
         "due_windows": {
             key: {
                 "count": data["count"],
-                "total_outstanding": str(data["total_outstanding"].quantize(Decimal("0.01"))),
+                "total_outstanding": format_cents(data["total_outstanding"]),
             }
             for key, data in due_windows.items()
         },
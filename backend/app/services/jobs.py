@@ -0,0 +1,376 @@
+"""In-process background jobs backed by the ``jobs`` table.
+
+Request handlers call ``enqueue_job`` and return immediately (or ``serve_job``
+to hand back the result when it is ready within a short wait); a thread pool
+started with the app claims queued rows, runs the registered handler with its
+own database session and stores the result bytes on the row. There is no
+external broker.
+
+A claimed job records the runner's ``worker_id``, and the runner refreshes
+``heartbeat_at`` on its running jobs every ``HEARTBEAT_SECONDS``. Only jobs
+whose heartbeat is older than ``LEASE_SECONDS`` (their process died) are put
+back in the queue, so several workers or a rolling restart never run the same
+job twice. On each heartbeat a runner also submits queued jobs it does not
+already hold, and deletes jobs that finished more than ``RESULT_TTL_SECONDS``
+ago; results handed back inline by ``serve_job`` are deleted straight away.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, or_, update
+from sqlalchemy.orm import Session
+
+from backend.app.core.pagination import DEFAULT_PAGE_SIZE
+from backend.app.core.responses import fast_response
+from backend.app.core.time import utc_now
+from backend.app.db.session import SessionLocal
+from backend.app.models.job import Job
+from backend.app.schemas.admin_reporting import StudentAnalyticsReport
+from backend.app.schemas.job import JobRead
+from backend.app.schemas.session import SessionRepricingReport
+from backend.app.services.parent_report_batch_service import iter_parent_reports_zip
+from backend.app.services.parent_report_export_service import get_parent_report_export_bytes
+from backend.app.services.repricing import PRICING_SOURCES, reprice_sessions
+from backend.app.services.student_kpis import list_student_analytics, refresh_student_kpis
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+HEARTBEAT_SECONDS = 15
+LEASE_SECONDS = 60
+# How long a finished job and its result stay downloadable from /jobs/{id}/result.
+RESULT_TTL_SECONDS = 24 * 3600
+# How long serve_job holds a request open for the result before answering 202.
+INLINE_WAIT_SECONDS = 10.0
+
+# kind -> handler(db, owner_id, params) returning (content, media_type, filename)
+JobHandler = Callable[[Session, int, dict], Tuple[bytes, str, str]]
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    def register(func: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = func
+        return func
+
+    return register
+
+
+def _optional_date(params: dict, key: str) -> Optional[date]:
+    value = params.get(key)
+    return date.fromisoformat(value) if value else None
+
+
+@job_handler("student_analytics")
+def _run_student_analytics(db: Session, owner_id: int, params: dict) -> Tuple[bytes, str, str]:
+    """One page of ``/admin/reports/student-analytics``; params are its query parameters."""
+    list_params = {key: params[key] for key in ("sort_by", "sort_order", "status") if params.get(key) is not None}
+    list_params["skip"] = int(params.get("skip") or 0)
+    list_params["limit"] = int(params.get("limit") or DEFAULT_PAGE_SIZE)
+    for key in ("min_consistency", "max_consistency"):
+        if params.get(key) is not None:
+            list_params[key] = int(params[key])
+    if params.get("min_outstanding") is not None:
+        list_params["min_outstanding"] = Decimal(str(params["min_outstanding"]))
+    list_params["last_session_before"] = _optional_date(params, "last_session_before")
+    today = _optional_date(params, "today") or date.today()
+    # Unlike the request, the job may write: bring the KPI snapshots up to date before paging through them.
+    refresh_student_kpis(db, owner_id, today)
+    report = list_student_analytics(db, owner_id=owner_id, today=today, **list_params)
+    return fast_response(StudentAnalyticsReport, report).body, "application/json", "student_analytics.json"
+
+
+@job_handler("parent_report_export")
+def _run_parent_report_export(db: Session, owner_id: int, params: dict) -> Tuple[bytes, str, str]:
+    if not params.get("student_id"):
+        raise HTTPException(status_code=400, detail="student_id is required")
+    student_id = int(params["student_id"])
+    content = get_parent_report_export_bytes(
+        db=db,
+        owner_id=owner_id,
+        student_id=student_id,
+        today=_optional_date(params, "today") or date.today(),
+        start_date=_optional_date(params, "start_date"),
+        end_date=_optional_date(params, "end_date"),
+    )
+    return content, "application/pdf", f"parent_report_{student_id}.pdf"
+
+
+@job_handler("parent_reports_batch")
+def _run_parent_reports_batch(db: Session, owner_id: int, params: dict) -> Tuple[bytes, str, str]:
+    today = _optional_date(params, "today") or date.today()
+    chunks = iter_parent_reports_zip(
+        db,
+        owner_id=owner_id,
+        today=today,
+        start_date=_optional_date(params, "start_date"),
+        end_date=_optional_date(params, "end_date"),
+    )
+    return b"".join(chunks), "application/zip", f"parent_reports_{today.isoformat()}.zip"
+
+
+@job_handler("session_repricing")
+def _run_session_repricing(db: Session, owner_id: int, params: dict) -> Tuple[bytes, str, str]:
+    pricing = params.get("pricing", "settings")
+    if pricing not in PRICING_SOURCES:
+        raise HTTPException(status_code=400, detail=f"pricing must be one of {', '.join(PRICING_SOURCES)}")
+    report = reprice_sessions(
+        db,
+        owner_id=owner_id,
+        pricing=pricing,
+        start_date=_optional_date(params, "start_date"),
+        end_date=_optional_date(params, "end_date"),
+        plan=params.get("plan"),
+        student_id=int(params["student_id"]) if params.get("student_id") else None,
+        dry_run=bool(params.get("dry_run", False)),
+    )
+    return SessionRepricingReport(**report).model_dump_json().encode("utf-8"), "application/json", "session_repricing.json"
+
+
+def _finish(db: Session, job_id: int, worker_id: str, **values) -> None:
+    # Only the runner still holding the lease records the outcome.
+    finished = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "running", Job.worker_id == worker_id)
+        .values(finished_at=utc_now(), **values)
+    )
+    db.commit()
+    if finished.rowcount != 1:
+        logger.warning("Job %s finished after its lease was lost; outcome discarded", job_id)
+
+
+def run_job(job_id: int, worker_id: str) -> None:
+    """Claim a queued job for ``worker_id``, run its handler and store the outcome."""
+    db = SessionLocal()
+    try:
+        now = utc_now()
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "queued")
+            .values(status="running", started_at=now, worker_id=worker_id, heartbeat_at=now)
+        )
+        db.commit()
+        if claimed.rowcount != 1:
+            return  # already taken by another worker
+
+        job = db.get(Job, job_id)
+        kind, owner_id, params = job.kind, job.owner_id, json.loads(job.params)
+        try:
+            content, media_type, filename = JOB_HANDLERS[kind](db, owner_id, params)
+        except Exception as exc:  # noqa: BLE001 - any handler failure is recorded on the job
+            db.rollback()
+            if isinstance(exc, HTTPException):
+                error, error_status = str(exc.detail), exc.status_code
+            else:
+                logger.exception("Job %s (%s) failed", job_id, kind)
+                error, error_status = f"{type(exc).__name__}: {exc}", 500
+            _finish(db, job_id, worker_id, status="failed", error=error, error_status=error_status)
+        else:
+            _finish(
+                db,
+                job_id,
+                worker_id,
+                status="succeeded",
+                result=content,
+                result_media_type=media_type,
+                result_filename=filename,
+            )
+    finally:
+        db.close()
+
+
+class JobRunner:
+    """Thread pool that executes jobs in the API process."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        heartbeat_seconds: float = HEARTBEAT_SECONDS,
+        lease_seconds: float = LEASE_SECONDS,
+        result_ttl_seconds: float = RESULT_TTL_SECONDS,
+    ):
+        self.max_workers = max_workers
+        self.heartbeat_seconds = heartbeat_seconds
+        self.lease_seconds = lease_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self._executor: ThreadPoolExecutor | None = None
+        # Jobs submitted to this runner's pool that have not finished: job id -> future.
+        self._pending: Dict[int, Future] = {}
+        self._heartbeat: Thread | None = None
+        self._stopping = Event()
+        self._lock = Lock()
+        self._worker_id: tuple[int, str] | None = None
+
+    @property
+    def worker_id(self) -> str:
+        """Unique per process (recomputed after a fork) and per runner."""
+        pid = os.getpid()
+        if self._worker_id is None or self._worker_id[0] != pid:
+            self._worker_id = (pid, f"{socket.gethostname()}:{pid}:{uuid.uuid4().hex[:8]}")
+        return self._worker_id[1]
+
+    def start(self) -> None:
+        """Start the pool and heartbeat, and pick up queued jobs and those whose lease expired."""
+        self._ensure_executor()
+        self.recover_jobs()
+        with self._lock:
+            if self._heartbeat is None:
+                self._stopping.clear()
+                self._heartbeat = Thread(target=self._heartbeat_loop, name="corebox-job-heartbeat", daemon=True)
+                self._heartbeat.start()
+
+    def recover_jobs(self) -> None:
+        """Requeue running jobs with an expired lease, then submit queued jobs this runner does not hold."""
+        cutoff = utc_now() - timedelta(seconds=self.lease_seconds)
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(Job)
+                .where(Job.status == "running", or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < cutoff))
+                .values(status="queued", started_at=None, worker_id=None, heartbeat_at=None)
+            )
+            db.commit()
+            pending = [job_id for (job_id,) in db.query(Job.id).filter(Job.status == "queued").order_by(Job.id)]
+        finally:
+            db.close()
+        for job_id in pending:
+            self.submit(job_id)
+
+    def purge_finished_jobs(self) -> int:
+        """Delete jobs that finished more than ``result_ttl_seconds`` ago; return how many."""
+        cutoff = utc_now() - timedelta(seconds=self.result_ttl_seconds)
+        db = SessionLocal()
+        try:
+            purged = db.execute(
+                delete(Job).where(Job.status.in_(("succeeded", "failed")), Job.finished_at < cutoff)
+            )
+            db.commit()
+            return purged.rowcount
+        finally:
+            db.close()
+
+    def beat(self) -> None:
+        """Renew the lease on every job this runner is running."""
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(Job)
+                .where(Job.status == "running", Job.worker_id == self.worker_id)
+                .values(heartbeat_at=utc_now())
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stopping.wait(self.heartbeat_seconds):
+            try:
+                self.beat()
+                self.recover_jobs()
+                self.purge_finished_jobs()
+            except Exception:  # noqa: BLE001 - keep beating through transient database errors
+                logger.exception("Job heartbeat failed")
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="corebox-job")
+            return self._executor
+
+    def submit(self, job_id: int) -> Future:
+        """Queue ``job_id`` on the pool unless it is already waiting there."""
+        executor = self._ensure_executor()
+        with self._lock:
+            future = self._pending.get(job_id)
+            if future is not None:
+                return future
+            future = executor.submit(run_job, job_id, self.worker_id)
+            self._pending[job_id] = future
+        future.add_done_callback(lambda done: self._forget(job_id, done))
+        return future
+
+    def _forget(self, job_id: int, future: Future) -> None:
+        with self._lock:
+            if self._pending.get(job_id) is future:
+                del self._pending[job_id]
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._stopping.set()
+        with self._lock:
+            executor, self._executor = self._executor, None
+            heartbeat, self._heartbeat = self._heartbeat, None
+            self._pending.clear()
+        if heartbeat is not None:
+            heartbeat.join()
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+job_runner = JobRunner()
+
+
+def _submit_job(db: Session, *, owner_id: int, kind: str, params: dict | None) -> Tuple[Job, Future]:
+    if kind not in JOB_HANDLERS:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {kind}")
+    job = Job(owner_id=owner_id, kind=kind, status="queued", params=json.dumps(params or {}, default=str))
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job, job_runner.submit(job.id)
+
+
+def enqueue_job(db: Session, *, owner_id: int, kind: str, params: dict | None = None) -> Job:
+    return _submit_job(db, owner_id=owner_id, kind=kind, params=params)[0]
+
+
+async def serve_job(
+    db: Session,
+    *,
+    owner_id: int,
+    kind: str,
+    params: dict | None = None,
+    headers: dict | None = None,
+    wait: float = INLINE_WAIT_SECONDS,
+) -> Response:
+    """Enqueue a job for a request and answer with its result if it is ready within ``wait`` seconds.
+
+    Otherwise answer 202 with the job and a ``Location`` to poll. The work
+    itself always runs on the job runner, never on the request. A result served
+    here is not kept; a failed job raises its recorded HTTP error.
+    """
+    job, future = _submit_job(db, owner_id=owner_id, kind=kind, params=params)
+    if wait > 0:
+        try:
+            # shield: timing out must not cancel a job still waiting in the pool.
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+    db.refresh(job)
+    if job.status not in ("succeeded", "failed"):
+        body = JobRead.model_validate(job).model_dump(mode="json")
+        return JSONResponse(body, status_code=202, headers={**(headers or {}), "Location": f"/jobs/{job.id}"})
+    db.delete(job)
+    db.commit()
+    if job.status == "failed":
+        raise HTTPException(status_code=job.error_status or 500, detail=job.error)
+    return Response(content=job.result, media_type=job.result_media_type, headers=headers)
+
+
+def get_owned_job(db: Session, job_id: int, owner_id: int) -> Job:
+    job = db.query(Job).filter(Job.id == job_id, Job.owner_id == owner_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
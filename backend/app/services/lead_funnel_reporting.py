@@ -0,0 +1,130 @@
+"""Lead pipeline funnel: stage counts, conversion and time-in-stage per owner.
+
+Computed from the structured ``to_status`` on ``lead_created`` /
+``status_changed`` timeline events with three grouped queries, and cached per
+owner until the owner's ``leads`` data version changes.
+
+A lead has *reached* a stage if it ever entered that stage or any later one
+(leads may be created straight into a later stage). Time in stage is measured
+from entering a status to the next status change; stays that have not ended
+yet are not counted.
+"""
+
+from decimal import Decimal
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from backend.app.core.cache import LRUCache
+from backend.app.db.snapshot import read_snapshot
+from backend.app.models.lead import Lead
+from backend.app.models.timeline import TimelineEvent
+from backend.app.services.data_versions import get_owner_data_stamp
+
+FUNNEL_STAGES = ("new", "contacted", "trial_scheduled", "enrolled")
+LOST_STATUS = "closed_lost"
+FUNNEL_CACHE_DOMAINS = ("leads",)
+
+_funnel_cache = LRUCache(maxsize=256)
+
+
+def _seconds_between(dialect_name: str, start, end):
+    if dialect_name == "sqlite":
+        return (func.julianday(end) - func.julianday(start)) * 86400
+    return func.extract("epoch", end - start)
+
+
+def _percent(numerator: int, denominator: int) -> Optional[str]:
+    if not denominator:
+        return None
+    return str((Decimal(numerator) * 100 / Decimal(denominator)).quantize(Decimal("0.01")))
+
+
+def _hours(seconds: Optional[float]) -> Optional[str]:
+    if seconds is None:
+        return None
+    return str((Decimal(str(seconds)) / 3600).quantize(Decimal("0.01")))
+
+
+def _reached_counts(db: Session, owner_id: int) -> Dict[str, int]:
+    rank = case({stage: index for index, stage in enumerate(FUNNEL_STAGES)}, value=TimelineEvent.to_status)
+    furthest = (
+        select(func.max(rank).label("furthest"))
+        .where(TimelineEvent.owner_id == owner_id, TimelineEvent.to_status.in_(FUNNEL_STAGES))
+        .group_by(TimelineEvent.lead_id)
+        .subquery()
+    )
+    rows = db.execute(select(furthest.c.furthest, func.count()).group_by(furthest.c.furthest)).all()
+    by_rank = {furthest_rank: count for furthest_rank, count in rows}
+    reached, running = {}, 0
+    for index in range(len(FUNNEL_STAGES) - 1, -1, -1):
+        running += by_rank.get(index, 0)
+        reached[FUNNEL_STAGES[index]] = running
+    return reached
+
+
+def _median_seconds_in_stage(db: Session, owner_id: int) -> Dict[str, float]:
+    transitions = TimelineEvent.__table__
+    left_at = func.lead(transitions.c.created_at).over(
+        partition_by=transitions.c.lead_id, order_by=(transitions.c.created_at, transitions.c.id)
+    )
+    stays = (
+        select(transitions.c.to_status.label("stage"), transitions.c.created_at.label("entered_at"), left_at.label("left_at"))
+        .where(transitions.c.owner_id == owner_id, transitions.c.to_status.isnot(None))
+        .subquery()
+    )
+    seconds = _seconds_between(db.get_bind().dialect.name, stays.c.entered_at, stays.c.left_at)
+    ranked = (
+        select(
+            stays.c.stage,
+            seconds.label("seconds"),
+            func.row_number().over(partition_by=stays.c.stage, order_by=seconds).label("position"),
+            func.count().over(partition_by=stays.c.stage).label("total"),
+        )
+        .where(stays.c.left_at.isnot(None), stays.c.stage.in_(FUNNEL_STAGES))
+        .subquery()
+    )
+    # The middle row, or the mean of the two middle rows.
+    middle = ranked.c.position.in_([(ranked.c.total + 1) // 2, (ranked.c.total + 2) // 2])
+    rows = db.execute(select(ranked.c.stage, func.avg(ranked.c.seconds)).where(middle).group_by(ranked.c.stage)).all()
+    return {stage: float(value) for stage, value in rows}
+
+
+def _compute_lead_funnel(db: Session, owner_id: int) -> dict:
+    current = dict(
+        db.query(Lead.status, func.count(Lead.id)).filter(Lead.owner_id == owner_id).group_by(Lead.status).all()
+    )
+    reached = _reached_counts(db, owner_id)
+    medians = _median_seconds_in_stage(db, owner_id)
+
+    stages = []
+    for index, stage in enumerate(FUNNEL_STAGES):
+        following = FUNNEL_STAGES[index + 1] if index + 1 < len(FUNNEL_STAGES) else None
+        stages.append(
+            {
+                "stage": stage,
+                "current_count": current.get(stage, 0),
+                "reached_count": reached[stage],
+                "conversion_rate_to_next": _percent(reached[following], reached[stage]) if following else None,
+                "median_hours_in_stage": _hours(medians.get(stage)),
+            }
+        )
+    entered = reached[FUNNEL_STAGES[0]]
+    return {
+        "total_leads": sum(current.values()),
+        "closed_lost_count": current.get(LOST_STATUS, 0),
+        "overall_conversion_rate": _percent(reached[FUNNEL_STAGES[-1]], entered),
+        "stages": stages,
+    }
+
+
+@read_snapshot
+def get_lead_funnel(db: Session, *, owner_id: int) -> dict:
+    """Funnel report for an owner, recomputed only after the owner's lead data changes."""
+    key = (owner_id, get_owner_data_stamp(db, owner_id, FUNNEL_CACHE_DOMAINS))
+    report = _funnel_cache.get(key)
+    if report is None:
+        report = _compute_lead_funnel(db, owner_id)
+        _funnel_cache.set(key, report)
+    return report
@@ -0,0 +1,129 @@
+"""Parent reports for a whole roster, streamed as one ZIP archive.
+
+Analytics are computed once for the owner instead of once per student, the
+period session counts come from a single grouped query, and the CPU-bound PDF
+rendering is fanned out to a process pool for large rosters; each worker
+builds the PDF template once. The pool spawns fresh interpreters rather than
+forking: the API process runs job, reminder and request threads, and a forked
+child can inherit a lock one of them was holding and deadlock on it.
+"""
+
+import os
+import zipfile
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.app.models.student import Student
+from backend.app.services.parent_report_export_service import render_parent_report_pdf
+from backend.app.services.parent_report_narrative_service import add_parent_report_narrative
+from backend.app.services.parent_report_service import build_parent_report, get_period_sessions_by_student
+from backend.app.services.student_analytics_reporting import get_student_analytics
+
+# Below this many reports, process start-up and pickling cost more than rendering inline.
+PROCESS_POOL_MIN_REPORTS = 200
+RENDER_CHUNK_SIZE = 50
+
+
+def build_parent_reports(
+    db: Session,
+    *,
+    owner_id: int,
+    today: date,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    student_ids: Optional[List[int]] = None,
+) -> List[dict]:
+    """Base parent reports (without narrative) for the owner's active students."""
+    query = db.query(Student).filter(Student.owner_id == owner_id, Student.is_active.is_(True))
+    if student_ids is not None:
+        query = query.filter(Student.id.in_(student_ids))
+    students = query.order_by(Student.id).all()
+    if not students:
+        return []
+
+    analytics = get_student_analytics(db, owner_id=owner_id, today=today, student_ids=[s.id for s in students])
+    entries = {entry["student_id"]: entry for entry in analytics["students"]}
+    period = {}
+    if start_date:
+        period = get_period_sessions_by_student(db, owner_id, [s.id for s in students], start_date, end_date)
+
+    return [
+        build_parent_report(
+            student,
+            entries[student.id],
+            today=today,
+            start_date=start_date,
+            end_date=end_date,
+            period_sessions=period.get(student.id),
+        )
+        for student in students
+        if student.id in entries
+    ]
+
+
+def render_parent_report_file(report: dict) -> Tuple[str, bytes]:
+    """Return (archive member name, PDF content) for one base report."""
+    content = b"".join(render_parent_report_pdf(add_parent_report_narrative(report)))
+    return f"parent_report_{report['student']['id']}.pdf", content
+
+
+def render_parent_report_files(reports: List[dict], workers: Optional[int] = None) -> Iterator[Tuple[str, bytes]]:
+    """Render reports in order, using a process pool once the batch is large enough."""
+    workers = workers if workers is not None else min(os.cpu_count() or 1, 4)
+    if workers <= 1 or len(reports) < PROCESS_POOL_MIN_REPORTS:
+        yield from map(render_parent_report_file, reports)
+        return
+    # Imported here: multiprocessing is only needed for large rosters and is
+    # a noticeable share of worker boot.
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        yield from pool.map(render_parent_report_file, reports, chunksize=RENDER_CHUNK_SIZE)
+
+
+class _ZipChunks:
+    """Write-only file object that hands bytes written by ``ZipFile`` to a generator."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def iter_zip(files: Iterable[Tuple[str, bytes]]) -> Iterator[bytes]:
+    """Stream a ZIP archive without buffering the whole archive in memory."""
+    sink = _ZipChunks()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files:
+            archive.writestr(name, content)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+
+def iter_parent_reports_zip(
+    db: Session,
+    *,
+    owner_id: int,
+    today: date,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    workers: Optional[int] = None,
+) -> Iterator[bytes]:
+    reports = build_parent_reports(db, owner_id=owner_id, today=today, start_date=start_date, end_date=end_date)
+    return iter_zip(render_parent_report_files(reports, workers=workers))
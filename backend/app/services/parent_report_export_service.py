@@ -1,9 +1,17 @@
-"""Export parent report as text-based PDF-like payload."""
+"""Export parent reports as PDF documents."""
 
 from datetime import date, datetime, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
 
+from backend.app.core.cache import LRUCache
+from backend.app.services.data_versions import get_owner_data_stamp
 from backend.app.services.parent_report_narrative_service import get_parent_report_with_narrative
+from backend.app.services.pdf_writer import PdfTemplate
+
+# Rendered PDFs keyed by owner, student, period and the owner's data stamp.
+PDF_CACHE_DOMAINS = ("students", "sessions", "billing")
+_pdf_cache = LRUCache(maxsize=512)
 
 
 def build_parent_report_export_text(report: dict) -> str:
@@ -72,7 +80,40 @@ def build_parent_report_export_text(report: dict) -> str:
     return "\n".join(lines)
 
 
-def get_parent_report_export_bytes(
+@lru_cache(maxsize=1)
+def get_parent_report_template() -> PdfTemplate:
+    """Layout shared by every parent report; built once per process."""
+    return PdfTemplate(footer="Mindfull Learning - Parent Report")
+
+
+def parent_report_pdf_blocks(report: dict) -> List[Tuple[str, str]]:
+    """Map the export text onto PDF styles: title, ``== Section ==`` headings and body lines."""
+    lines = build_parent_report_export_text(report).split("\n")
+    blocks = [("title", lines[0])]
+    for line in lines[1:]:
+        if not line:
+            blocks.append(("blank", ""))
+        elif line.startswith("== ") and line.endswith(" =="):
+            blocks.append(("heading", line[3:-3]))
+        else:
+            blocks.append(("body", line))
+    return blocks
+
+
+def render_parent_report_pdf(report: dict) -> Iterator[bytes]:
+    """Stream a PDF for a report that already includes its narrative."""
+    return get_parent_report_template().iter_pdf(parent_report_pdf_blocks(report))
+
+
+def _cache_when_complete(key, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    _pdf_cache.set(key, b"".join(parts))
+
+
+def iter_parent_report_export(
     db,
     *,
     owner_id: int,
@@ -80,7 +121,15 @@ def get_parent_report_export_bytes(
     today: date,
     start_date: Optional[date],
     end_date: Optional[date],
-) -> bytes:
+) -> Iterator[bytes]:
+    """PDF chunks for one student's report, served from cache while the owner's data is unchanged.
+
+    Ownership is checked (and 404 raised) before the first chunk is produced.
+    """
+    key = (owner_id, student_id, today, start_date, end_date, get_owner_data_stamp(db, owner_id, PDF_CACHE_DOMAINS))
+    cached = _pdf_cache.get(key)
+    if cached is not None:
+        return iter((cached,))
     report = get_parent_report_with_narrative(
         db=db,
         owner_id=owner_id,
@@ -89,5 +138,25 @@ def get_parent_report_export_bytes(
         start_date=start_date,
         end_date=end_date,
     )
-    text = build_parent_report_export_text(report)
-    return text.encode("utf-8")
+    return _cache_when_complete(key, render_parent_report_pdf(report))
+
+
+def get_parent_report_export_bytes(
+    db,
+    *,
+    owner_id: int,
+    student_id: int,
+    today: date,
+    start_date: Optional[date],
+    end_date: Optional[date],
+) -> bytes:
+    return b"".join(
+        iter_parent_report_export(
+            db,
+            owner_id=owner_id,
+            student_id=student_id,
+            today=today,
+            start_date=start_date,
+            end_date=end_date,
+        )
+    )
@@ -72,7 +72,11 @@ def get_parent_report_with_narrative(
         end_date=end_date,
     )
     # base_report already raises 404 if student missing
+    return add_parent_report_narrative(base_report)
 
+
+def add_parent_report_narrative(base_report: dict) -> dict:
+    """Return a copy of ``base_report`` with the narrative section added."""
     ps = base_report["progress_summary"]
     bs = base_report["billing_summary"]
     student_info = base_report["student"]
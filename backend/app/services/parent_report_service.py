@@ -1,12 +1,14 @@
 """Parent-friendly student report payload generation."""
 
-from datetime import date, datetime, timedelta, timezone
+from datetime import date
 from decimal import Decimal
 from typing import Optional
 
 from fastapi import HTTPException, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from backend.app.core.time import date_range_filters
 from backend.app.models.session import Session as SessionModel
 from backend.app.models.student import Student
 from backend.app.services.student_analytics_reporting import get_student_analytics
@@ -14,10 +16,7 @@ from backend.app.services.student_analytics_reporting import get_student_analyti
 
 def _compute_period_sessions(db: Session, student_id: int, owner_id: int, start_date: Optional[date], end_date: Optional[date]) -> tuple[int, Decimal]:
     query = db.query(SessionModel).filter(SessionModel.student_id == student_id, SessionModel.owner_id == owner_id)
-    if start_date:
-        query = query.filter(SessionModel.session_date >= datetime.combine(start_date, datetime.min.time(), tzinfo=timezone.utc))
-    if end_date:
-        query = query.filter(SessionModel.session_date <= datetime.combine(end_date, datetime.max.time(), tzinfo=timezone.utc))
+    query = query.filter(*date_range_filters(SessionModel.session_date, start_date, end_date))
     sessions = query.all()
     count = len(sessions)
     minutes = sum((s.duration_minutes or 0) for s in sessions)
@@ -25,24 +24,36 @@ def _compute_period_sessions(db: Session, student_id: int, owner_id: int, start_
     return count, hours
 
 
-def get_parent_report(
-    db: Session,
+def get_period_sessions_by_student(
+    db: Session, owner_id: int, student_ids: list[int], start_date: Optional[date], end_date: Optional[date]
+) -> dict[int, tuple[int, Decimal]]:
+    """Batch form of ``_compute_period_sessions``: one grouped query for many students."""
+    query = db.query(
+        SessionModel.student_id,
+        func.count(SessionModel.id),
+        func.coalesce(func.sum(SessionModel.duration_minutes), 0),
+    ).filter(SessionModel.owner_id == owner_id, SessionModel.student_id.in_(student_ids))
+    query = query.filter(*date_range_filters(SessionModel.session_date, start_date, end_date))
+    period = {}
+    for student_id, count, minutes in query.group_by(SessionModel.student_id):
+        period[student_id] = (count, Decimal(minutes) / Decimal("60") if minutes else Decimal("0.00"))
+    return period
+
+
+def build_parent_report(
+    student: Student,
+    student_entry: dict,
     *,
-    owner_id: int,
-    student_id: int,
     today: date,
     start_date: Optional[date],
     end_date: Optional[date],
+    period_sessions: Optional[tuple[int, Decimal]] = None,
 ) -> dict:
-    student = db.query(Student).filter(Student.id == student_id, Student.owner_id == owner_id).first()
-    if not student:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
-
-    analytics = get_student_analytics(db, owner_id=owner_id, today=today)
-    student_entry = next((s for s in analytics.get("students", []) if s.get("student_id") == student_id), None)
-    if not student_entry:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student analytics not found")
+    """Assemble the report from a student's analytics entry; no database access.
 
+    ``period_sessions`` is the (count, hours) pair for the requested period and
+    is only used when ``start_date`` is set.
+    """
     kpis = student_entry["kpis"]
     weekly_activity = student_entry["weekly_activity_last_8_weeks"]
 
@@ -56,7 +67,7 @@ def get_parent_report(
 
     # Period calculations
     if start_date:
-        sessions_in_period, hours_in_period = _compute_period_sessions(db, student_id, owner_id, start_date, end_date)
+        sessions_in_period, hours_in_period = period_sessions or (0, Decimal("0.00"))
     else:
         sessions_in_period = kpis["total_sessions"]
         hours_in_period = total_hours_dec
@@ -99,3 +110,34 @@ def get_parent_report(
         },
     }
     return report
+
+
+def get_parent_report(
+    db: Session,
+    *,
+    owner_id: int,
+    student_id: int,
+    today: date,
+    start_date: Optional[date],
+    end_date: Optional[date],
+) -> dict:
+    student = db.query(Student).filter(Student.id == student_id, Student.owner_id == owner_id).first()
+    if not student:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
+
+    analytics = get_student_analytics(db, owner_id=owner_id, today=today, student_ids=[student_id])
+    student_entry = next((s for s in analytics.get("students", []) if s.get("student_id") == student_id), None)
+    if not student_entry:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student analytics not found")
+
+    period_sessions = None
+    if start_date:
+        period_sessions = _compute_period_sessions(db, student_id, owner_id, start_date, end_date)
+    return build_parent_report(
+        student,
+        student_entry,
+        today=today,
+        start_date=start_date,
+        end_date=end_date,
+        period_sessions=period_sessions,
+    )
@@ -1,11 +1,11 @@
 """Payment analytics and cash flow reporting."""
 
 from datetime import date, datetime, timedelta, timezone
-from decimal import Decimal
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from backend.app.core.money import divide_cents, format_cents, to_cents
 from backend.app.models.payment import Payment
 
 
@@ -43,36 +43,48 @@ def _last_n_months(today: date, n: int = 12) -> List[Tuple[int, int]]:
     return list(reversed(months))
 
 
-def get_payment_analytics(db: Session, *, owner_id: int, today: date | None = None) -> dict:
+def get_payment_analytics(
+    db: Session, *, owner_id: int, today: date | None = None, payments: Optional[List[Payment]] = None
+) -> dict:
+    """Payment totals, trends and methods; ``payments`` may be the owner's payments preloaded by the caller."""
     as_of_date = today or datetime.now(timezone.utc).date()
 
-    payments: List[Payment] = db.query(Payment).filter(Payment.owner_id == owner_id).all()
+    if payments is None:
+        payments = db.query(Payment).filter(Payment.owner_id == owner_id).all()
 
-    total_paid_all_time = sum((Decimal(str(p.amount or 0)) for p in payments), Decimal("0.00"))
-    payment_count_all_time = len(payments)
+    # Convert each row once: (created date, amount in cents, method).
+    rows = [(p.created_at.date(), to_cents(p.amount), p.method) for p in payments]
+
+    total_paid_all_time = sum(cents for _, cents, _ in rows)
+    payment_count_all_time = len(rows)
     average_payment_amount_all_time = (
-        (total_paid_all_time / payment_count_all_time).quantize(Decimal("0.01"))
-        if payment_count_all_time > 0
-        else Decimal("0.00")
+        divide_cents(total_paid_all_time, payment_count_all_time) if payment_count_all_time > 0 else 0
     )
 
     last_7_start = as_of_date - timedelta(days=6)
     last_30_start = as_of_date - timedelta(days=29)
-    total_paid_last_7_days = sum(
-        (Decimal(str(p.amount or 0)) for p in payments if p.created_at.date() >= last_7_start), Decimal("0.00")
-    )
-    total_paid_last_30_days = sum(
-        (Decimal(str(p.amount or 0)) for p in payments if p.created_at.date() >= last_30_start), Decimal("0.00")
-    )
+    total_paid_last_7_days = sum(cents for created, cents, _ in rows if created >= last_7_start)
+    total_paid_last_30_days = sum(cents for created, cents, _ in rows if created >= last_30_start)
 
     week_keys = _last_n_iso_weeks(as_of_date, 8)
-    week_map = {key: {"total_paid": Decimal("0.00"), "payment_count": 0} for key in week_keys}
-    for p in payments:
-        py, pw, _ = p.created_at.date().isocalendar()
-        key = (py, pw)
-        if key in week_map:
-            week_map[key]["total_paid"] += Decimal(str(p.amount or 0))
-            week_map[key]["payment_count"] += 1
+    week_map = {key: {"total_paid": 0, "payment_count": 0} for key in week_keys}
+    month_keys = _last_n_months(as_of_date, 12)
+    month_map = {key: {"total_paid": 0, "payment_count": 0} for key in month_keys}
+    methods_map: Dict[str, Dict[str, int]] = {}
+    for created, cents, method in rows:
+        py, pw, _ = created.isocalendar()
+        week_entry = week_map.get((py, pw))
+        if week_entry is not None:
+            week_entry["total_paid"] += cents
+            week_entry["payment_count"] += 1
+        month_entry = month_map.get((created.year, created.month))
+        if month_entry is not None:
+            month_entry["total_paid"] += cents
+            month_entry["payment_count"] += 1
+        entry = methods_map.setdefault(method or "unspecified", {"total_paid": 0, "payment_count": 0})
+        entry["total_paid"] += cents
+        entry["payment_count"] += 1
+
     weekly_trend = []
     for year, week in week_keys:
         start_d, end_d = _week_start_end(year, week)
@@ -82,39 +94,26 @@ def get_payment_analytics(db: Session, *, owner_id: int, today: date | None = No
                 "iso_week": week,
                 "start_date": start_d.isoformat(),
                 "end_date": end_d.isoformat(),
-                "total_paid": str(week_map[(year, week)]["total_paid"].quantize(Decimal("0.01"))),
+                "total_paid": format_cents(week_map[(year, week)]["total_paid"]),
                 "payment_count": week_map[(year, week)]["payment_count"],
             }
         )
 
-    month_keys = _last_n_months(as_of_date, 12)
-    month_map = {key: {"total_paid": Decimal("0.00"), "payment_count": 0} for key in month_keys}
-    for p in payments:
-        key = (p.created_at.date().year, p.created_at.date().month)
-        if key in month_map:
-            month_map[key]["total_paid"] += Decimal(str(p.amount or 0))
-            month_map[key]["payment_count"] += 1
     monthly_trend = []
     for year, month in month_keys:
         monthly_trend.append(
             {
                 "year": year,
                 "month": month,
-                "total_paid": str(month_map[(year, month)]["total_paid"].quantize(Decimal("0.01"))),
+                "total_paid": format_cents(month_map[(year, month)]["total_paid"]),
                 "payment_count": month_map[(year, month)]["payment_count"],
             }
         )
 
-    methods_map: Dict[str, Dict[str, Decimal | int]] = {}
-    for p in payments:
-        method = p.method or "unspecified"
-        entry = methods_map.setdefault(method, {"total_paid": Decimal("0.00"), "payment_count": 0})
-        entry["total_paid"] += Decimal(str(p.amount or 0))
-        entry["payment_count"] += 1
     methods = [
         {
             "method": method,
-            "total_paid": str(vals["total_paid"].quantize(Decimal("0.01"))),
+            "total_paid": format_cents(vals["total_paid"]),
             "payment_count": vals["payment_count"],
         }
         for method, vals in methods_map.items()
@@ -124,11 +123,11 @@ def get_payment_analytics(db: Session, *, owner_id: int, today: date | None = No
         "as_of": as_of_date.isoformat(),
         "currency": "USD",
         "summary": {
-            "total_paid_all_time": str(total_paid_all_time.quantize(Decimal("0.01"))),
-            "total_paid_last_7_days": str(total_paid_last_7_days.quantize(Decimal("0.01"))),
-            "total_paid_last_30_days": str(total_paid_last_30_days.quantize(Decimal("0.01"))),
+            "total_paid_all_time": format_cents(total_paid_all_time),
+            "total_paid_last_7_days": format_cents(total_paid_last_7_days),
+            "total_paid_last_30_days": format_cents(total_paid_last_30_days),
             "payment_count_all_time": payment_count_all_time,
-            "average_payment_amount_all_time": str(average_payment_amount_all_time.quantize(Decimal("0.01"))),
+            "average_payment_amount_all_time": format_cents(average_payment_amount_all_time),
         },
         "weekly_trend": weekly_trend,
         "monthly_trend": monthly_trend,
@@ -0,0 +1,231 @@
+"""Minimal streaming PDF 1.4 writer for text reports.
+
+Only the standard Helvetica fonts are used, so no font files or third-party
+packages are needed. A ``PdfTemplate`` holds everything that does not depend
+on the document (page geometry, styles, width and escape tables, the font
+objects) and is built once per process; ``iter_pdf`` then lays out and yields
+one page at a time, finishing with the page tree and cross-reference table.
+
+Content streams are left uncompressed and non-ASCII bytes are octal-escaped,
+so the output is plain ASCII.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Helvetica advance widths (1/1000 em) for printable ASCII, from the standard AFM metrics.
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,  # space .. /
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,  # 0 .. ?
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,  # @ .. O
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,  # P .. _
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,  # ` .. o
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,  # p .. ~
+)
+_DEFAULT_WIDTH = 556
+_BOLD_WIDTH_FACTOR = 1.06  # Helvetica-Bold runs slightly wider; close enough for wrapping.
+
+
+@dataclass(frozen=True)
+class PdfStyle:
+    font: str  # resource name, "F1" (Helvetica) or "F2" (Helvetica-Bold)
+    size: float
+    space_before: float = 0.0
+
+    @property
+    def leading(self) -> float:
+        return self.size * 1.35
+
+
+DEFAULT_STYLES = {
+    "title": PdfStyle("F2", 16, 0),
+    "heading": PdfStyle("F2", 12, 8),
+    "body": PdfStyle("F1", 10, 0),
+    "blank": PdfStyle("F1", 6, 0),
+}
+
+
+class PdfTemplate:
+    """Page geometry, styles and pre-encoded shared objects for one document layout."""
+
+    def __init__(
+        self,
+        *,
+        page_width: float = 612,  # US Letter, in points
+        page_height: float = 792,
+        margin: float = 54,
+        styles: Dict[str, PdfStyle] | None = None,
+        footer: str = "",
+    ):
+        self.page_width = page_width
+        self.page_height = page_height
+        self.margin = margin
+        self.styles = dict(styles or DEFAULT_STYLES)
+        self.footer = footer
+        self.text_width = page_width - 2 * margin
+
+        self._widths = {chr(32 + i): width for i, width in enumerate(_HELVETICA_WIDTHS)}
+        self._escape = {ord("\\"): "\\\\", ord("\r"): "", ord("\n"): ""}
+        self._page_prefix = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_num(page_width)} {_num(page_height)}] "
+            "/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents "
+        ).encode("ascii")
+        self._shared_objects = [
+            (1, b"<< /Type /Catalog /Pages 2 0 R >>"),
+            (3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"),
+            (4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>"),
+        ]
+
+    # -- layout -----------------------------------------------------------------
+
+    def _units(self, text: str) -> int:
+        widths = self._widths
+        return sum(widths.get(char, _DEFAULT_WIDTH) for char in text)
+
+    def _limit_units(self, style: PdfStyle) -> float:
+        factor = _BOLD_WIDTH_FACTOR if style.font == "F2" else 1.0
+        return self.text_width * 1000 / (style.size * factor)
+
+    def text_width_of(self, text: str, style: PdfStyle) -> float:
+        factor = _BOLD_WIDTH_FACTOR if style.font == "F2" else 1.0
+        return self._units(text) * factor * style.size / 1000
+
+    def wrap(self, text: str, style: PdfStyle) -> List[str]:
+        """Greedy word wrap to the text column; overlong words are split by character."""
+        limit = self._limit_units(style)
+        if self._units(text) <= limit:
+            return [text]
+
+        space = self._widths[" "]
+        lines: List[str] = []
+        current: List[str] = []
+        current_units = 0
+        for word in text.split(" "):
+            units = self._units(word)
+            needed = current_units + space + units if current else units
+            if needed <= limit:
+                current.append(word)
+                current_units = needed
+                continue
+            if current:
+                lines.append(" ".join(current))
+            while units > limit:
+                head, head_units = self._split_word(word, limit)
+                lines.append(head)
+                word, units = word[len(head):], units - head_units
+            current, current_units = [word], units
+        lines.append(" ".join(current))
+        return lines
+
+    def _split_word(self, word: str, limit: float) -> Tuple[str, int]:
+        used = 0
+        for index, char in enumerate(word):
+            width = self._widths.get(char, _DEFAULT_WIDTH)
+            if used + width > limit and index > 0:
+                return word[:index], used
+            used += width
+        return word, used
+
+    def paginate(self, blocks: Iterable[Tuple[str, str]]) -> Iterator[List[Tuple[PdfStyle, float, str]]]:
+        """Yield pages as lists of (style, baseline y, text), one page at a time."""
+        top = self.page_height - self.margin
+        bottom = self.margin + (self.styles["body"].leading if self.footer else 0)
+        page: List[Tuple[PdfStyle, float, str]] = []
+        y = top
+        emitted = False
+        for style_name, text in blocks:
+            style = self.styles[style_name]
+            if style_name == "blank":
+                y -= style.leading
+                continue
+            if page:
+                y -= style.space_before
+            for line in self.wrap(text, style):
+                if y - style.leading < bottom and page:
+                    yield page
+                    page, y, emitted = [], top, True
+                y -= style.leading
+                page.append((style, y, line))
+        if page or not emitted:
+            yield page
+
+    # -- serialization ----------------------------------------------------------
+
+    def escape(self, text: str) -> str:
+        """Encode for a literal string in WinAnsi, keeping the result ASCII."""
+        escaped = text.translate(self._escape)
+        if not _balanced_parens(escaped):
+            escaped = escaped.replace("(", "\\(").replace(")", "\\)")
+        if escaped.isascii():
+            return escaped
+        raw = escaped.encode("cp1252", errors="replace")
+        return "".join(chr(byte) if byte < 128 else f"\\{byte:03o}" for byte in raw)
+
+    def page_content(self, page: List[Tuple[PdfStyle, float, str]], page_number: int) -> bytes:
+        ops = ["BT"]
+        current = None
+        for style, y, line in page:
+            if (style.font, style.size) != current:
+                current = (style.font, style.size)
+                ops.append(f"/{style.font} {_num(style.size)} Tf")
+            ops.append(f"1 0 0 1 {_num(self.margin)} {_num(y)} Tm ({self.escape(line)}) Tj")
+        if self.footer:
+            body = self.styles["body"]
+            if current != (body.font, 8):
+                ops.append(f"/{body.font} 8 Tf")
+            footer = self.escape(f"{self.footer} - Page {page_number}")
+            ops.append(f"1 0 0 1 {_num(self.margin)} {_num(self.margin - 16)} Tm ({footer}) Tj")
+        ops.append("ET")
+        return "\n".join(ops).encode("ascii")
+
+    def iter_pdf(self, blocks: Iterable[Tuple[str, str]]) -> Iterator[bytes]:
+        """Stream a complete PDF for ``blocks`` of (style name, text)."""
+        offsets: Dict[int, int] = {}
+        position = 0
+
+        def write_object(number: int, body: bytes) -> bytes:
+            nonlocal position
+            data = b"%d 0 obj\n%s\nendobj\n" % (number, body)
+            offsets[number] = position
+            position += len(data)
+            return data
+
+        header = b"%PDF-1.4\n"
+        position = len(header)
+        yield header + b"".join(write_object(number, body) for number, body in self._shared_objects)
+
+        kids = []
+        next_number = 5
+        for page_number, page in enumerate(self.paginate(blocks), start=1):
+            content = self.page_content(page, page_number)
+            content_obj = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+            chunk = write_object(next_number, content_obj)
+            chunk += write_object(next_number + 1, self._page_prefix + b"%d 0 R >>" % next_number)
+            kids.append(next_number + 1)
+            next_number += 2
+            yield chunk
+
+        kids_ref = " ".join(f"{kid} 0 R" for kid in kids).encode("ascii")
+        tail = write_object(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids_ref, len(kids)))
+        xref_offset = position
+        xref = [b"xref\n0 %d\n" % next_number, b"0000000000 65535 f \n"]
+        xref.extend(b"%010d 00000 n \n" % offsets[number] for number in range(1, next_number))
+        trailer = b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (next_number, xref_offset)
+        yield tail + b"".join(xref) + trailer
+
+
+def _balanced_parens(text: str) -> bool:
+    # Balanced parentheses may appear unescaped in a literal string.
+    depth = 0
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth == 0
+
+
+def _num(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
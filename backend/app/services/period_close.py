@@ -0,0 +1,258 @@
+"""Month-end close: frozen monthly figures per owner.
+
+Closing a month writes one ``period_snapshots`` row holding the revenue
+received in it and the totals of the invoices issued in it. Months are closed
+in order: closing a month also closes every earlier month since the owner's
+first invoice or payment, and reopening a month reopens every later one. The
+closed months therefore always form one contiguous run ending at the
+owner's *closed-through* month.
+
+Revenue reports read closed months from the snapshots and only aggregate
+payments live for months after the watermark (and for partially covered
+months at the edges of a requested range), so a multi-year chart costs one
+snapshot read plus a scan of the open period.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, or_, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.app.core.money import cents_to_decimal, format_cents, to_cents
+from backend.app.core.time import date_range_bounds, date_range_filters
+from backend.app.models.invoice import Invoice
+from backend.app.models.payment import Payment
+from backend.app.models.period_snapshot import PeriodSnapshot
+
+Month = Tuple[int, int]
+
+
+def month_start(month: Month) -> datetime:
+    # Naive UTC, matching how SQLite stores the timestamp columns.
+    return datetime(month[0], month[1], 1)
+
+
+def next_month(month: Month) -> Month:
+    year, number = month
+    return (year + 1, 1) if number == 12 else (year, number + 1)
+
+
+def month_of(value: datetime | date) -> Month:
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.year, value.month
+
+
+def _months(first: Month, last: Month) -> List[Month]:
+    months = []
+    current = first
+    while current <= last:
+        months.append(current)
+        current = next_month(current)
+    return months
+
+
+def closed_through(db: Session, owner_id: int) -> Optional[Month]:
+    """Latest closed month for the owner, or None if nothing is closed."""
+    row = (
+        db.query(PeriodSnapshot.year, PeriodSnapshot.month)
+        .filter(PeriodSnapshot.owner_id == owner_id)
+        .order_by(PeriodSnapshot.year.desc(), PeriodSnapshot.month.desc())
+        .first()
+    )
+    return (row.year, row.month) if row else None
+
+
+def _first_activity_month(db: Session, owner_id: int) -> Optional[Month]:
+    first_invoice = db.query(func.min(Invoice.created_at)).filter(Invoice.owner_id == owner_id).scalar()
+    first_payment = (
+        db.query(func.min(Payment.created_at))
+        .join(Invoice, Payment.invoice_id == Invoice.id)
+        .filter(Payment.owner_id == owner_id, Invoice.owner_id == owner_id)
+        .scalar()
+    )
+    candidates = [month_of(value) for value in (first_invoice, first_payment) if value is not None]
+    return min(candidates) if candidates else None
+
+
+def _payments_by_month(db: Session, owner_id: int, *conditions) -> Dict[Month, Tuple[int, int]]:
+    year_col = func.extract("year", Payment.created_at)
+    month_col = func.extract("month", Payment.created_at)
+    rows = (
+        db.query(year_col, month_col, func.coalesce(func.sum(Payment.amount), 0), func.count(Payment.id))
+        .join(Invoice, Payment.invoice_id == Invoice.id)
+        .filter(Payment.owner_id == owner_id, Invoice.owner_id == owner_id, *conditions)
+        .group_by(year_col, month_col)
+        .all()
+    )
+    return {(int(year), int(month)): (to_cents(total), count) for year, month, total, count in rows}
+
+
+def _invoices_by_month(db: Session, owner_id: int, start: datetime, end: datetime) -> Dict[Month, Tuple[int, int, int, int]]:
+    year_col = func.extract("year", Invoice.created_at)
+    month_col = func.extract("month", Invoice.created_at)
+    rows = (
+        db.query(
+            year_col,
+            month_col,
+            func.coalesce(func.sum(Invoice.total_amount), 0),
+            func.coalesce(func.sum(Invoice.amount_paid), 0),
+            func.coalesce(func.sum(Invoice.balance_due), 0),
+            func.count(Invoice.id),
+        )
+        .filter(Invoice.owner_id == owner_id, Invoice.created_at >= start, Invoice.created_at < end)
+        .group_by(year_col, month_col)
+        .all()
+    )
+    return {
+        (int(year), int(month)): (to_cents(invoiced), to_cents(paid), to_cents(outstanding), count)
+        for year, month, invoiced, paid, outstanding, count in rows
+    }
+
+
+def close_periods(db: Session, owner_id: int, *, through: Month, now: Optional[datetime] = None) -> List[dict]:
+    """Snapshot every unclosed month up to and including ``through``; returns the new snapshots."""
+    now = now or datetime.now(timezone.utc)
+    if month_start(next_month(through)) > now.astimezone(timezone.utc).replace(tzinfo=None):
+        raise HTTPException(status_code=400, detail="Only months that have ended can be closed")
+    watermark = closed_through(db, owner_id)
+    if watermark is not None:
+        first = next_month(watermark)
+    else:
+        first = min(_first_activity_month(db, owner_id) or through, through)
+    months = _months(first, through)
+    if not months:
+        return []
+
+    start, end = month_start(months[0]), month_start(next_month(months[-1]))
+    payments = _payments_by_month(db, owner_id, Payment.created_at >= start, Payment.created_at < end)
+    invoices = _invoices_by_month(db, owner_id, start, end)
+    snapshots = []
+    for month in months:
+        revenue, payment_count = payments.get(month, (0, 0))
+        invoiced, paid, outstanding, invoice_count = invoices.get(month, (0, 0, 0, 0))
+        snapshots.append(
+            PeriodSnapshot(
+                owner_id=owner_id,
+                year=month[0],
+                month=month[1],
+                revenue=cents_to_decimal(revenue),
+                payment_count=payment_count,
+                invoiced=cents_to_decimal(invoiced),
+                paid=cents_to_decimal(paid),
+                outstanding=cents_to_decimal(outstanding),
+                invoice_count=invoice_count,
+            )
+        )
+    db.add_all(snapshots)
+    try:
+        db.flush()
+    except IntegrityError:
+        # A concurrent close wrote some of these months first.
+        db.rollback()
+        watermark = closed_through(db, owner_id)
+        if watermark is not None and watermark >= through:
+            return []
+        raise HTTPException(status_code=409, detail="Another close is in progress for these months; try again")
+    closed = [serialize_snapshot(snapshot) for snapshot in snapshots]
+    db.commit()
+    return closed
+
+
+def reopen_periods(db: Session, owner_id: int, *, since: Month) -> int:
+    """Delete the snapshots for ``since`` and every later month; returns how many were removed."""
+    result = db.execute(
+        delete(PeriodSnapshot).where(
+            PeriodSnapshot.owner_id == owner_id,
+            tuple_(PeriodSnapshot.year, PeriodSnapshot.month) >= since,
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def serialize_snapshot(snapshot: PeriodSnapshot) -> dict:
+    return {
+        "year": snapshot.year,
+        "month": snapshot.month,
+        "revenue": format_cents(to_cents(snapshot.revenue)),
+        "payment_count": snapshot.payment_count,
+        "invoiced": format_cents(to_cents(snapshot.invoiced)),
+        "paid": format_cents(to_cents(snapshot.paid)),
+        "outstanding": format_cents(to_cents(snapshot.outstanding)),
+        "invoice_count": snapshot.invoice_count,
+        "closed_at": snapshot.closed_at,
+    }
+
+
+def list_period_snapshots(db: Session, owner_id: int) -> List[dict]:
+    snapshots = (
+        db.query(PeriodSnapshot)
+        .filter(PeriodSnapshot.owner_id == owner_id)
+        .order_by(PeriodSnapshot.year.desc(), PeriodSnapshot.month.desc())
+        .all()
+    )
+    return [serialize_snapshot(snapshot) for snapshot in snapshots]
+
+
+def monthly_revenue_cents(
+    db: Session, owner_id: int, from_date: Optional[date] = None, to_date: Optional[date] = None
+) -> Dict[Month, int]:
+    """Revenue per month with payments, from snapshots where a closed month lies fully in the range."""
+    lower, upper = date_range_bounds(from_date, to_date)
+    if lower is not None:
+        lower = lower.replace(tzinfo=None)
+    if upper is not None:
+        upper = upper.replace(tzinfo=None)
+
+    covered = []
+    revenue: Dict[Month, int] = {}
+    for snapshot in db.query(PeriodSnapshot).filter(PeriodSnapshot.owner_id == owner_id):
+        month = (snapshot.year, snapshot.month)
+        if lower is not None and month_start(month) < lower:
+            continue
+        if upper is not None and month_start(next_month(month)) > upper:
+            continue
+        covered.append(month)
+        if snapshot.payment_count:
+            revenue[month] = to_cents(snapshot.revenue)
+
+    conditions = date_range_filters(Payment.created_at, from_date, to_date)
+    if covered:
+        # Closed months are contiguous, so the covered ones are a single interval to skip.
+        skip_start, skip_end = month_start(min(covered)), month_start(next_month(max(covered)))
+        conditions.append(or_(Payment.created_at < skip_start, Payment.created_at >= skip_end))
+    live = _payments_by_month(db, owner_id, *conditions)
+    for month, (total, _) in live.items():
+        revenue[month] = revenue.get(month, 0) + total
+    return revenue
+
+
+def revenue_since_cents(db: Session, owner_id: int, start: datetime) -> int:
+    """Revenue received from ``start`` (a month boundary) until now, using snapshots for closed months."""
+    start = start.astimezone(timezone.utc).replace(tzinfo=None) if start.tzinfo is not None else start
+    first = month_of(start)
+    watermark = closed_through(db, owner_id)
+    total = 0
+    live_start = start
+    if watermark is not None and watermark >= first:
+        snapshot_total = (
+            db.query(func.coalesce(func.sum(PeriodSnapshot.revenue), 0))
+            .filter(
+                PeriodSnapshot.owner_id == owner_id,
+                tuple_(PeriodSnapshot.year, PeriodSnapshot.month) >= first,
+            )
+            .scalar()
+        )
+        total += to_cents(snapshot_total)
+        live_start = month_start(next_month(watermark))
+    live = (
+        db.query(func.coalesce(func.sum(Payment.amount), 0))
+        .join(Invoice, Payment.invoice_id == Invoice.id)
+        .filter(Payment.owner_id == owner_id, Invoice.owner_id == owner_id, Payment.created_at >= live_start)
+        .scalar()
+    )
+    return total + to_cents(live)
@@ -0,0 +1,106 @@
+"""Per-owner rate resolution for session pricing.
+
+An owner's rate matrix (plan x duration, from ``rate_settings``) and hourly
+rate timeline (``rate_history``) are loaded together into an immutable
+``OwnerRates`` and cached in-process. Lookups never touch the database: the
+matrix is a dict, and the rate effective at a given moment is found by
+bisecting the sorted ``effective_at`` tuple.
+
+Cache entries are keyed by the owner's ``rates`` data stamp, which the flush
+hooks bump whenever either table is written, so other workers pick up
+changes on their next lookup. The endpoints that change rates also call
+``invalidate_owner_rates`` so this process drops its copy straight away.
+
+Resolving rates never writes: an owner without a ``rate_settings`` row is
+priced with the column defaults, exactly as the row would be created.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.app.core.cache import LRUCache
+from backend.app.models.rate_history import RateHistory
+from backend.app.models.rate_settings import RateSettings
+from backend.app.services.data_versions import get_owner_data_stamp
+
+RATE_PLANS = ("regular", "discount")
+SESSION_DURATIONS = (30, 45, 60)
+DEFAULT_HOURLY_RATE = Decimal("60.00")
+RATE_CACHE_DOMAINS = ("rates",)
+CENT = Decimal("0.01")
+
+_rates_cache = LRUCache(maxsize=1024)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes holding UTC wall time.
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo is not None else value
+
+
+def _column_default(plan: str, duration: int) -> Decimal:
+    return RateSettings.__table__.c[f"{plan}_rate_{duration}"].default.arg
+
+
+@dataclass(frozen=True)
+class OwnerRates:
+    # (plan, duration_minutes) -> flat session rate.
+    matrix: Mapping[Tuple[str, int], Decimal]
+    # Parallel tuples sorted by effective_at (naive UTC).
+    effective_at: Tuple[datetime, ...] = ()
+    hourly_rates: Tuple[Decimal, ...] = ()
+
+    def session_rate(self, plan: Optional[str], duration_minutes: int) -> Optional[Decimal]:
+        """Flat rate for a session of this plan and duration, or None if the duration is not priced."""
+        return self.matrix.get((plan or "regular", duration_minutes))
+
+    def hourly_rate_at(self, when: datetime) -> Decimal:
+        """Hourly rate from the latest history entry effective at or before ``when``."""
+        index = bisect_right(self.effective_at, _naive_utc(when))
+        return self.hourly_rates[index - 1] if index else DEFAULT_HOURLY_RATE
+
+    def cost_at(self, duration_minutes: int, when: datetime) -> Decimal:
+        """Price a session of ``duration_minutes`` at the hourly rate effective at ``when``."""
+        return (self.hourly_rate_at(when) * duration_minutes / 60).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def load_owner_rates(db: Session, owner_id: int) -> OwnerRates:
+    """Read an owner's rate matrix and history from the database (uncached)."""
+    settings = db.query(RateSettings).filter(RateSettings.owner_id == owner_id).first()
+    matrix = {}
+    for plan in RATE_PLANS:
+        for duration in SESSION_DURATIONS:
+            value = getattr(settings, f"{plan}_rate_{duration}") if settings is not None else None
+            matrix[(plan, duration)] = Decimal(value) if value is not None else _column_default(plan, duration)
+    history = (
+        db.query(RateHistory.effective_at, RateHistory.rate_per_hour)
+        .filter(RateHistory.owner_id == owner_id)
+        .order_by(RateHistory.effective_at, RateHistory.id)
+        .all()
+    )
+    return OwnerRates(
+        matrix=MappingProxyType(matrix),
+        effective_at=tuple(_naive_utc(effective_at) for effective_at, _ in history),
+        hourly_rates=tuple(Decimal(rate) for _, rate in history),
+    )
+
+
+def get_owner_rates(db: Session, owner_id: int) -> OwnerRates:
+    """Cached ``OwnerRates``; reloaded only after the owner's rates change."""
+    stamp = get_owner_data_stamp(db, owner_id, RATE_CACHE_DOMAINS)
+    cached = _rates_cache.get(owner_id)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    rates = load_owner_rates(db, owner_id)
+    _rates_cache.set(owner_id, (stamp, rates))
+    return rates
+
+
+def invalidate_owner_rates(owner_id: int) -> None:
+    """Drop this process's cached rates for an owner."""
+    _rates_cache.pop(owner_id)
@@ -0,0 +1,312 @@
+"""Owner-wide due reminders and an in-process scheduler that announces them.
+
+``get_due_reminders`` answers "what is overdue / due today" one keyset page at
+a time over ``ix_reminders_owner_completed_due_at``, so a long overdue backlog
+never hides the reminders due later today.
+
+``ReminderScheduler`` keeps the reminders coming due within a short horizon in
+a min-heap keyed by ``due_at``. A background thread sleeps until the earliest
+entry (or the next refresh), pops everything that has come due and passes it to
+the registered notification hooks. The database stays the source of truth: the
+heap is rebuilt from it on every refresh, and each popped reminder is claimed
+with a conditional UPDATE of ``notified_due_at`` before any hook runs. Only the
+process whose UPDATE matched announces it, so every worker can run a scheduler
+without sending duplicates, and completed, deleted or rescheduled reminders
+are never announced. Reminders already overdue when the scheduler starts are
+not announced; they are listed by ``get_due_reminders``.
+"""
+
+import heapq
+import logging
+from datetime import datetime, time, timedelta, timezone
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from backend.app.core.pagination import Cursor, keyset_page
+from backend.app.db.session import SessionLocal
+from backend.app.models.reminder import Reminder
+
+logger = logging.getLogger(__name__)
+
+DUE_REMINDERS_LIMIT = 500
+
+NotificationHook = Callable[[dict], None]
+_notification_hooks: List[NotificationHook] = []
+
+
+def register_notification_hook(hook: NotificationHook) -> NotificationHook:
+    """Register ``hook(payload)`` to be called for every reminder that comes due."""
+    if hook not in _notification_hooks:
+        _notification_hooks.append(hook)
+    return hook
+
+
+def unregister_notification_hook(hook: NotificationHook) -> None:
+    if hook in _notification_hooks:
+        _notification_hooks.remove(hook)
+
+
+@register_notification_hook
+def log_due_reminder(payload: dict) -> None:
+    logger.info("Reminder %s due for owner %s: %s", payload["id"], payload["owner_id"], payload["title"])
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; stored values are UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def end_of_day(moment: datetime) -> datetime:
+    """Start of the UTC day after ``moment``."""
+    moment = _as_utc(moment)
+    return datetime.combine(moment.date() + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+
+def get_due_reminders(
+    db: Session,
+    owner_id: int,
+    *,
+    as_of: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    include_overdue: bool = True,
+    cursor: Optional[Cursor] = None,
+    limit: int = DUE_REMINDERS_LIMIT,
+) -> Dict:
+    """One page of open reminders due before ``until`` (default: end of today, UTC), split at ``as_of``.
+
+    Pages run in ``(due_at, id)`` order; ``next_cursor`` is None on the last one.
+    """
+    as_of = _as_utc(as_of or datetime.now(timezone.utc))
+    until = _as_utc(until) if until else end_of_day(as_of)
+
+    query = db.query(Reminder).filter(
+        Reminder.owner_id == owner_id,
+        Reminder.completed.is_(False),
+        Reminder.due_at < until,
+    )
+    if include_overdue:
+        query = query.filter(Reminder.due_at.isnot(None))
+    else:
+        query = query.filter(Reminder.due_at >= as_of)
+    reminders, next_cursor = keyset_page(query, Reminder.due_at, Reminder.id, cursor=cursor, limit=limit)
+
+    overdue = [reminder for reminder in reminders if _as_utc(reminder.due_at) < as_of]
+    due = reminders[len(overdue):]
+    return {"as_of": as_of, "until": until, "overdue": overdue, "due": due, "next_cursor": next_cursor}
+
+
+def _payload(reminder_id: int, owner_id: int, lead_id: int, title: str, due_at: datetime) -> dict:
+    return {
+        "id": reminder_id,
+        "owner_id": owner_id,
+        "lead_id": lead_id,
+        "title": title,
+        "due_at": _as_utc(due_at).isoformat(),
+    }
+
+
+class ReminderScheduler:
+    """Min-heap of upcoming reminders, fired from a background thread."""
+
+    def __init__(
+        self,
+        *,
+        horizon: timedelta = timedelta(minutes=15),
+        refresh_interval: timedelta = timedelta(minutes=1),
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.horizon = horizon
+        self.refresh_interval = refresh_interval
+        self.session_factory = session_factory
+        self._heap: List[Tuple[datetime, int]] = []
+        # Current due time per scheduled id; heap entries that disagree are stale (lazy deletion).
+        self._scheduled: Dict[int, datetime] = {}
+        # Fired reminders whose due time is still inside the refresh window.
+        self._fired: Dict[int, datetime] = {}
+        self._watermark: Optional[datetime] = None
+        self._loaded_until: Optional[datetime] = None
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._stopping = Event()
+        self._thread: Optional[Thread] = None
+
+    # -- heap -------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._scheduled)
+
+    def schedule(self, reminder_id: int, due_at: Optional[datetime]) -> None:
+        """Track a created or rescheduled reminder if it falls inside the loaded horizon."""
+        with self._lock:
+            if due_at is None or self._loaded_until is None:
+                self._scheduled.pop(reminder_id, None)
+                return
+            due_at = _as_utc(due_at)
+            if due_at <= self._watermark or due_at > self._loaded_until:
+                self._scheduled.pop(reminder_id, None)
+                return
+            if self._scheduled.get(reminder_id) != due_at:
+                self._scheduled[reminder_id] = due_at
+                heapq.heappush(self._heap, (due_at, reminder_id))
+                wake = self._heap[0] == (due_at, reminder_id)
+            else:
+                wake = False
+        if wake:
+            self._wakeup.set()
+
+    def cancel(self, reminder_id: int) -> None:
+        with self._lock:
+            self._scheduled.pop(reminder_id, None)
+
+    def next_due(self) -> Optional[datetime]:
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def _drop_stale(self) -> None:
+        heap = self._heap
+        while heap and self._scheduled.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def _pop_due(self, now: datetime) -> List[Tuple[int, datetime]]:
+        with self._lock:
+            ready = []
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                due_at, reminder_id = heapq.heappop(heap)
+                if self._scheduled.get(reminder_id) == due_at:
+                    del self._scheduled[reminder_id]
+                    self._fired[reminder_id] = due_at
+                    ready.append((reminder_id, due_at))
+            return ready
+
+    # -- database ---------------------------------------------------------------
+
+    def refresh(self, now: Optional[datetime] = None) -> int:
+        """Rebuild the heap from open reminders due in (last refresh, now + horizon]."""
+        now = _as_utc(now or datetime.now(timezone.utc))
+        watermark = self._watermark or now
+        loaded_until = now + self.horizon
+        db = self.session_factory()
+        try:
+            rows = (
+                db.query(Reminder.id, Reminder.due_at)
+                .filter(
+                    Reminder.completed.is_(False),
+                    Reminder.due_at > watermark,
+                    Reminder.due_at <= loaded_until,
+                )
+                .all()
+            )
+        finally:
+            db.close()
+
+        with self._lock:
+            fired = {rid: due for rid, due in self._fired.items() if due > watermark}
+            scheduled = {}
+            for reminder_id, due_at in rows:
+                due_at = _as_utc(due_at)
+                if fired.get(reminder_id) != due_at:
+                    scheduled[reminder_id] = due_at
+            heap = [(due_at, reminder_id) for reminder_id, due_at in scheduled.items()]
+            heapq.heapify(heap)
+            self._heap, self._scheduled, self._fired = heap, scheduled, fired
+            # The next refresh reads from this one's start, so reminders created
+            # in between with a due time that has already passed still fire.
+            self._watermark = now
+            self._loaded_until = loaded_until
+            return len(scheduled)
+
+    def fire_due(self, now: Optional[datetime] = None) -> List[dict]:
+        """Notify hooks about every scheduled reminder due at ``now`` that this process claims.
+
+        Returns the payloads announced here; reminders another scheduler claimed first are skipped.
+        """
+        now = _as_utc(now or datetime.now(timezone.utc))
+        ready = self._pop_due(now)
+        if not ready:
+            return []
+        db = self.session_factory()
+        try:
+            claimed = [reminder_id for reminder_id, due_at in ready if self._claim(db, reminder_id, due_at)]
+            db.commit()
+            rows = (
+                db.query(Reminder.id, Reminder.owner_id, Reminder.lead_id, Reminder.title, Reminder.due_at)
+                .filter(Reminder.id.in_(claimed))
+                .all()
+                if claimed
+                else []
+            )
+        finally:
+            db.close()
+
+        payloads = [_payload(*row) for row in sorted(rows, key=lambda row: (_as_utc(row.due_at), row.id))]
+        for payload in payloads:
+            for hook in list(_notification_hooks):
+                try:
+                    hook(payload)
+                except Exception:
+                    logger.exception("Reminder notification hook %r failed", hook)
+        return payloads
+
+    @staticmethod
+    def _claim(db: Session, reminder_id: int, due_at: datetime) -> bool:
+        """Mark the reminder announced for ``due_at`` unless it changed or was already claimed."""
+        result = db.execute(
+            update(Reminder)
+            .where(
+                Reminder.id == reminder_id,
+                Reminder.completed.is_(False),
+                Reminder.due_at == due_at,
+                or_(Reminder.notified_due_at.is_(None), Reminder.notified_due_at != due_at),
+            )
+            .values(notified_due_at=due_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    # -- thread -----------------------------------------------------------------
+
+    def start(self) -> None:
+        """Load the first horizon and start the background thread."""
+        if self._thread is not None:
+            return
+        self.refresh()
+        self._stopping.clear()
+        self._thread = Thread(target=self._run, name="corebox-reminders", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        thread.join()
+        with self._lock:
+            self._heap, self._scheduled, self._fired = [], {}, {}
+            self._watermark = self._loaded_until = None
+
+    def _run(self) -> None:
+        next_refresh = datetime.now(timezone.utc) + self.refresh_interval
+        while not self._stopping.is_set():
+            now = datetime.now(timezone.utc)
+            try:
+                if now >= next_refresh:
+                    self.refresh(now)
+                    next_refresh = now + self.refresh_interval
+                self.fire_due(now)
+            except Exception:
+                logger.exception("Reminder scheduler tick failed")
+            wake_at = next_refresh
+            next_due = self.next_due()
+            if next_due is not None and next_due < wake_at:
+                wake_at = next_due
+            self._wakeup.wait(max((wake_at - datetime.now(timezone.utc)).total_seconds(), 0))
+            self._wakeup.clear()
+
+
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,164 @@
+"""Several owner reports computed in one request.
+
+The dashboard needs half a dozen reports at once. A batch authenticates once
+and runs the requested reports in one read snapshot, so every result reflects
+the same committed state. The owner's invoices and payments are loaded at most
+once per batch and handed to each report that reads them. Results come back in
+request order with per-report timings; a report that fails does not fail the
+batch.
+"""
+
+import logging
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from backend.app.db.snapshot import snapshot_session
+from backend.app.models.invoice import Invoice
+from backend.app.models.payment import Payment
+from backend.app.services.activity_reporting import get_activity_summary
+from backend.app.services.aging_reporting import get_aging_summary
+from backend.app.services.dashboard_service import get_owner_dashboard_summary
+from backend.app.services.invoice_pipeline_reporting import get_invoice_pipeline_summary
+from backend.app.services.lead_funnel_reporting import get_lead_funnel
+from backend.app.services.payment_analytics_reporting import get_payment_analytics
+from backend.app.services.reports import get_financial_summary_for_owner
+from backend.app.services.revenue import get_ytd_revenue_for_owner
+
+logger = logging.getLogger(__name__)
+
+
+class BatchData:
+    """Owner rows several reports read, loaded on first use from the batch's snapshot."""
+
+    def __init__(self, db: Session, owner_id: int):
+        self.db = db
+        self.owner_id = owner_id
+
+    @cached_property
+    def invoices(self) -> List[Invoice]:
+        return self.db.query(Invoice).filter(Invoice.owner_id == self.owner_id).all()
+
+    @cached_property
+    def payments(self) -> List[Payment]:
+        return self.db.query(Payment).filter(Payment.owner_id == self.owner_id).all()
+
+
+# name -> handler(db, owner_id, params, data) returning the report's JSON-ready payload
+ReportHandler = Callable[[Session, int, dict, BatchData], Any]
+REPORT_HANDLERS: Dict[str, ReportHandler] = {}
+
+
+def report_handler(name: str) -> Callable[[ReportHandler], ReportHandler]:
+    def register(func: ReportHandler) -> ReportHandler:
+        REPORT_HANDLERS[name] = func
+        return func
+
+    return register
+
+
+def _optional_date(params: dict, key: str) -> Optional[date]:
+    value = params.get(key)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Invalid {key}")
+
+
+def _today(params: dict) -> date:
+    return _optional_date(params, "today") or datetime.now(timezone.utc).date()
+
+
+def _date_range(params: dict) -> tuple[Optional[date], Optional[date]]:
+    start_date, end_date = _optional_date(params, "start_date"), _optional_date(params, "end_date")
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+    return start_date, end_date
+
+
+@report_handler("dashboard_summary")
+def _dashboard_summary(db: Session, owner_id: int, params: dict, data: BatchData) -> dict:
+    return get_owner_dashboard_summary(
+        db, owner_id=owner_id, today=_today(params), invoices=data.invoices, payments=data.payments
+    )
+
+
+@report_handler("financial_summary")
+def _financial_summary(db: Session, owner_id: int, params: dict, data: BatchData) -> dict:
+    return get_financial_summary_for_owner(db, owner_id, *_date_range(params))
+
+
+@report_handler("activity_summary")
+def _activity_summary(db: Session, owner_id: int, params: dict, data: BatchData) -> dict:
+    start_date, end_date = _date_range(params)
+    return get_activity_summary(db, owner_id=owner_id, start_date=start_date, end_date=end_date)
+
+
+@report_handler("aging_summary")
+def _aging_summary(db: Session, owner_id: int, params: dict, data: BatchData) -> dict:
+    return get_aging_summary(db, owner_id=owner_id, as_of=_optional_date(params, "as_of"), invoices=data.invoices)
+
+
+@report_handler("invoice_pipeline")
+def _invoice_pipeline(db: Session, owner_id: int, params: dict, data: BatchData) -> dict:
+    return get_invoice_pipeline_summary(
+        db, owner_id=owner_id, today=_optional_date(params, "today"), invoices=data.invoices
+    )
+
+
+@report_handler("payment_analytics")
+def _payment_analytics(db: Session, owner_id: int, params: dict, data: BatchData) -> dict:
+    return get_payment_analytics(
+        db, owner_id=owner_id, today=_optional_date(params, "today"), payments=data.payments
+    )
+
+
+@report_handler("lead_funnel")
+def _lead_funnel(db: Session, owner_id: int, params: dict, data: BatchData) -> dict:
+    return get_lead_funnel(db, owner_id=owner_id)
+
+
+@report_handler("revenue_ytd")
+def _revenue_ytd(db: Session, owner_id: int, params: dict, data: BatchData) -> dict:
+    ytd_total = Decimal(get_ytd_revenue_for_owner(db, owner_id)).quantize(Decimal("0.01"))
+    return {"year": datetime.now(timezone.utc).year, "ytd_revenue": str(ytd_total)}
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _run_report(db: Session, data: BatchData, name: str, params: dict) -> dict:
+    started = time.perf_counter()
+    result = {"name": name, "status": "ok", "data": None, "error": None, "status_code": 200}
+    try:
+        # A savepoint per report: on Postgres a failed statement aborts the
+        # transaction, which would fail every later report in the snapshot.
+        with db.begin_nested():
+            result["data"] = REPORT_HANDLERS[name](db, data.owner_id, params, data)
+    except HTTPException as exc:
+        result.update(status="error", error=str(exc.detail), status_code=exc.status_code)
+    except Exception:
+        logger.exception("Report %s failed in batch for owner %s", name, data.owner_id)
+        result.update(status="error", error="Report failed", status_code=500)
+    result["elapsed_ms"] = _elapsed_ms(started)
+    return result
+
+
+def run_report_batch(db: Session, *, owner_id: int, reports: List[dict]) -> dict:
+    """Run ``[{"name": ..., "params": {...}}, ...]`` in one snapshot; results are in request order."""
+    unknown = sorted({item["name"] for item in reports} - REPORT_HANDLERS.keys())
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown report: {', '.join(unknown)}")
+    started = time.perf_counter()
+    with snapshot_session(db) as snapshot:
+        data = BatchData(snapshot, owner_id)
+        results = [_run_report(snapshot, data, item["name"], item.get("params") or {}) for item in reports]
+    return {"results": results, "elapsed_ms": _elapsed_ms(started)}
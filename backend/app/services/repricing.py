@@ -0,0 +1,173 @@
+"""Re-price unbilled sessions after an owner's rates change.
+
+Sessions keep the rate they were created with. ``reprice_sessions`` walks the
+owner's unbilled sessions matching a filter in id order, ``chunk_size`` rows
+at a time, prices each row from the cached ``OwnerRates`` and writes the
+changed rows of a chunk with a single ``UPDATE ... SET col = CASE id ...``.
+Each chunk commits on its own so a large re-price never holds the write lock
+for long; the unbilled condition is repeated in the UPDATE so a session
+invoiced in the meantime is left alone.
+
+Two pricing sources are supported:
+
+* ``settings`` - the flat rate for the session's plan and duration, as used
+  when sessions are created (``rate_per_hour`` and ``cost_total`` are both
+  set to it);
+* ``history`` - the hourly rate from ``rate_history`` effective on the
+  session's date, with ``cost_total`` prorated by duration.
+
+A dry run computes the same diff and totals without writing.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, select, update
+from sqlalchemy.orm import Session
+
+from backend.app.core.money import format_cents, to_cents
+from backend.app.core.time import date_range_filters
+from backend.app.models.session import Session as SessionModel
+from backend.app.services.data_versions import bump_versions
+from backend.app.services.rate_resolution import OwnerRates, get_owner_rates
+
+CHUNK_SIZE = 500
+MAX_DIFF_ROWS = 500
+PRICING_SOURCES = ("settings", "history")
+BILLED_STATUSES = ("invoiced", "paid")
+
+
+def _unbilled(owner_id: int):
+    return and_(
+        SessionModel.owner_id == owner_id,
+        SessionModel.is_billable.is_(True),
+        SessionModel.billing_status.notin_(BILLED_STATUSES),
+    )
+
+
+def _filters(
+    owner_id: int,
+    *,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    plan: Optional[str],
+    student_id: Optional[int],
+) -> list:
+    clauses = [_unbilled(owner_id), *date_range_filters(SessionModel.session_date, start_date, end_date)]
+    if plan is not None:
+        clauses.append(SessionModel.rate_plan == plan)
+    if student_id is not None:
+        clauses.append(SessionModel.student_id == student_id)
+    return clauses
+
+
+def price_session(
+    rates: OwnerRates, pricing: str, rate_plan: Optional[str], duration_minutes: int, session_date: datetime
+) -> Optional[Tuple[Decimal, Decimal]]:
+    """Return the new (rate_per_hour, cost_total) for a session, or None if it cannot be priced."""
+    if pricing == "history":
+        if not duration_minutes or duration_minutes <= 0:
+            return None
+        return rates.hourly_rate_at(session_date), rates.cost_at(duration_minutes, session_date)
+    rate = rates.session_rate(rate_plan, duration_minutes)
+    if rate is None or rate <= 0:
+        return None
+    return rate, rate
+
+
+def _as_money(value) -> Optional[Decimal]:
+    return Decimal(str(value)).quantize(Decimal("0.01")) if value is not None else None
+
+
+def reprice_sessions(
+    db: Session,
+    *,
+    owner_id: int,
+    pricing: str = "settings",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    plan: Optional[str] = None,
+    student_id: Optional[int] = None,
+    dry_run: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> Dict:
+    """Recompute ``rate_per_hour``/``cost_total`` for matching unbilled sessions; returns totals and a diff."""
+    rates = get_owner_rates(db, owner_id)
+    conditions = _filters(owner_id, start_date=start_date, end_date=end_date, plan=plan, student_id=student_id)
+    columns = (
+        SessionModel.id,
+        SessionModel.student_id,
+        SessionModel.session_date,
+        SessionModel.rate_plan,
+        SessionModel.duration_minutes,
+        SessionModel.rate_per_hour,
+        SessionModel.cost_total,
+    )
+    stats = {"matched": 0, "changed": 0, "unpriced": 0, "updated": 0}
+    old_cents = new_cents = 0
+    changes: List[Dict] = []
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(*columns).where(SessionModel.id > last_id, *conditions).order_by(SessionModel.id).limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        stats["matched"] += len(rows)
+        new_rates: Dict[int, Decimal] = {}
+        new_costs: Dict[int, Decimal] = {}
+        for row in rows:
+            priced = price_session(rates, pricing, row.rate_plan, row.duration_minutes, row.session_date)
+            if priced is None:
+                stats["unpriced"] += 1
+                continue
+            new_rate, new_cost = priced
+            old_rate, old_cost = _as_money(row.rate_per_hour), _as_money(row.cost_total)
+            old_cents += to_cents(old_cost)
+            new_cents += to_cents(new_cost)
+            if (old_rate, old_cost) == (new_rate, new_cost):
+                continue
+            new_rates[row.id], new_costs[row.id] = new_rate, new_cost
+            if len(changes) < MAX_DIFF_ROWS:
+                changes.append(
+                    {
+                        "session_id": row.id,
+                        "student_id": row.student_id,
+                        "session_date": row.session_date,
+                        "rate_plan": row.rate_plan,
+                        "duration_minutes": row.duration_minutes,
+                        "old_rate_per_hour": None if old_rate is None else str(old_rate),
+                        "new_rate_per_hour": str(new_rate),
+                        "old_cost_total": None if old_cost is None else str(old_cost),
+                        "new_cost_total": str(new_cost),
+                    }
+                )
+        stats["changed"] += len(new_costs)
+        if dry_run or not new_costs:
+            db.commit()  # end the read transaction between chunks
+            continue
+        result = db.execute(
+            update(SessionModel)
+            .where(SessionModel.id.in_(list(new_costs)), _unbilled(owner_id))
+            .values(
+                rate_per_hour=case(new_rates, value=SessionModel.id),
+                cost_total=case(new_costs, value=SessionModel.id),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        # Core UPDATEs skip the flush hooks, so bump the data version explicitly.
+        bump_versions(db, owner_id, "sessions", student_ids={row.student_id for row in rows if row.id in new_costs})
+        db.commit()
+        stats["updated"] += result.rowcount
+    return {
+        "dry_run": dry_run,
+        "pricing": pricing,
+        **stats,
+        "old_total": format_cents(old_cents),
+        "new_total": format_cents(new_cents),
+        "delta": format_cents(new_cents - old_cents),
+        "changes": changes,
+        "changes_truncated": stats["changed"] > len(changes),
+    }
@@ -0,0 +1,302 @@
+"""Retention for ``timeline_events`` and ``audit_logs``.
+
+Policies say, per timeline event type, how long rows stay in the hot table and
+when routine ``lead_updated`` events are folded into one summary per lead and
+day. Every row that leaves a hot table is first appended to a gzip-compressed
+NDJSON archive under ``<archive_dir>/<table>/``; the delete only commits
+after the archive chunk has been flushed to disk.
+
+All writes happen in small chunks, each in its own short transaction, so a
+retention run never holds the SQLite write lock for long and the API keeps
+serving writes between chunks. Rows removed outside the ORM bump the owner's
+``leads`` data version so cached reports and ETags see the change.
+"""
+
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import groupby
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from backend.app.models.audit_log import AuditLog
+from backend.app.models.timeline import TimelineEvent
+from backend.app.services.data_versions import bump_versions
+
+CHUNK_SIZE = 500
+LEAD_UPDATED = "lead_updated"
+LEAD_UPDATED_DAILY = "lead_updated_daily"
+DEFAULT_POLICY = "*"
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    # Archive and delete rows older than this many days; None keeps them forever.
+    keep_days: Optional[int] = None
+    # Fold rows older than this many days into one summary per lead and day.
+    compact_after_days: Optional[int] = None
+
+
+TIMELINE_POLICIES: Dict[str, RetentionPolicy] = {
+    # Lead history and funnel reporting read these, so they are never removed.
+    "lead_created": RetentionPolicy(),
+    "status_changed": RetentionPolicy(),
+    LEAD_UPDATED: RetentionPolicy(keep_days=365, compact_after_days=30),
+    LEAD_UPDATED_DAILY: RetentionPolicy(keep_days=365),
+    DEFAULT_POLICY: RetentionPolicy(keep_days=365),
+}
+AUDIT_LOG_POLICY = RetentionPolicy(keep_days=730)
+
+
+class NdjsonArchive:
+    """Append-only gzip NDJSON file for one table and retention run, created on first write."""
+
+    def __init__(self, directory: Path, table: str, stamp: str):
+        self.path = Path(directory) / table / f"{table}-{stamp}.ndjson.gz"
+        self.rows = 0
+        self._raw = None
+        self._gzip = None
+
+    def write(self, rows: Iterable[dict]) -> None:
+        if self._gzip is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._raw = open(self.path, "ab")
+            self._gzip = gzip.GzipFile(fileobj=self._raw, mode="ab")
+        for row in rows:
+            self._gzip.write(json.dumps(row, default=_json_default, separators=(",", ":")).encode("utf-8") + b"\n")
+            self.rows += 1
+        # Make the chunk durable before the caller deletes it from the database.
+        self._gzip.flush()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+
+    def close(self) -> None:
+        if self._gzip is not None:
+            self._gzip.close()
+            self._raw.close()
+            self._gzip = self._raw = None
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot archive value of type {type(value).__name__}")
+
+
+def _cutoff(now: datetime, days: int) -> datetime:
+    return now - timedelta(days=days)
+
+
+def _as_date(value: datetime) -> date:
+    # SQLite hands back naive datetimes holding UTC wall time.
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def _bump_owners(db: Session, rows: Iterable[dict]) -> None:
+    for owner_id in sorted({row["owner_id"] for row in rows}):
+        bump_versions(db, owner_id, "leads")
+
+
+def _timeline_expiry_clause(policies: Dict[str, RetentionPolicy], now: datetime):
+    table = TimelineEvent.__table__
+    clauses = []
+    named = [event_type for event_type in policies if event_type != DEFAULT_POLICY]
+    for event_type in named:
+        policy = policies[event_type]
+        if policy.keep_days is not None:
+            clauses.append(and_(table.c.event_type == event_type, table.c.created_at < _cutoff(now, policy.keep_days)))
+    default = policies.get(DEFAULT_POLICY)
+    if default is not None and default.keep_days is not None:
+        clauses.append(and_(table.c.event_type.notin_(named), table.c.created_at < _cutoff(now, default.keep_days)))
+    return or_(*clauses) if clauses else None
+
+
+def _summary_description(rows: List[dict]) -> str:
+    changes = []
+    for row in rows:
+        _, _, detail = row["description"].partition(": ")
+        changes.extend(part for part in detail.split("; ") if part)
+    summary = f"Lead updated {len(rows)} times"
+    unique = list(dict.fromkeys(changes))
+    return f"{summary}: {'; '.join(unique)}" if unique else summary
+
+
+def _after_row(table, row: dict):
+    """Rows strictly after ``row`` in ``(lead_id, created_at, id)`` order."""
+    return or_(
+        table.c.lead_id > row["lead_id"],
+        and_(
+            table.c.lead_id == row["lead_id"],
+            or_(
+                table.c.created_at > row["created_at"],
+                and_(table.c.created_at == row["created_at"], table.c.id > row["id"]),
+            ),
+        ),
+    )
+
+
+def compact_lead_updates(
+    db: Session, *, cutoff: datetime, archive: NdjsonArchive, chunk_size: int = CHUNK_SIZE
+) -> Dict[str, int]:
+    """Replace each lead's ``lead_updated`` events of one day (before ``cutoff``) with one summary event.
+
+    Candidates are read ``chunk_size`` rows at a time in ``(lead_id, created_at, id)``
+    order; the lead and day a chunk ends in is read to its end so it still folds
+    into one summary. Deletes go out in id slices of ``chunk_size``.
+    """
+    table = TimelineEvent.__table__
+    candidates = and_(table.c.event_type == LEAD_UPDATED, table.c.created_at < cutoff)
+    order = (table.c.lead_id, table.c.created_at, table.c.id)
+
+    stats = {"groups": 0, "rows": 0}
+    last = None
+    while True:
+        query = select(table).where(candidates)
+        if last is not None:
+            query = query.where(_after_row(table, last))
+        rows = [dict(row) for row in db.execute(query.order_by(*order).limit(chunk_size)).mappings()]
+        if not rows:
+            db.commit()
+            return stats
+        last = rows[-1]
+        if len(rows) == chunk_size:
+            day_end = datetime.combine(_as_date(last["created_at"]) + timedelta(days=1), time.min, tzinfo=timezone.utc)
+            rows.extend(
+                dict(row)
+                for row in db.execute(
+                    select(table)
+                    .where(candidates, table.c.lead_id == last["lead_id"], table.c.created_at < day_end, _after_row(table, last))
+                    .order_by(*order)
+                ).mappings()
+            )
+            last = rows[-1]
+
+        groups = [
+            list(group)
+            for _, group in groupby(rows, key=lambda row: (row["lead_id"], _as_date(row["created_at"])))
+        ]
+        groups = [group for group in groups if len(group) > 1]
+        if not groups:
+            db.commit()
+            continue
+        folded = [row for group in groups for row in group]
+        archive.write(folded)
+        db.execute(
+            insert(table),
+            [
+                {
+                    "lead_id": group[-1]["lead_id"],
+                    "owner_id": group[-1]["owner_id"],
+                    "event_type": LEAD_UPDATED_DAILY,
+                    "description": _summary_description(group),
+                    "created_at": group[-1]["created_at"],
+                }
+                for group in groups
+            ],
+        )
+        ids = [row["id"] for row in folded]
+        for offset in range(0, len(ids), chunk_size):
+            db.execute(delete(table).where(table.c.id.in_(ids[offset:offset + chunk_size])))
+        _bump_owners(db, folded)
+        db.commit()
+        stats["groups"] += len(groups)
+        stats["rows"] += len(folded)
+
+
+def expire_rows(
+    db: Session,
+    table,
+    condition,
+    *,
+    archive: NdjsonArchive,
+    chunk_size: int = CHUNK_SIZE,
+    on_chunk: Optional[Callable[[Session, List[dict]], None]] = None,
+) -> int:
+    """Archive and delete rows matching ``condition`` in id order, one committed chunk at a time."""
+    removed = 0
+    last_id = 0
+    while True:
+        rows = [
+            dict(row)
+            for row in db.execute(
+                select(table).where(table.c.id > last_id, condition).order_by(table.c.id).limit(chunk_size)
+            ).mappings()
+        ]
+        if not rows:
+            db.commit()
+            return removed
+        archive.write(rows)
+        ids = [row["id"] for row in rows]
+        db.execute(delete(table).where(table.c.id.in_(ids)))
+        if on_chunk is not None:
+            on_chunk(db, rows)
+        db.commit()
+        removed += len(ids)
+        last_id = ids[-1]
+
+
+def run_retention(
+    db: Session,
+    *,
+    archive_dir: Path,
+    now: Optional[datetime] = None,
+    timeline_policies: Dict[str, RetentionPolicy] = TIMELINE_POLICIES,
+    audit_log_policy: RetentionPolicy = AUDIT_LOG_POLICY,
+    chunk_size: int = CHUNK_SIZE,
+) -> dict:
+    """Compact, archive and delete old timeline events and audit logs; returns per-table counts."""
+    now = now or datetime.now(timezone.utc)
+    stamp = now.strftime("%Y%m%dT%H%M%SZ")
+    timeline_archive = NdjsonArchive(archive_dir, "timeline_events", stamp)
+    audit_archive = NdjsonArchive(archive_dir, "audit_logs", stamp)
+    try:
+        compacted = {"groups": 0, "rows": 0}
+        lead_updates = timeline_policies.get(LEAD_UPDATED)
+        if lead_updates is not None and lead_updates.compact_after_days is not None:
+            compacted = compact_lead_updates(
+                db,
+                cutoff=_cutoff(now, lead_updates.compact_after_days),
+                archive=timeline_archive,
+                chunk_size=chunk_size,
+            )
+
+        timeline_removed = 0
+        expiry = _timeline_expiry_clause(timeline_policies, now)
+        if expiry is not None:
+            timeline_removed = expire_rows(
+                db, TimelineEvent.__table__, expiry, archive=timeline_archive, chunk_size=chunk_size, on_chunk=_bump_owners
+            )
+
+        audit_removed = 0
+        if audit_log_policy.keep_days is not None:
+            audit_table = AuditLog.__table__
+            audit_removed = expire_rows(
+                db,
+                audit_table,
+                audit_table.c.created_at < _cutoff(now, audit_log_policy.keep_days),
+                archive=audit_archive,
+                chunk_size=chunk_size,
+            )
+    finally:
+        timeline_archive.close()
+        audit_archive.close()
+
+    return {
+        "timeline_events": {
+            "compacted_groups": compacted["groups"],
+            "compacted_rows": compacted["rows"],
+            "deleted": timeline_removed,
+            "archive": str(timeline_archive.path) if timeline_archive.rows else None,
+        },
+        "audit_logs": {
+            "deleted": audit_removed,
+            "archive": str(audit_archive.path) if audit_archive.rows else None,
+        },
+    }
@@ -0,0 +1,131 @@
+"""Calendar windows and double-booking checks for sessions.
+
+Sessions carry derived ``starts_at`` / ``ends_at`` columns indexed as
+``(owner_id, starts_at, ends_at)``. A window query bounds ``starts_at`` on
+both sides (no session is longer than ``MAX_SESSION_MINUTES``), so it is a
+short range scan however many sessions an owner has.
+
+Overlaps are found with a sweep line: intervals are visited in start order
+while a min-heap holds the ones still running, ordered by end time. Each new
+interval overlaps exactly the intervals left in the heap after the finished
+ones are popped, so a batch of n intervals is checked in O(n log n + k) for
+k overlapping pairs.
+"""
+
+import heapq
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Hashable, Iterable, List, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.app.models.session import Session as SessionModel
+
+MAX_SESSION_MINUTES = 24 * 60
+CALENDAR_VIEWS = ("day", "week")
+INACTIVE_STATUSES = ("cancelled",)
+# Comma-separated ids of existing sessions a write overlaps.
+SCHEDULE_CONFLICTS_HEADER = "X-Schedule-Conflicts"
+
+Interval = Tuple[datetime, datetime, Hashable]
+
+
+def _naive_utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo is not None else value
+
+
+def find_overlaps(intervals: Iterable[Interval]) -> List[Tuple[Hashable, Hashable]]:
+    """Return every pair of keys whose half-open [start, end) intervals overlap."""
+    pairs = []
+    running: List[Tuple[datetime, int, Hashable]] = []
+    for order, (start, end, key) in enumerate(sorted(intervals, key=lambda item: (item[0], item[1]))):
+        while running and running[0][0] <= start:
+            heapq.heappop(running)
+        pairs.extend((other, key) for _, _, other in running)
+        heapq.heappush(running, (end, order, key))
+    return pairs
+
+
+def sessions_in_window(db: Session, owner_id: int, start: datetime, end: datetime, *, columns: Sequence = ()):
+    """Query for the owner's active sessions overlapping [start, end)."""
+    start, end = _naive_utc(start), _naive_utc(end)
+    entities = columns or (SessionModel,)
+    return db.query(*entities).filter(
+        SessionModel.owner_id == owner_id,
+        SessionModel.starts_at >= start - timedelta(minutes=MAX_SESSION_MINUTES),
+        SessionModel.starts_at < end,
+        SessionModel.ends_at > start,
+        SessionModel.attendance_status.notin_(INACTIVE_STATUSES),
+    )
+
+
+def find_schedule_conflicts(
+    db: Session,
+    owner_id: int,
+    intervals: Sequence[Tuple[datetime, datetime]],
+    *,
+    exclude_ids: Iterable[int] = (),
+) -> List[int]:
+    """Ids of existing sessions that overlap any of ``intervals`` (one window query plus a sweep)."""
+    if not intervals:
+        return []
+    intervals = [(_naive_utc(start), _naive_utc(end)) for start, end in intervals]
+    window_start = min(start for start, _ in intervals)
+    window_end = max(end for _, end in intervals)
+    excluded = set(exclude_ids)
+    columns = (SessionModel.id, SessionModel.starts_at, SessionModel.ends_at)
+    existing = [
+        (starts_at, ends_at, ("existing", session_id))
+        for session_id, starts_at, ends_at in sessions_in_window(db, owner_id, window_start, window_end, columns=columns)
+        if session_id not in excluded
+    ]
+    if not existing:
+        return []
+    proposed = [(start, end, ("new", index)) for index, (start, end) in enumerate(intervals)]
+    conflicts = set()
+    for first, second in find_overlaps(existing + proposed):
+        if first[0] != second[0]:
+            conflicts.add(first[1] if first[0] == "existing" else second[1])
+    return sorted(conflicts)
+
+
+def calendar_window(view: str, day: date) -> Tuple[date, date]:
+    """First day and the day after the last day of a day or Monday-based week view."""
+    if view == "week":
+        first = day - timedelta(days=day.weekday())
+        return first, first + timedelta(days=7)
+    return day, day + timedelta(days=1)
+
+
+def get_calendar(db: Session, *, owner_id: int, view: str, day: date) -> Dict:
+    """Sessions per day for a day/week view, plus the overlapping session pairs inside it."""
+    first, after_last = calendar_window(view, day)
+    start = datetime.combine(first, time.min)
+    end = datetime.combine(after_last, time.min)
+    sessions = (
+        sessions_in_window(db, owner_id, start, end)
+        .order_by(SessionModel.starts_at.asc(), SessionModel.id.asc())
+        .all()
+    )
+    days = {first + timedelta(days=offset): [] for offset in range((after_last - first).days)}
+    for session_obj in sessions:
+        # Sessions crossing midnight into the window are listed on the window's first day.
+        days[max(session_obj.starts_at.date(), first)].append(
+            {
+                "id": session_obj.id,
+                "student_id": session_obj.student_id,
+                "subject": session_obj.subject,
+                "starts_at": session_obj.starts_at.replace(tzinfo=timezone.utc),
+                "ends_at": session_obj.ends_at.replace(tzinfo=timezone.utc),
+                "duration_minutes": session_obj.duration_minutes,
+                "attendance_status": session_obj.attendance_status,
+                "session_type": session_obj.session_type,
+            }
+        )
+    overlaps = find_overlaps((s.starts_at, s.ends_at, s.id) for s in sessions)
+    return {
+        "view": view,
+        "start_date": first,
+        "end_date": after_last - timedelta(days=1),
+        "days": [{"date": day_key, "sessions": entries} for day_key, entries in days.items()],
+        "conflicts": sorted(tuple(sorted(pair)) for pair in overlaps),
+    }
@@ -7,6 +7,7 @@ from typing import Dict, List, Tuple
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from backend.app.db.snapshot import read_snapshot
 from backend.app.models.invoice import Invoice
 from backend.app.models.payment import Payment
 from backend.app.models.session import Session as SessionModel
@@ -31,13 +32,24 @@ def _week_start_end(iso_year: int, iso_week: int) -> Tuple[date, date]:
     return first_day, first_day + timedelta(days=6)
 
 
-def get_student_analytics(db: Session, *, owner_id: int, today: date | None = None) -> dict:
+@read_snapshot
+def get_student_analytics(
+    db: Session, *, owner_id: int, today: date | None = None, student_ids: List[int] | None = None
+) -> dict:
+    """Analytics for all of the owner's students, or only ``student_ids`` (reported in that order)."""
     as_of_date = today or datetime.now(timezone.utc).date()
-    students: List[Student] = db.query(Student).filter(Student.owner_id == owner_id).all()
+    query = db.query(Student).filter(Student.owner_id == owner_id)
+    if student_ids is not None:
+        query = query.filter(Student.id.in_(student_ids))
+    students: List[Student] = query.all()
+    if student_ids is not None:
+        position = {student_id: index for index, student_id in enumerate(student_ids)}
+        students.sort(key=lambda student: position[student.id])
     if not students:
-        return {"as_of": as_of_date.isoformat(), "students": []}
+        return {"as_of": as_of_date.isoformat(), "total": 0, "students": []}
 
     student_ids = [s.id for s in students]
+
     sessions: List[SessionModel] = db.query(SessionModel).filter(SessionModel.student_id.in_(student_ids)).all()
     invoices: List[Invoice] = (
         db.query(Invoice).filter(Invoice.student_id.in_(student_ids), Invoice.owner_id == owner_id).all()
@@ -162,4 +174,4 @@ def get_student_analytics(db: Session, *, owner_id: int, today: date | None = No
             }
         )
 
-    return {"as_of": as_of_date.isoformat(), "students": report_students}
+    return {"as_of": as_of_date.isoformat(), "total": len(report_students), "students": report_students}
@@ -0,0 +1,374 @@
+"""Per-student KPI snapshots for the student dashboard list.
+
+Each student has one ``student_kpis`` row with the same figures
+``get_student_analytics`` reports, stamped with the student's data version it
+was computed from (read in the same snapshot as the figures). Session, invoice
+and payment writes bump that version for the students they touch, so a row is
+fresh while its student's version and its ISO week (the rolling eight-week
+figures move with the calendar) are current. No write has to touch the table,
+and a rebuild racing a write can only leave a row that is already marked stale.
+
+Readers never write: when every row is fresh they sort, filter and page through
+the table with one indexed SELECT. Otherwise the same SELECT pages through the
+fresh rows and only the stale students are computed for that request and merged
+in. ``refresh_student_kpis`` rebuilds just the stale rows; the dashboard
+endpoints run it as a background task after responding, and the student
+analytics job runs it before listing.
+"""
+
+import logging
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, func, insert, not_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.app.core.money import cents_to_decimal, format_cents, to_cents
+from backend.app.core.pagination import DEFAULT_PAGE_SIZE
+from backend.app.core.time import date_range_filters, utc_now
+from backend.app.db.session import SessionLocal
+from backend.app.db.snapshot import read_snapshot, snapshot_session
+from backend.app.models.data_version import StudentDataVersion
+from backend.app.models.invoice import Invoice
+from backend.app.models.payment import Payment
+from backend.app.models.session import Session as SessionModel
+from backend.app.models.student import Student
+from backend.app.models.student_kpi import StudentKpi
+from backend.app.services.student_analytics_reporting import _last_n_iso_weeks, _week_start_end, get_student_analytics
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+TREND_WEEKS = 8
+
+DASHBOARD_SORT_FIELDS = {
+    "student_id": StudentKpi.student_id,
+    "student_display_name": Student.student_name,
+    "total_sessions": StudentKpi.total_sessions,
+    "total_hours": StudentKpi.total_minutes,
+    "total_invoiced": StudentKpi.total_invoiced,
+    "total_paid": StudentKpi.total_paid,
+    "total_outstanding": StudentKpi.total_outstanding,
+    "first_session_date": StudentKpi.first_session_date,
+    "last_session_date": StudentKpi.last_session_date,
+    "consistency_score": StudentKpi.consistency_score,
+    "streak_weeks": StudentKpi.streak_weeks,
+}
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _hours(minutes: int) -> Decimal:
+    return (Decimal(minutes) / Decimal("60")).quantize(Decimal("0.01"))
+
+
+def _compute_snapshots(db: Session, owner_id: int, versions: Dict[int, int], today: date) -> List[dict]:
+    """KPI rows as of ``today`` for the students in ``versions`` (student id -> data version), matching ``get_student_analytics``."""
+    student_ids = list(versions)
+    week_keys = _last_n_iso_weeks(today, TREND_WEEKS)
+    window_start = _week_start_end(*week_keys[0])[0]
+    window_end = _week_start_end(*week_keys[-1])[1]
+
+    totals = {
+        student_id: (count, int(minutes or 0), first, last, to_cents(nominal))
+        for student_id, count, minutes, first, last, nominal in db.query(
+            SessionModel.student_id,
+            func.count(SessionModel.id),
+            func.sum(SessionModel.duration_minutes),
+            func.min(SessionModel.session_date),
+            func.max(SessionModel.session_date),
+            func.coalesce(func.sum(SessionModel.rate_per_hour), 0),
+        )
+        .filter(SessionModel.owner_id == owner_id, SessionModel.student_id.in_(student_ids))
+        .group_by(SessionModel.student_id)
+    }
+
+    weekly: Dict[int, Dict[tuple, list]] = {}
+    recent = db.query(SessionModel.student_id, SessionModel.session_date, SessionModel.duration_minutes).filter(
+        SessionModel.owner_id == owner_id,
+        SessionModel.student_id.in_(student_ids),
+        *date_range_filters(SessionModel.session_date, window_start, window_end),
+    )
+    for student_id, session_date, minutes in recent:
+        year, week, _ = session_date.date().isocalendar()
+        bucket = weekly.setdefault(student_id, {}).setdefault((year, week), [0, 0])
+        bucket[0] += 1
+        bucket[1] += minutes or 0
+
+    paid = {
+        student_id: to_cents(total)
+        for student_id, total in db.query(Invoice.student_id, func.coalesce(func.sum(Payment.amount), 0))
+        .join(Invoice, Payment.invoice_id == Invoice.id)
+        .filter(
+            Payment.owner_id == owner_id,
+            Invoice.owner_id == owner_id,
+            Invoice.student_id.in_(student_ids),
+            Invoice.status != "void",
+        )
+        .group_by(Invoice.student_id)
+    }
+
+    now = utc_now()
+    snapshots = []
+    for student_id in student_ids:
+        count, minutes, first, last, invoiced = totals.get(student_id, (0, 0, None, None, 0))
+        weeks = [weekly.get(student_id, {}).get(key, (0, 0)) for key in week_keys]
+        streak = 0
+        for sessions_in_week, _ in reversed(weeks):
+            if not sessions_in_week:
+                break
+            streak += 1
+        student_paid = paid.get(student_id, 0)
+        snapshots.append(
+            {
+                "student_id": student_id,
+                "owner_id": owner_id,
+                "total_sessions": count,
+                "total_minutes": minutes,
+                "total_invoiced": cents_to_decimal(invoiced),
+                "total_paid": cents_to_decimal(student_paid),
+                "total_outstanding": cents_to_decimal(max(invoiced - student_paid, 0)),
+                "first_session_date": first.date() if first else None,
+                "last_session_date": last.date() if last else None,
+                "sessions_last_8_weeks": sum(sessions_in_week for sessions_in_week, _ in weeks),
+                "hours_last_8_weeks": sum((_hours(week_minutes) for _, week_minutes in weeks), Decimal("0.00")),
+                "consistency_score": round(100 * sum(1 for sessions_in_week, _ in weeks if sessions_in_week) / TREND_WEEKS),
+                "streak_weeks": streak,
+                "as_of_week": week_start(today),
+                "data_version": versions[student_id],
+                "refreshed_at": now,
+            }
+        )
+    return snapshots
+
+
+def _is_fresh(today: date):
+    """Condition on a ``student_kpis`` row outer-joined to its ``student_data_versions`` row."""
+    return and_(
+        StudentKpi.as_of_week == week_start(today),
+        StudentKpi.data_version == func.coalesce(StudentDataVersion.version, 0),
+    )
+
+
+def _stale_students(db: Session, owner_id: int, today: date):
+    """Query of ``(student_id, data_version)`` for the owner's students whose snapshot is missing or not fresh."""
+    return (
+        db.query(Student.id, func.coalesce(StudentDataVersion.version, 0))
+        .outerjoin(StudentKpi, StudentKpi.student_id == Student.id)
+        .outerjoin(StudentDataVersion, StudentDataVersion.student_id == Student.id)
+        .filter(Student.owner_id == owner_id, or_(StudentKpi.student_id.is_(None), not_(_is_fresh(today))))
+        .order_by(Student.id)
+    )
+
+
+def refresh_student_kpis(db: Session, owner_id: int, today: date) -> int:
+    """Rebuild the owner's stale snapshots; returns how many were written."""
+    with snapshot_session(db) as snapshot:
+        stale = _stale_students(snapshot, owner_id, today).all()
+        snapshots = [
+            _compute_snapshots(snapshot, owner_id, dict(stale[start : start + CHUNK_SIZE]), today)
+            for start in range(0, len(stale), CHUNK_SIZE)
+        ]
+    if not stale:
+        return 0
+    try:
+        for chunk in snapshots:
+            db.execute(delete(StudentKpi).where(StudentKpi.student_id.in_([row["student_id"] for row in chunk])))
+            db.execute(insert(StudentKpi), chunk)
+        db.commit()
+    except IntegrityError:
+        # A concurrent refresh rebuilt the same students first; its rows are just as fresh.
+        db.rollback()
+    return len(stale)
+
+
+def refresh_student_kpis_task(owner_id: int, today: date) -> None:
+    """Background-task entry point: ``refresh_student_kpis`` on a session of its own."""
+    db = SessionLocal()
+    try:
+        refresh_student_kpis(db, owner_id, today)
+    except Exception:  # noqa: BLE001 - the next read falls back to live figures
+        logger.exception("Refreshing student KPIs for owner %s failed", owner_id)
+    finally:
+        db.close()
+
+
+def serialize_dashboard_row(kpi: StudentKpi, student_name: str, parent_name: str | None) -> dict:
+    return {
+        "student_id": kpi.student_id,
+        "student_display_name": student_name,
+        "parent_display_name": parent_name,
+        "total_sessions_all_time": kpi.total_sessions,
+        "total_hours_all_time": str(_hours(kpi.total_minutes)),
+        "consistency_score_0_100": kpi.consistency_score,
+        "current_session_streak_weeks": kpi.streak_weeks,
+        "total_invoiced_all_time": format_cents(to_cents(kpi.total_invoiced)),
+        "total_paid_all_time": format_cents(to_cents(kpi.total_paid)),
+        "total_outstanding_all_time": format_cents(to_cents(kpi.total_outstanding)),
+    }
+
+
+def _page_merging_stale(
+    db: Session,
+    fresh_query,
+    order_by_clause: list,
+    owner_id: int,
+    today: date,
+    stale: Dict[int, int],
+    *,
+    sort_by: str,
+    descending: bool,
+    skip: int,
+    limit: int,
+    status: Optional[str],
+    min_outstanding: Optional[Decimal],
+    min_consistency: Optional[int],
+    max_consistency: Optional[int],
+    last_session_before: Optional[date],
+) -> Tuple[List, int]:
+    """``page_student_kpis`` when some snapshots are stale.
+
+    The page's fresh rows still come from the snapshot SELECT (at most
+    ``skip + limit`` of them); only the ``stale`` students (id -> data version)
+    are computed for this read and merged in.
+    """
+    fresh = fresh_query.order_by(*order_by_clause).limit(skip + limit).all()
+    matches = [(kpi, student_name, parent_name) for kpi, student_name, parent_name, _ in fresh]
+    total = fresh[0].total if fresh else 0
+
+    stale_ids = list(stale)
+    for start in range(0, len(stale_ids), CHUNK_SIZE):
+        chunk = stale_ids[start : start + CHUNK_SIZE]
+        students = db.query(Student.id, Student.student_name, Student.parent_name, Student.status).filter(
+            Student.id.in_(chunk)
+        )
+        kpis = {
+            row["student_id"]: StudentKpi(**row)
+            for row in _compute_snapshots(db, owner_id, {student_id: stale[student_id] for student_id in chunk}, today)
+        }
+        for student in students:
+            kpi = kpis[student.id]
+            if status is not None and student.status != status:
+                continue
+            if min_outstanding is not None and kpi.total_outstanding < min_outstanding:
+                continue
+            if min_consistency is not None and kpi.consistency_score < min_consistency:
+                continue
+            if max_consistency is not None and kpi.consistency_score > max_consistency:
+                continue
+            if last_session_before is not None and kpi.last_session_date is not None and kpi.last_session_date >= last_session_before:
+                continue
+            matches.append((kpi, student.student_name, student.parent_name))
+            total += 1
+
+    def sort_key(match):
+        kpi, student_name, _ = match
+        value = student_name if sort_by == "student_display_name" else getattr(kpi, DASHBOARD_SORT_FIELDS[sort_by].key)
+        # NULLs sort first ascending and last descending, as in SQLite.
+        return ((0,) if value is None else (1, value)), kpi.student_id
+
+    matches.sort(key=sort_key, reverse=descending)
+    return [(kpi, student_name, parent_name, total) for kpi, student_name, parent_name in matches[skip : skip + limit]], total
+
+
+@read_snapshot
+def page_student_kpis(
+    db: Session,
+    *,
+    owner_id: int,
+    today: date,
+    sort_by: str = "student_id",
+    sort_order: str = "asc",
+    skip: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+    status: Optional[str] = None,
+    min_outstanding: Optional[Decimal] = None,
+    min_consistency: Optional[int] = None,
+    max_consistency: Optional[int] = None,
+    last_session_before: Optional[date] = None,
+) -> Tuple[List, int]:
+    """Return ``(rows, total)``: one sorted, filtered page of ``(StudentKpi, student_name, parent_name, total)``.
+
+    ``last_session_before`` also matches students who have never had a session.
+    Reads only; stale snapshots are computed for the read, not rebuilt.
+    """
+    if sort_by not in DASHBOARD_SORT_FIELDS:
+        raise HTTPException(status_code=400, detail="Invalid sort_by value")
+    sort_order_normalized = (sort_order or "asc").lower()
+    if sort_order_normalized not in {"asc", "desc"}:
+        raise HTTPException(status_code=400, detail="Invalid sort_order value")
+    sort_column = DASHBOARD_SORT_FIELDS[sort_by]
+    if sort_order_normalized == "asc":
+        order_by_clause = [sort_column.asc(), StudentKpi.student_id.asc()]
+    else:
+        order_by_clause = [sort_column.desc(), StudentKpi.student_id.desc()]
+
+    filters = [StudentKpi.owner_id == owner_id]
+    if status is not None:
+        filters.append(Student.status == status)
+    if min_outstanding is not None:
+        filters.append(StudentKpi.total_outstanding >= min_outstanding)
+    if min_consistency is not None:
+        filters.append(StudentKpi.consistency_score >= min_consistency)
+    if max_consistency is not None:
+        filters.append(StudentKpi.consistency_score <= max_consistency)
+    if last_session_before is not None:
+        filters.append(or_(StudentKpi.last_session_date < last_session_before, StudentKpi.last_session_date.is_(None)))
+
+    query = (
+        db.query(StudentKpi, Student.student_name, Student.parent_name, func.count().over().label("total"))
+        .join(Student, Student.id == StudentKpi.student_id)
+        .filter(*filters)
+    )
+    stale = dict(_stale_students(db, owner_id, today).all())
+    if stale:
+        fresh_query = query.outerjoin(StudentDataVersion, StudentDataVersion.student_id == StudentKpi.student_id).filter(
+            _is_fresh(today)
+        )
+        return _page_merging_stale(
+            db,
+            fresh_query,
+            order_by_clause,
+            owner_id,
+            today,
+            stale,
+            sort_by=sort_by,
+            descending=sort_order_normalized == "desc",
+            skip=skip,
+            limit=limit,
+            status=status,
+            min_outstanding=min_outstanding,
+            min_consistency=min_consistency,
+            max_consistency=max_consistency,
+            last_session_before=last_session_before,
+        )
+    rows = query.order_by(*order_by_clause).offset(skip).limit(limit).all()
+    if rows:
+        return rows, rows[0].total
+    # Past the last page the window count has no row to ride on.
+    total = db.query(func.count(StudentKpi.student_id)).join(Student, Student.id == StudentKpi.student_id).filter(*filters).scalar()
+    return rows, total
+
+
+def list_student_kpis(db: Session, *, owner_id: int, today: date, **params) -> dict:
+    """One page of dashboard rows; ``params`` are the sort, paging and filter arguments of ``page_student_kpis``."""
+    rows, total = page_student_kpis(db, owner_id=owner_id, today=today, **params)
+    return {
+        "as_of": today.isoformat(),
+        "total": total,
+        "students": [serialize_dashboard_row(kpi, name, parent) for kpi, name, parent, _ in rows],
+    }
+
+
+@read_snapshot
+def list_student_analytics(db: Session, *, owner_id: int, today: date, **params) -> dict:
+    """Full analytics for one page of students picked, sorted and filtered on the KPI snapshots."""
+    rows, total = page_student_kpis(db, owner_id=owner_id, today=today, **params)
+    student_ids = [kpi.student_id for kpi, _, _, _ in rows]
+    students = get_student_analytics(db, owner_id=owner_id, today=today, student_ids=student_ids)["students"] if student_ids else []
+    return {"as_of": today.isoformat(), "total": total, "students": students}
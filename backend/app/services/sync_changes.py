@@ -0,0 +1,97 @@
+"""Delta sync: rows created, updated or deleted for an owner since a token.
+
+Changes are found through each entity's ``updated_at`` column; deletes are
+recorded as ``sync_tombstones`` rows by a flush hook. Tokens are opaque
+strings encoding the server time (UTC microseconds) at which a sync ran.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from backend.app.models.invoice import Invoice
+from backend.app.models.lead import Lead
+from backend.app.models.session import Session as SessionModel
+from backend.app.models.student import Student
+from backend.app.models.sync_tombstone import SyncTombstone
+
+SYNC_ENTITIES = {
+    "leads": Lead,
+    "students": Student,
+    "sessions": SessionModel,
+    "invoices": Invoice,
+}
+ENTITY_BY_MODEL = {model: entity for entity, model in SYNC_ENTITIES.items()}
+
+# Rows are stamped with updated_at at flush time but only become visible at
+# commit, so each sync re-reads a short window before the token. Clients upsert
+# by id, so repeated rows are harmless.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def encode_sync_token(moment: datetime) -> str:
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def decode_sync_token(token: str) -> datetime:
+    """Return the UTC datetime for a token; raises ValueError for malformed tokens."""
+    micros = int(token)
+    if micros < 0:
+        raise ValueError("Invalid sync token")
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=micros)
+
+
+def _bound_for(column, moment: datetime) -> datetime:
+    # Naive DateTime columns store UTC wall time; compare like with like.
+    return moment if getattr(column.type, "timezone", False) else moment.replace(tzinfo=None)
+
+
+def _is_live(entity: str, row) -> bool:
+    # Soft-deleted students disappear from /students/, so sync reports them as deleted.
+    if entity == "students":
+        return bool(row.is_active) and not row.is_anonymized
+    return True
+
+
+def get_changes_since(db: Session, *, owner_id: int, since: Optional[datetime], now: datetime | None = None) -> Dict:
+    """Return updated rows and deleted ids per entity, plus the token for the next call."""
+    now = now or datetime.now(timezone.utc)
+    window_start = since - SYNC_OVERLAP if since is not None else None
+
+    changes: Dict[str, dict] = {}
+    for entity, model in SYNC_ENTITIES.items():
+        query = db.query(model).filter(model.owner_id == owner_id)
+        if window_start is not None:
+            query = query.filter(model.updated_at > _bound_for(model.updated_at, window_start))
+        updated, deleted = [], []
+        for row in query.order_by(model.updated_at.asc(), model.id.asc()):
+            if _is_live(entity, row):
+                updated.append(row)
+            elif since is not None:
+                deleted.append(row.id)
+        changes[entity] = {"updated": updated, "deleted": deleted}
+
+    if window_start is not None:
+        tombstones = (
+            db.query(SyncTombstone.entity, SyncTombstone.entity_id)
+            .filter(SyncTombstone.owner_id == owner_id, SyncTombstone.deleted_at > window_start)
+            .all()
+        )
+        for entity, entity_id in tombstones:
+            if entity in changes and entity_id not in changes[entity]["deleted"]:
+                changes[entity]["deleted"].append(entity_id)
+
+    return {"token": encode_sync_token(now), **changes}
+
+
+@event.listens_for(Session, "after_flush")
+def _record_tombstones_after_flush(session: Session, flush_context) -> None:
+    rows = [
+        {"owner_id": obj.owner_id, "entity": ENTITY_BY_MODEL[type(obj)], "entity_id": obj.id}
+        for obj in session.deleted
+        if type(obj) in ENTITY_BY_MODEL and obj.owner_id is not None
+    ]
+    if rows:
+        session.connection().execute(insert(SyncTombstone.__table__), rows)
@@ -3,8 +3,24 @@
 from backend.app.models.timeline import TimelineEvent
 
 
-def log_event(db, lead_id: int, owner_id: int, event_type: str, description: str) -> TimelineEvent:
-    event = TimelineEvent(lead_id=lead_id, owner_id=owner_id, event_type=event_type, description=description)
+def log_event(
+    db,
+    lead_id: int,
+    owner_id: int,
+    event_type: str,
+    description: str,
+    *,
+    from_status: str | None = None,
+    to_status: str | None = None,
+) -> TimelineEvent:
+    event = TimelineEvent(
+        lead_id=lead_id,
+        owner_id=owner_id,
+        event_type=event_type,
+        description=description,
+        from_status=from_status,
+        to_status=to_status,
+    )
     db.add(event)
     db.commit()
     db.refresh(event)
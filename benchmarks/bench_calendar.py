@@ -0,0 +1,136 @@
+"""Benchmark the calendar week view and conflict checks at 100k sessions for one owner.
+
+Window: loading every session of the owner and filtering on the combined
+date/start time in Python vs ``get_calendar`` on the
+``(owner_id, starts_at, ends_at)`` index.
+
+Overlaps: the sweep line in ``find_overlaps`` vs comparing every pair.
+
+Usage: python -m benchmarks.bench_calendar [sessions] [sample]
+"""
+
+import random
+import sys
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.db.base import Base
+from backend.app.models.session import Session as SessionModel, session_bounds
+from backend.app.models.student import Student
+from backend.app.models.user import User
+from backend.app.services.schedule import calendar_window, find_overlaps, get_calendar
+
+FIRST_DAY = date(2020, 1, 6)
+WEEK_OF = date(2024, 3, 13)
+
+
+def _seed(db, sessions: int) -> int:
+    owner = User(email="bench@example.com", hashed_password="x")
+    db.add(owner)
+    db.flush()
+    student = Student(owner_id=owner.id, parent_name="P", student_name="S")
+    db.add(student)
+    db.flush()
+    rng = random.Random(41)
+    rows = []
+    for i in range(sessions):
+        # Roughly 30 sessions a day over ~9 years, on the quarter hour between 08:00 and 20:45.
+        day = FIRST_DAY + timedelta(days=i // 30)
+        start = dt_time(rng.randint(8, 20), rng.choice((0, 15, 30, 45)))
+        duration = rng.choice((30, 45, 60))
+        starts_at, ends_at = session_bounds(day, start, duration)
+        rows.append(
+            {
+                "owner_id": owner.id,
+                "student_id": student.id,
+                "subject": "Math",
+                "duration_minutes": duration,
+                "session_date": datetime.combine(day, dt_time.min),
+                "start_time": start,
+                "attendance_status": "cancelled" if rng.random() < 0.05 else "scheduled",
+                "starts_at": starts_at,
+                "ends_at": ends_at,
+            }
+        )
+    db.execute(insert(SessionModel.__table__), rows)
+    db.commit()
+    return owner.id
+
+
+def load_and_filter(db, owner_id: int) -> list:
+    first, after_last = calendar_window("week", WEEK_OF)
+    start, end = datetime.combine(first, dt_time.min), datetime.combine(after_last, dt_time.min)
+    matches = []
+    for session_obj in db.query(SessionModel).filter(SessionModel.owner_id == owner_id):
+        if session_obj.attendance_status == "cancelled":
+            continue
+        starts_at, ends_at = session_bounds(session_obj.session_date, session_obj.start_time, session_obj.duration_minutes)
+        if starts_at < end and ends_at > start:
+            matches.append((starts_at, session_obj.id))
+    return [session_id for _, session_id in sorted(matches)]
+
+
+def indexed_window(db, owner_id: int) -> list:
+    view = get_calendar(db, owner_id=owner_id, view="week", day=WEEK_OF)
+    return [entry["id"] for day in view["days"] for entry in day["sessions"]]
+
+
+def pairwise(intervals) -> set:
+    return {
+        frozenset((a[2], b[2]))
+        for i, a in enumerate(intervals)
+        for b in intervals[i + 1:]
+        if a[0] < b[1] and b[0] < a[1]
+    }
+
+
+def sweep(intervals) -> set:
+    return {frozenset(pair) for pair in find_overlaps(intervals)}
+
+
+def _best_of(fn, *args, repeat: int = 3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(sessions: int = 100_000, sample: int = 3_000) -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    owner_id = _seed(db, sessions)
+
+    scan_elapsed, scan_ids = _best_of(load_and_filter, db, owner_id, repeat=1)
+    db.expunge_all()
+    index_elapsed, index_ids = _best_of(indexed_window, db, owner_id)
+    assert scan_ids == index_ids
+
+    intervals = [
+        (starts_at, ends_at, session_id)
+        for session_id, starts_at, ends_at in db.query(SessionModel.id, SessionModel.starts_at, SessionModel.ends_at)
+        .order_by(SessionModel.id)
+        .limit(sample)
+    ]
+    pairwise_elapsed, pairwise_pairs = _best_of(pairwise, intervals, repeat=1)
+    sweep_elapsed, sweep_pairs = _best_of(sweep, intervals)
+    assert pairwise_pairs == sweep_pairs
+
+    print(f"sessions={sessions} week_sessions={len(index_ids)} sample={sample} overlapping_pairs={len(sweep_pairs)}")
+    print(f"load + filter   {scan_elapsed * 1000:9.1f} ms")
+    print(f"indexed window  {index_elapsed * 1000:9.1f} ms  ({scan_elapsed / index_elapsed:.0f}x)")
+    print(f"pairwise        {pairwise_elapsed * 1000:9.1f} ms")
+    print(f"sweep line      {sweep_elapsed * 1000:9.1f} ms  ({pairwise_elapsed / sweep_elapsed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3_000,
+    )
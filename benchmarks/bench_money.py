@@ -0,0 +1,78 @@
+"""Benchmark Decimal vs integer-cents aggregation for a 100k-row owner.
+
+Usage: python -m benchmarks.bench_money [rows]
+"""
+
+import random
+import sys
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+from backend.app.core.money import format_cents, to_cents
+
+BUCKETS = ("current", "days_1_30", "days_31_60", "days_61_90", "days_90_plus")
+
+
+def _rows(count: int):
+    rng = random.Random(42)
+    return [
+        SimpleNamespace(
+            student_id=rng.randrange(500),
+            bucket=BUCKETS[rng.randrange(len(BUCKETS))],
+            balance_due=Decimal(rng.randrange(1, 50_000)).scaleb(-2),
+        )
+        for _ in range(count)
+    ]
+
+
+def legacy_decimal(rows) -> dict:
+    totals = {key: Decimal("0.00") for key in BUCKETS}
+    per_student = {}
+    for row in rows:
+        balance = Decimal(str(row.balance_due or 0)).quantize(Decimal("0.01"))
+        totals[row.bucket] += balance
+        per_student.setdefault(row.student_id, {key: Decimal("0.00") for key in BUCKETS})[row.bucket] += balance
+    return {
+        "totals": {k: str(v.quantize(Decimal("0.01"))) for k, v in totals.items()},
+        "students": {
+            sid: {k: str(v.quantize(Decimal("0.01"))) for k, v in buckets.items()} for sid, buckets in per_student.items()
+        },
+    }
+
+
+def integer_cents(rows) -> dict:
+    totals = {key: 0 for key in BUCKETS}
+    per_student = {}
+    for row in rows:
+        balance = to_cents(row.balance_due)
+        totals[row.bucket] += balance
+        per_student.setdefault(row.student_id, {key: 0 for key in BUCKETS})[row.bucket] += balance
+    return {
+        "totals": {k: format_cents(v) for k, v in totals.items()},
+        "students": {sid: {k: format_cents(v) for k, v in buckets.items()} for sid, buckets in per_student.items()},
+    }
+
+
+def _best_of(fn, rows, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(count: int = 100_000) -> None:
+    rows = _rows(count)
+    assert legacy_decimal(rows) == integer_cents(rows)
+    legacy = _best_of(legacy_decimal, rows)
+    cents = _best_of(integer_cents, rows)
+    print(f"rows={count}")
+    print(f"decimal      {legacy * 1000:8.1f} ms")
+    print(f"int cents    {cents * 1000:8.1f} ms")
+    print(f"speedup      {legacy / cents:8.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
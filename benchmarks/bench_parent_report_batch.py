@@ -0,0 +1,104 @@
+"""Benchmark roster-wide parent report export: per-student loop vs batch ZIP.
+
+The per-student loop calls ``get_parent_report_export_bytes`` once per student,
+which recomputes owner-wide analytics every time. Timing all of it at 1,000
+students takes minutes, so the loop is timed over a sample of students and
+extrapolated; the batch path is timed in full.
+
+Usage: python -m benchmarks.bench_parent_report_batch [students] [loop_sample]
+"""
+
+import io
+import sys
+import time
+import zipfile
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.db.base import Base
+from backend.app.models.invoice import Invoice
+from backend.app.models.session import Session as SessionModel
+from backend.app.models.student import Student
+from backend.app.models.user import User
+from backend.app.services.parent_report_batch_service import iter_parent_reports_zip
+from backend.app.services.parent_report_export_service import get_parent_report_export_bytes
+
+TODAY = date(2030, 6, 15)
+START = date(2030, 5, 1)
+SESSIONS_PER_STUDENT = 12
+
+
+def _seed(db, students: int) -> int:
+    owner = User(email="bench@example.com", hashed_password="x")
+    db.add(owner)
+    db.flush()
+    roster = [Student(owner_id=owner.id, parent_name=f"Parent {i}", student_name=f"Student {i}") for i in range(students)]
+    db.add_all(roster)
+    db.flush()
+    base = datetime(2030, 3, 1, 10, tzinfo=timezone.utc)
+    for i, student in enumerate(roster):
+        db.add_all(
+            SessionModel(
+                owner_id=owner.id,
+                student_id=student.id,
+                subject="Math",
+                duration_minutes=60,
+                session_date=base + timedelta(days=7 * k + i % 7),
+                start_time=dt_time(10, 0),
+                rate_per_hour=60,
+                cost_total=60,
+            )
+            for k in range(SESSIONS_PER_STUDENT)
+        )
+        db.add(Invoice(owner_id=owner.id, student_id=student.id, status="sent", total_amount=120, amount_paid=0, balance_due=120))
+    db.commit()
+    return owner.id
+
+
+def per_student_loop(db, owner_id: int, student_ids) -> dict:
+    return {
+        f"parent_report_{sid}.pdf": get_parent_report_export_bytes(
+            db, owner_id=owner_id, student_id=sid, today=TODAY, start_date=START, end_date=None
+        )
+        for sid in student_ids
+    }
+
+
+def batch_zip(db, owner_id: int) -> bytes:
+    return b"".join(iter_parent_reports_zip(db, owner_id=owner_id, today=TODAY, start_date=START, end_date=None))
+
+
+def main(students: int = 1_000, loop_sample: int = 50) -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    owner_id = _seed(db, students)
+    student_ids = [sid for (sid,) in db.query(Student.id).order_by(Student.id)]
+    sample = student_ids[: min(loop_sample, students)]
+
+    started = time.perf_counter()
+    loop_files = per_student_loop(db, owner_id, sample)
+    loop_elapsed = (time.perf_counter() - started) * len(student_ids) / len(sample)
+
+    started = time.perf_counter()
+    archive = batch_zip(db, owner_id)
+    batch_elapsed = time.perf_counter() - started
+
+    with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+        assert len(zf.namelist()) == len(student_ids)
+        assert all(zf.read(name) == content for name, content in loop_files.items())
+
+    print(f"students={students} sessions={students * SESSIONS_PER_STUDENT} loop_sample={len(sample)}")
+    print(f"per-student loop {loop_elapsed:8.2f} s (extrapolated)")
+    print(f"batch zip        {batch_elapsed:8.2f} s ({len(archive) / 1024:.0f} KiB)")
+    print(f"speedup          {loop_elapsed / batch_elapsed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+    )
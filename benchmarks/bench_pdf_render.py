@@ -0,0 +1,86 @@
+"""Benchmark parent report PDF rendering throughput.
+
+Renders synthetic reports with a template built per document vs the shared
+per-process template, and reports documents/s and pages/s.
+
+Usage: python -m benchmarks.bench_pdf_render [reports]
+"""
+
+import sys
+import time
+
+from backend.app.services.parent_report_export_service import (
+    get_parent_report_template,
+    parent_report_pdf_blocks,
+    render_parent_report_pdf,
+)
+from backend.app.services.parent_report_narrative_service import add_parent_report_narrative
+from backend.app.services.pdf_writer import PdfTemplate
+
+
+def _report(i: int) -> dict:
+    weeks = [
+        {"year": 2030, "iso_week": w, "session_count": w % 3, "hours": f"{w % 3}.00"}
+        for w in range(15, 23)
+    ]
+    return add_parent_report_narrative(
+        {
+            "as_of": "2030-06-15",
+            "period": {"start_date": "2030-05-01", "end_date": None},
+            "student": {"id": i, "display_name": f"Student {i}", "parent_display_name": f"Parent {i}"},
+            "progress_summary": {
+                "total_sessions_all_time": 40,
+                "total_hours_all_time": "40.00",
+                "sessions_in_period": 6,
+                "hours_in_period": "6.00",
+                "consistency_score_0_100": 75,
+                "current_session_streak_weeks": 2,
+                "last_session_date": "2030-06-10",
+                "first_session_date": "2029-09-01",
+            },
+            "billing_summary": {
+                "total_invoiced_all_time": "2400.00",
+                "total_paid_all_time": "1200.00",
+                "total_outstanding_all_time": "1200.00",
+                "nominal_rate_per_hour": "60.00",
+                "billing_vs_usage_ratio": "60.00",
+            },
+            "weekly_activity_last_8_weeks": weeks,
+        }
+    )
+
+
+def template_per_document(reports) -> list:
+    return [b"".join(PdfTemplate(footer="Mindfull Learning - Parent Report").iter_pdf(parent_report_pdf_blocks(r))) for r in reports]
+
+
+def shared_template(reports) -> list:
+    return [b"".join(render_parent_report_pdf(r)) for r in reports]
+
+
+def _best_of(fn, reports, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(reports)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(count: int = 1_000) -> None:
+    reports = [_report(i) for i in range(count)]
+    get_parent_report_template()
+    documents = shared_template(reports)
+    assert documents == template_per_document(reports)
+    pages = sum(doc.count(b"/Type /Page /Parent") for doc in documents)
+    megabytes = sum(len(doc) for doc in documents) / 1_000_000
+
+    per_doc = _best_of(template_per_document, reports)
+    shared = _best_of(shared_template, reports)
+    print(f"reports={count} pages={pages} size={megabytes:.1f} MB")
+    print(f"template per document {per_doc * 1000:8.1f} ms  {count / per_doc:8.0f} docs/s")
+    print(f"shared template       {shared * 1000:8.1f} ms  {count / shared:8.0f} docs/s  {pages / shared:8.0f} pages/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000)
@@ -0,0 +1,137 @@
+"""Benchmark "what is due today" and due-reminder firing at 100k reminders.
+
+Listing: the old per-lead loop (one ``/reminders/leads/{id}/reminders`` query
+per lead, filtered in Python) vs ``get_due_reminders`` on the
+``(owner_id, completed, due_at)`` index.
+
+Firing: the scheduler's min-heap vs re-scanning every pending reminder on each
+tick.
+
+Usage: python -m benchmarks.bench_reminders_due [reminders] [leads]
+"""
+
+import heapq
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.db.base import Base
+from backend.app.models.lead import Lead
+from backend.app.models.reminder import Reminder
+from backend.app.models.user import User
+from backend.app.services.reminders import end_of_day, get_due_reminders
+
+NOW = datetime(2030, 6, 15, 12, tzinfo=timezone.utc)
+TICKS = 500
+
+
+def _seed(db, reminders: int, leads: int) -> int:
+    owner = User(email="bench@example.com", hashed_password="x")
+    other = User(email="other@example.com", hashed_password="x")
+    db.add_all([owner, other])
+    db.flush()
+    lead_rows = [{"owner_id": owner.id if i % 2 == 0 else other.id, "parent_name": "P", "student_name": f"S{i}"} for i in range(leads)]
+    db.execute(insert(Lead.__table__), lead_rows)
+    lead_owners = db.query(Lead.id, Lead.owner_id).all()
+    rng = random.Random(36)
+    rows = []
+    for i in range(reminders):
+        lead_id, owner_id = lead_owners[i % len(lead_owners)]
+        rows.append(
+            {
+                "lead_id": lead_id,
+                "owner_id": owner_id,
+                "title": f"Reminder {i}",
+                "due_at": NOW + timedelta(minutes=rng.randint(-60 * 24 * 30, 60 * 24 * 30)),
+                "completed": rng.random() < 0.6,
+                "created_at": NOW - timedelta(days=60),
+            }
+        )
+    db.execute(insert(Reminder.__table__), rows)
+    db.commit()
+    return owner.id
+
+
+def per_lead_loop(db, owner_id: int) -> list:
+    until = end_of_day(NOW)
+    due = []
+    for (lead_id,) in db.query(Lead.id).filter(Lead.owner_id == owner_id).order_by(Lead.id):
+        for reminder in (
+            db.query(Reminder).filter(Reminder.lead_id == lead_id, Reminder.owner_id == owner_id).all()
+        ):
+            if not reminder.completed and reminder.due_at is not None and reminder.due_at.replace(tzinfo=timezone.utc) < until:
+                due.append(reminder)
+    due.sort(key=lambda r: (r.due_at, r.id))
+    return [r.id for r in due]
+
+
+def indexed_query(db, owner_id: int) -> list:
+    result = get_due_reminders(db, owner_id, as_of=NOW, limit=10**9)
+    return [r.id for r in result["overdue"] + result["due"]]
+
+
+def fire_with_heap(pending, ticks) -> list:
+    heap = list(pending)
+    heapq.heapify(heap)
+    fired = []
+    for tick in ticks:
+        while heap and heap[0][0] <= tick:
+            fired.append(heapq.heappop(heap)[1])
+    return fired
+
+
+def fire_with_scan(pending, ticks) -> list:
+    remaining = list(pending)
+    fired = []
+    for tick in ticks:
+        ready = sorted(item for item in remaining if item[0] <= tick)
+        remaining = [item for item in remaining if item[0] > tick]
+        fired.extend(reminder_id for _, reminder_id in ready)
+    return fired
+
+
+def _best_of(fn, *args, repeat: int = 3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(reminders: int = 100_000, leads: int = 2_000) -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    owner_id = _seed(db, reminders, leads)
+
+    loop_elapsed, loop_ids = _best_of(per_lead_loop, db, owner_id, repeat=1)
+    db.expunge_all()
+    index_elapsed, index_ids = _best_of(indexed_query, db, owner_id)
+    assert loop_ids == index_ids
+
+    pending = [(due_at, rid) for rid, due_at in db.query(Reminder.id, Reminder.due_at).filter(Reminder.completed.is_(False))]
+    start, end = min(pending)[0], max(pending)[0]
+    step = (end - start) / TICKS
+    ticks = [start + step * (k + 1) for k in range(TICKS)]
+    heap_elapsed, heap_fired = _best_of(fire_with_heap, pending, ticks)
+    scan_elapsed, scan_fired = _best_of(fire_with_scan, pending, ticks, repeat=1)
+    assert heap_fired == scan_fired and len(heap_fired) == len(pending)
+
+    print(f"reminders={reminders} leads={leads} due_for_owner={len(index_ids)} open={len(pending)} ticks={TICKS}")
+    print(f"per-lead loop   {loop_elapsed * 1000:9.1f} ms")
+    print(f"indexed query   {index_elapsed * 1000:9.1f} ms  ({loop_elapsed / index_elapsed:.0f}x)")
+    print(f"scan per tick   {scan_elapsed * 1000:9.1f} ms")
+    print(f"min-heap        {heap_elapsed * 1000:9.1f} ms  ({scan_elapsed / heap_elapsed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2_000,
+    )
@@ -0,0 +1,139 @@
+"""Benchmark the dashboard's five report calls one after another vs one report batch.
+
+Both sides run the same report handlers against a file-backed SQLite database.
+Sequential mirrors the UI's separate requests: a fresh session per report, each
+loading its own invoices and payments. The batch runs them all in one snapshot
+that loads those rows once.
+
+Usage: python -m benchmarks.bench_report_batch [students] [invoices_per_student]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db.base import Base
+from backend.app.models.invoice import Invoice
+from backend.app.models.payment import Payment
+from backend.app.models.student import Student
+from backend.app.models.user import User
+from backend.app.services.report_batch import REPORT_HANDLERS, BatchData, run_report_batch
+
+TODAY = "2030-06-15"
+REPORTS = [
+    {"name": "dashboard_summary", "params": {"today": TODAY}},
+    {"name": "aging_summary", "params": {"as_of": TODAY}},
+    {"name": "payment_analytics", "params": {"today": TODAY}},
+    {"name": "invoice_pipeline", "params": {"today": TODAY}},
+    {"name": "revenue_ytd", "params": {}},
+]
+
+
+def _seed(db, students: int, invoices_per_student: int) -> int:
+    owner = User(email="bench@example.com", hashed_password="x")
+    db.add(owner)
+    db.flush()
+    student_ids = []
+    for i in range(students):
+        student = Student(owner_id=owner.id, parent_name=f"P{i}", student_name=f"S{i}")
+        db.add(student)
+        db.flush()
+        student_ids.append(student.id)
+    rng = random.Random(49)
+    start = datetime(2028, 1, 1)
+    invoices, payments = [], []
+    for student_id in student_ids:
+        for _ in range(invoices_per_student):
+            created = start + timedelta(days=rng.randint(0, 900))
+            total = Decimal(rng.choice((60, 90, 120, 180)))
+            paid = total if rng.random() < 0.7 else Decimal(0)
+            invoices.append(
+                {
+                    "owner_id": owner.id,
+                    "student_id": student_id,
+                    "status": "paid" if paid else "issued",
+                    "total_amount": total,
+                    "amount_paid": paid,
+                    "balance_due": total - paid,
+                    "due_date": created + timedelta(days=14),
+                    "created_at": created,
+                    "updated_at": created,
+                }
+            )
+    db.execute(insert(Invoice.__table__), invoices)
+    for invoice_id, total, paid, created in db.query(Invoice.id, Invoice.total_amount, Invoice.amount_paid, Invoice.created_at):
+        if paid:
+            payments.append(
+                {
+                    "owner_id": owner.id,
+                    "invoice_id": invoice_id,
+                    "amount": paid,
+                    "received_at": created + timedelta(days=3),
+                    "created_at": created + timedelta(days=3),
+                    "updated_at": created + timedelta(days=3),
+                }
+            )
+    db.execute(insert(Payment.__table__), payments)
+    db.commit()
+    return owner.id
+
+
+def sequential(session_factory, owner_id: int) -> list:
+    results = []
+    for item in REPORTS:
+        db = session_factory()
+        try:
+            results.append(REPORT_HANDLERS[item["name"]](db, owner_id, item["params"], BatchData(db, owner_id)))
+        finally:
+            db.close()
+    return results
+
+
+def batched(session_factory, owner_id: int) -> list:
+    db = session_factory()
+    try:
+        return [result["data"] for result in run_report_batch(db, owner_id=owner_id, reports=REPORTS)["results"]]
+    finally:
+        db.close()
+
+
+def _best_of(fn, *args, repeat: int = 5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(students: int = 500, invoices_per_student: int = 20) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        db = session_factory()
+        owner_id = _seed(db, students, invoices_per_student)
+        db.close()
+
+        sequential_elapsed, sequential_results = _best_of(sequential, session_factory, owner_id)
+        batch_elapsed, batch_results = _best_of(batched, session_factory, owner_id)
+        assert sequential_results == batch_results
+        engine.dispose()
+
+    print(f"students={students} invoices={students * invoices_per_student} reports={len(REPORTS)}")
+    print(f"sequential  {sequential_elapsed * 1000:9.1f} ms")
+    print(f"batch       {batch_elapsed * 1000:9.1f} ms  ({sequential_elapsed / batch_elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
@@ -0,0 +1,90 @@
+"""Benchmark response serialization for a 1,000-student analytics report.
+
+Compares the ``response_model`` path (validate + jsonable_encoder + json.dumps)
+against ``fast_response`` (pre-built serializer + orjson).
+
+Usage: python -m benchmarks.bench_report_serialization [students]
+"""
+
+import json
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.app.core.responses import fast_response
+from backend.app.schemas.admin_reporting import StudentAnalyticsReport
+
+
+def _payload(students: int) -> dict:
+    weeks = [
+        {
+            "year": 2030,
+            "iso_week": w,
+            "start_date": "2030-01-01",
+            "end_date": "2030-01-07",
+            "session_count": 1,
+            "hours": "1.00",
+        }
+        for w in range(1, 9)
+    ]
+    kpis = {
+        "total_sessions": 40,
+        "total_hours": "40.00",
+        "total_invoiced": "2400.00",
+        "total_paid": "1200.00",
+        "total_outstanding": "1200.00",
+        "last_session_date": "2030-02-20",
+        "first_session_date": "2029-09-01",
+        "sessions_last_8_weeks": 8,
+        "hours_last_8_weeks": "8.00",
+        "consistency_score_0_100": 100,
+        "current_session_streak_weeks": 8,
+        "billing_vs_usage_ratio": "60.00",
+    }
+    return {
+        "as_of": "2030-03-01",
+        "students": [
+            {
+                "student_id": i,
+                "student_display_name": f"Student {i}",
+                "parent_display_name": f"Parent {i}",
+                "kpis": dict(kpis),
+                "weekly_activity_last_8_weeks": [dict(w) for w in weeks],
+            }
+            for i in range(students)
+        ],
+    }
+
+
+def response_model_path(payload: dict) -> bytes:
+    validated = StudentAnalyticsReport.model_validate(payload)
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(payload: dict) -> bytes:
+    return fast_response(StudentAnalyticsReport, payload).body
+
+
+def _best_of(fn, payload, repeat: int = 7) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(payload)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(students: int = 1000) -> None:
+    payload = _payload(students)
+    assert json.loads(response_model_path(payload)) == json.loads(fast_path(payload))
+    slow = _best_of(response_model_path, payload)
+    fast = _best_of(fast_path, payload)
+    print(f"students={students}")
+    print(f"response_model  {slow * 1000:8.1f} ms")
+    print(f"fast_response   {fast * 1000:8.1f} ms")
+    print(f"speedup         {slow / fast:8.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
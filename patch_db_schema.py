@@ -0,0 +1,8 @@
+from backend.app.db.init_db import init_db
+
+# Bring an existing corebox.db up to the current models (same as `python -m backend.app.cli init-db`):
+# new tables, then the columns (with backfills) and indexes added to existing tables since it was created,
+# and values older code stored in a different format rewritten to the current one.
+for line in init_db():
+    print("OK:", line)
+print("Done.")
@@ -144,7 +144,7 @@ def test_financial_summary_date_range():
 
     create_session(client, token, student_id, 80.0, 60)
     inv2 = generate_invoice(client, token, student_id)
-    set_invoice_created_at(inv2["id"], now)
+    set_invoice_created_at(inv2["id"], later)
     create_payment(client, token, inv2["id"], "80.00")
 
     resp = client.get(
@@ -190,3 +190,40 @@ def test_activity_summary_no_data():
     assert data["total_invoiced"] == "0.00"
     assert data["total_paid"] == "0.00"
     assert data["total_outstanding"] == "0.00"
+
+
+def test_activity_summary_date_range_upper_bound():
+    client = TestClient(app)
+    token = register_and_login(client, "activity5@example.com", "secret")
+    headers = {"Authorization": f"Bearer {token}"}
+    student_id = create_student(client, token)
+
+    now = datetime.now(timezone.utc)
+    for days_ago, rate in ((40, 60.0), (20, 80.0), (0, 100.0)):
+        sess = create_session(client, token, student_id, rate, 60)
+        set_session_date(sess["id"], now - timedelta(days=days_ago))
+        inv = generate_invoice(client, token, student_id)
+        set_invoice_created_at(inv["id"], now - timedelta(days=days_ago))
+        create_payment(client, token, inv["id"], "10.00")
+
+    def summary(**params):
+        resp = client.get("/admin/reports/activity-summary", params=params, headers=headers)
+        assert resp.status_code == 200
+        return resp.json()
+
+    window = {"start_date": (now - timedelta(days=30)).date().isoformat(), "end_date": (now - timedelta(days=10)).date().isoformat()}
+    data = summary(**window)
+    assert data["session_count"] == 1
+    assert data["students"][0]["session_count"] == 1
+    assert data["total_paid"] == "10.00"
+    assert summary(end_date=window["end_date"])["session_count"] == 2
+    assert summary()["session_count"] == 3
+
+    # A cached range is refreshed once the owner's data changes.
+    sess = create_session(client, token, student_id, 50.0, 30)
+    set_session_date(sess["id"], now - timedelta(days=15))
+    assert summary(**window)["session_count"] == 2
+
+    reversed_range = {"start_date": window["end_date"], "end_date": window["start_date"]}
+    resp = client.get("/admin/reports/activity-summary", params=reversed_range, headers=headers)
+    assert resp.status_code == 400
@@ -0,0 +1,177 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.services.schedule import find_overlaps
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def create_student(client: TestClient, headers: dict) -> int:
+    resp = client.post("/students", json={"parent_name": "Parent", "student_name": "Student"}, headers=headers)
+    return resp.json()["id"]
+
+
+def session_payload(student_id: int, day: str, start: str, duration: int = 60, **overrides) -> dict:
+    payload = {
+        "student_id": student_id,
+        "subject": "Math",
+        "duration_minutes": duration,
+        "session_date": f"{day}T00:00:00Z",
+        "start_time": start,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_find_overlaps_uses_half_open_intervals():
+    at = lambda hour, minute=0: datetime(2030, 1, 7, hour, minute)  # noqa: E731
+    pairs = find_overlaps(
+        [
+            (at(10), at(11), "a"),
+            (at(11), at(12), "b"),  # touches a, does not overlap
+            (at(10, 30), at(11, 30), "c"),
+            (at(9), at(13), "d"),
+        ]
+    )
+    assert sorted(tuple(sorted(pair)) for pair in pairs) == [("a", "c"), ("a", "d"), ("b", "c"), ("b", "d"), ("c", "d")]
+
+
+def test_overlapping_create_is_reported_or_rejected():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'cal1@example.com', 'secret')}"}
+    student_id = create_student(client, headers)
+
+    first = client.post("/sessions", json=session_payload(student_id, "2030-01-07", "10:00:00"), headers=headers)
+    assert first.status_code == 201
+    assert "x-schedule-conflicts" not in first.headers
+
+    adjacent = client.post("/sessions", json=session_payload(student_id, "2030-01-07", "11:00:00"), headers=headers)
+    assert "x-schedule-conflicts" not in adjacent.headers
+
+    overlapping = session_payload(student_id, "2030-01-07", "10:30:00", duration=30)
+    rejected = client.post("/sessions", params={"on_conflict": "reject"}, json=overlapping, headers=headers)
+    assert rejected.status_code == 409
+    assert len(client.get("/sessions", headers=headers).json()) == 2
+
+    allowed = client.post("/sessions", json=overlapping, headers=headers)
+    assert allowed.status_code == 201
+    assert allowed.headers["x-schedule-conflicts"] == str(first.json()["id"])
+
+
+def test_update_checks_conflicts_against_other_sessions_only():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'cal2@example.com', 'secret')}"}
+    student_id = create_student(client, headers)
+    morning = client.post("/sessions", json=session_payload(student_id, "2030-01-07", "09:00:00"), headers=headers).json()
+    noon = client.post("/sessions", json=session_payload(student_id, "2030-01-07", "12:00:00"), headers=headers).json()
+
+    # Moving a session within its own slot is not a conflict with itself.
+    resp = client.put(f"/sessions/{morning['id']}", json={"start_time": "09:30:00"}, headers=headers)
+    assert resp.status_code == 200 and "x-schedule-conflicts" not in resp.headers
+
+    resp = client.put(
+        f"/sessions/{morning['id']}", params={"on_conflict": "reject"}, json={"start_time": "11:30:00"}, headers=headers
+    )
+    assert resp.status_code == 409
+    assert client.get(f"/sessions/{morning['id']}", headers=headers).json()["start_time"] == "09:30:00"
+
+    # Cancelled sessions free their slot.
+    client.put(f"/sessions/{noon['id']}", json={"attendance_status": "cancelled"}, headers=headers)
+    resp = client.put(
+        f"/sessions/{morning['id']}", params={"on_conflict": "reject"}, json={"start_time": "11:30:00"}, headers=headers
+    )
+    assert resp.status_code == 200
+
+    assert client.put(f"/sessions/{morning['id']}", json={"duration_minutes": 2000}, headers=headers).status_code == 400
+
+
+def test_series_conflicts_are_checked_in_one_pass():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'cal3@example.com', 'secret')}"}
+    student_id = create_student(client, headers)
+    busy = client.post("/sessions", json=session_payload(student_id, "2030-01-21", "10:30:00", duration=30), headers=headers)
+
+    series = session_payload(student_id, "2030-01-07", "10:00:00", count=4)
+    rejected = client.post("/sessions/series", params={"on_conflict": "reject"}, json=series, headers=headers)
+    assert rejected.status_code == 409
+    assert len(client.get("/sessions", headers=headers).json()) == 1
+
+    created = client.post("/sessions/series", json=series, headers=headers)
+    assert created.status_code == 201
+    assert created.headers["x-schedule-conflicts"] == str(busy.json()["id"])
+
+    # Bulk-inserted occurrences carry calendar bounds too.
+    week = client.get("/calendar", params={"view": "week", "date": "2030-01-23"}, headers=headers).json()
+    assert sum(len(day["sessions"]) for day in week["days"]) == 2
+
+
+def test_calendar_day_and_week_views():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'cal4@example.com', 'secret')}"}
+    student_id = create_student(client, headers)
+    ids = [
+        client.post("/sessions", json=session_payload(student_id, day, start, duration), headers=headers).json()["id"]
+        for day, start, duration in [
+            ("2030-01-06", "23:30:00", 60),  # Sunday, runs past midnight into Monday
+            ("2030-01-07", "10:00:00", 60),
+            ("2030-01-07", "10:30:00", 45),
+            ("2030-01-09", "15:00:00", 30),
+            ("2030-01-13", "18:00:00", 60),  # Sunday, last day of the week
+            ("2030-01-14", "09:00:00", 60),  # next week
+        ]
+    ]
+    other = {"Authorization": f"Bearer {register_and_login(client, 'cal4b@example.com', 'secret')}"}
+    client.post("/sessions", json=session_payload(create_student(client, other), "2030-01-07", "10:00:00"), headers=other)
+
+    week = client.get("/calendar", params={"view": "week", "date": "2030-01-10"}, headers=headers)
+    assert week.status_code == 200
+    body = week.json()
+    assert (body["start_date"], body["end_date"]) == ("2030-01-07", "2030-01-13")
+    assert [day["date"] for day in body["days"]][:2] == ["2030-01-07", "2030-01-08"]
+    per_day = {day["date"]: [s["id"] for s in day["sessions"]] for day in body["days"]}
+    assert per_day["2030-01-07"] == ids[0:3]
+    assert per_day["2030-01-09"] == [ids[3]]
+    assert per_day["2030-01-13"] == [ids[4]]
+    assert body["conflicts"] == [[ids[1], ids[2]]]
+    first = body["days"][0]["sessions"][1]
+    assert first["starts_at"].startswith("2030-01-07T10:00:00") and first["ends_at"].startswith("2030-01-07T11:00:00")
+
+    day = client.get("/calendar", params={"view": "day", "date": "2030-01-14"}, headers=headers).json()
+    assert len(day["days"]) == 1 and [s["id"] for s in day["days"][0]["sessions"]] == [ids[5]]
+    assert client.get("/calendar", params={"view": "month", "date": "2030-01-14"}, headers=headers).status_code == 422
+
+
+def test_window_query_uses_owner_starts_at_index():
+    db = SessionLocal()
+    try:
+        plan = db.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT id FROM sessions WHERE owner_id = 1 "
+                "AND starts_at >= '2030-01-06' AND starts_at < '2030-01-14' AND ends_at > '2030-01-07' "
+                "ORDER BY starts_at"
+            )
+        ).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        assert "ix_sessions_owner_starts_at" in details
+        assert "TEMP B-TREE" not in details
+    finally:
+        db.close()
@@ -0,0 +1,145 @@
+import re
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from backend.app.db.base import Base
+from backend.app.db.session import engine
+from backend.app.main import app
+
+REPORT_TABLES = re.compile(r"\b(FROM|JOIN)\s+(invoices|payments|sessions|students|leads)\b", re.IGNORECASE)
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def create_student(client: TestClient, token: str) -> int:
+    resp = client.post(
+        "/students",
+        json={"parent_name": "Parent", "student_name": "Student"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert resp.status_code in (200, 201)
+    return resp.json()["id"]
+
+
+@contextmanager
+def count_report_queries():
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if REPORT_TABLES.search(statement):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/admin/dashboard/summary",
+        "/admin/reports/aging-summary",
+        "/admin/reports/student-analytics",
+        "/admin/reports/financial-summary",
+        "/students/",
+    ],
+)
+def test_repeat_poll_returns_304_without_report_queries(path):
+    client = TestClient(app)
+    token = register_and_login(client, "etag1@example.com", "secret")
+    headers = {"Authorization": f"Bearer {token}"}
+    create_student(client, token)
+
+    first = client.get(path, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    with count_report_queries() as statements:
+        for _ in range(3):
+            repeat = client.get(path, headers={**headers, "If-None-Match": etag})
+            assert repeat.status_code == 304
+            assert repeat.content == b""
+            assert repeat.headers["etag"] == etag
+    assert statements == []
+
+
+def test_write_changes_etag():
+    client = TestClient(app)
+    token = register_and_login(client, "etag2@example.com", "secret")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/students/", headers=headers)
+    etag = first.headers["etag"]
+
+    create_student(client, token)
+
+    second = client.get("/students/", headers={**headers, "If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    assert len(second.json()) == 1
+
+
+def test_etag_is_owner_and_query_scoped():
+    client = TestClient(app)
+    token_a = register_and_login(client, "etag3a@example.com", "secret")
+    token_b = register_and_login(client, "etag3b@example.com", "secret")
+
+    resp_a = client.get("/admin/reports/aging-summary", headers={"Authorization": f"Bearer {token_a}"})
+    resp_b = client.get(
+        "/admin/reports/aging-summary",
+        headers={"Authorization": f"Bearer {token_b}", "If-None-Match": resp_a.headers["etag"]},
+    )
+    assert resp_b.status_code == 200
+
+    resp_a_dated = client.get(
+        "/admin/reports/aging-summary",
+        params={"as_of": "2030-01-01"},
+        headers={"Authorization": f"Bearer {token_a}", "If-None-Match": resp_a.headers["etag"]},
+    )
+    assert resp_a_dated.status_code == 200
+    assert resp_a_dated.json()["as_of"] == "2030-01-01"
+
+
+def test_parent_link_and_rate_plan_writes_change_student_etag():
+    client = TestClient(app)
+    token = register_and_login(client, "etag4@example.com", "secret")
+    headers = {"Authorization": f"Bearer {token}"}
+    student_id = create_student(client, token)
+    first = client.get("/students/", headers=headers)
+
+    resp = client.post(
+        "/admin/parents/",
+        json={"email": "parent4@example.com", "password": "secret", "students": [{"student_id": student_id}]},
+        headers=headers,
+    )
+    parent_id = resp.json()["parent_user_id"]
+    linked = client.get("/students/", headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert linked.status_code == 200
+    assert linked.json()[0]["parent_id"] == parent_id
+
+    client.put(f"/parents/{parent_id}", json={"rate_plan": "discount"}, headers=headers)
+    repriced = client.get("/students/", headers={**headers, "If-None-Match": linked.headers["etag"]})
+    assert repriced.status_code == 200
+    assert repriced.json()[0]["parent_rate_plan"] == "discount"
+
+    client.put(f"/parents/{parent_id}", json={"phone": "555"}, headers=headers)
+    unchanged = client.get("/students/", headers={**headers, "If-None-Match": repriced.headers["etag"]})
+    assert unchanged.status_code == 304
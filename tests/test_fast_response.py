@@ -0,0 +1,71 @@
+import json
+
+from backend.app.core.responses import FastJSONResponse, fast_response, get_serializer
+from backend.app.schemas.admin_reporting import AgingSummary, StudentAnalyticsReport
+
+
+def _analytics_payload(students: int = 3) -> dict:
+    weeks = [
+        {
+            "year": 2030,
+            "iso_week": w,
+            "start_date": "2030-01-01",
+            "end_date": "2030-01-07",
+            "session_count": w % 2,
+            "hours": "1.00",
+        }
+        for w in range(1, 9)
+    ]
+    return {
+        "as_of": "2030-03-01",
+        "students": [
+            {
+                "student_id": i,
+                "student_display_name": f"Student {i}",
+                "parent_display_name": None,
+                "internal_only": "dropped",
+                "kpis": {
+                    "total_sessions": 4,
+                    "total_hours": "4.00",
+                    "total_invoiced": "240.00",
+                    "total_paid": "100.00",
+                    "total_outstanding": "140.00",
+                    "last_session_date": "2030-02-20",
+                    "first_session_date": None,
+                    "sessions_last_8_weeks": 4,
+                    "hours_last_8_weeks": "4.00",
+                    "consistency_score_0_100": 50,
+                    "current_session_streak_weeks": 1,
+                    "billing_vs_usage_ratio": "60.00",
+                },
+                "weekly_activity_last_8_weeks": weeks,
+            }
+            for i in range(students)
+        ],
+    }
+
+
+def test_serializer_matches_pydantic_dump():
+    payload = _analytics_payload()
+    expected = StudentAnalyticsReport.model_validate(payload).model_dump(mode="json")
+    assert get_serializer(StudentAnalyticsReport)(payload) == expected
+
+
+def test_serializer_fills_defaults():
+    payload = {
+        "as_of": "2030-01-01",
+        "totals": {k: "0.00" for k in ("current", "days_1_30", "days_31_60", "days_61_90", "days_90_plus")},
+        "students": [],
+    }
+    data = get_serializer(AgingSummary)(payload)
+    assert data["currency"] == "USD"
+    assert data == AgingSummary.model_validate(payload).model_dump(mode="json")
+
+
+def test_fast_response_renders_json():
+    response = fast_response(StudentAnalyticsReport, _analytics_payload(1))
+    assert isinstance(response, FastJSONResponse)
+    assert response.media_type == "application/json"
+    body = json.loads(response.body)
+    assert "internal_only" not in body["students"][0]
+    assert len(body["students"][0]["weekly_activity_last_8_weeks"]) == 8
@@ -0,0 +1,231 @@
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core.time import utc_now
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.models.job import Job
+from backend.app.services import jobs
+from backend.app.services.jobs import JOB_HANDLERS, JobRunner, job_runner
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    job_runner.shutdown()
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def wait_for_job(client: TestClient, job_id: int, headers: dict, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}", headers=headers).json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_student_analytics_job_matches_inline_report():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'jobs1@example.com', 'secret')}"}
+    client.post("/students", json={"parent_name": "P", "student_name": "S"}, headers=headers)
+
+    resp = client.post("/jobs", json={"kind": "student_analytics", "params": {"today": "2030-01-15"}}, headers=headers)
+    assert resp.status_code == 202
+    assert resp.json()["status"] in ("queued", "running", "succeeded")
+
+    job = wait_for_job(client, resp.json()["id"], headers)
+    assert job["status"] == "succeeded"
+    result = client.get(f"/jobs/{job['id']}/result", headers=headers)
+    assert result.status_code == 200
+    assert result.headers["content-type"] == "application/json"
+    inline = client.get("/admin/reports/student-analytics", params={"today": "2030-01-15"}, headers=headers)
+    assert result.json() == inline.json()
+
+
+def test_parent_report_export_job_and_failures():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'jobs2@example.com', 'secret')}"}
+    student = client.post("/students", json={"parent_name": "P", "student_name": "S"}, headers=headers).json()
+
+    ok = client.post("/jobs", json={"kind": "parent_report_export", "params": {"student_id": student["id"]}}, headers=headers)
+    job = wait_for_job(client, ok.json()["id"], headers)
+    assert job["status"] == "succeeded"
+    assert job["result_filename"] == f"parent_report_{student['id']}.pdf"
+    result = client.get(f"/jobs/{job['id']}/result", headers=headers)
+    assert result.headers["content-type"] == "application/pdf"
+    assert result.content
+
+    missing = client.post("/jobs", json={"kind": "parent_report_export", "params": {"student_id": 9999}}, headers=headers)
+    failed = wait_for_job(client, missing.json()["id"], headers)
+    assert failed["status"] == "failed"
+    assert failed["error"]
+    assert client.get(f"/jobs/{failed['id']}/result", headers=headers).status_code == 409
+
+    assert client.post("/jobs", json={"kind": "nope"}, headers=headers).status_code == 400
+
+
+def test_jobs_are_owner_scoped():
+    client = TestClient(app)
+    headers_a = {"Authorization": f"Bearer {register_and_login(client, 'jobs3a@example.com', 'secret')}"}
+    headers_b = {"Authorization": f"Bearer {register_and_login(client, 'jobs3b@example.com', 'secret')}"}
+    job = client.post("/jobs", json={"kind": "student_analytics"}, headers=headers_a).json()
+    wait_for_job(client, job["id"], headers_a)
+
+    assert client.get(f"/jobs/{job['id']}", headers=headers_b).status_code == 404
+    assert client.get(f"/jobs/{job['id']}/result", headers=headers_b).status_code == 404
+
+
+def test_runner_start_recovers_interrupted_jobs():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'jobs4@example.com', 'secret')}"}
+    owner_id = client.get("/sync/versions", headers=headers).json()["owner_id"]
+
+    db = SessionLocal()
+    try:
+        job = Job(owner_id=owner_id, kind="student_analytics", status="running", params="{}")
+        db.add(job)
+        db.commit()
+        job_id = job.id
+    finally:
+        db.close()
+
+    job_runner.start()
+    assert wait_for_job(client, job_id, headers)["status"] == "succeeded"
+
+
+def test_runner_start_leaves_jobs_with_a_live_lease_alone():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'jobs5@example.com', 'secret')}"}
+    owner_id = client.get("/sync/versions", headers=headers).json()["owner_id"]
+
+    db = SessionLocal()
+    try:
+        expired = utc_now() - timedelta(seconds=job_runner.lease_seconds + 5)
+        running = {"owner_id": owner_id, "kind": "student_analytics", "status": "running", "params": "{}"}
+        live = Job(**running, worker_id="other-host:1:abc", heartbeat_at=utc_now())
+        stale = Job(**running, worker_id="other-host:2:def", heartbeat_at=expired)
+        db.add_all([live, stale])
+        db.commit()
+        live_id, stale_id = live.id, stale.id
+    finally:
+        db.close()
+
+    job_runner.start()
+    assert wait_for_job(client, stale_id, headers)["status"] == "succeeded"
+    db = SessionLocal()
+    try:
+        job = db.get(Job, live_id)
+        assert (job.status, job.worker_id) == ("running", "other-host:1:abc")
+    finally:
+        db.close()
+
+
+def test_report_endpoints_run_as_jobs():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'jobs6@example.com', 'secret')}"}
+    student = client.post("/students", json={"parent_name": "P", "student_name": "S"}, headers=headers).json()
+
+    inline = client.get("/admin/reports/student-analytics", params={"today": "2030-01-15"}, headers=headers)
+    assert inline.status_code == 200 and inline.json()["total"] == 1
+
+    queued = client.get(
+        f"/admin/reports/parent-report/{student['id']}/export/pdf",
+        headers={**headers, "Prefer": "respond-async"},
+    )
+    assert queued.status_code == 202
+    assert queued.headers["location"] == f"/jobs/{queued.json()['id']}"
+    job = wait_for_job(client, queued.json()["id"], headers)
+    assert job["status"] == "succeeded"
+    assert client.get(f"/jobs/{job['id']}/result", headers=headers).headers["content-type"] == "application/pdf"
+
+    db = SessionLocal()
+    try:
+        # Results handed back inline are not kept.
+        assert db.query(Job).count() == 1
+    finally:
+        db.close()
+
+
+def test_recovery_does_not_resubmit_jobs_the_runner_already_holds(monkeypatch):
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'jobs7@example.com', 'secret')}"}
+    owner_id = client.get("/sync/versions", headers=headers).json()["owner_id"]
+    release = threading.Event()
+    submitted = []
+    original_run_job = jobs.run_job
+
+    def blocking(db, owner_id, params):
+        release.wait(10)
+        return b"done", "text/plain", "done.txt"
+
+    def recording_run_job(job_id, worker_id):
+        submitted.append(job_id)
+        original_run_job(job_id, worker_id)
+
+    monkeypatch.setitem(JOB_HANDLERS, "blocking", blocking)
+    monkeypatch.setattr(jobs, "run_job", recording_run_job)
+    db = SessionLocal()
+    try:
+        queued = [Job(owner_id=owner_id, kind="blocking", status="queued", params="{}") for _ in range(2)]
+        db.add_all(queued)
+        db.commit()
+        job_ids = [job.id for job in queued]
+    finally:
+        db.close()
+
+    runner = JobRunner(max_workers=1)
+    try:
+        for _ in range(4):  # startup, then three heartbeats while the first job blocks the pool
+            runner.recover_jobs()
+        release.set()
+    finally:
+        runner.shutdown()
+    assert sorted(submitted) == job_ids
+    for job_id in job_ids:
+        assert client.get(f"/jobs/{job_id}", headers=headers).json()["status"] == "succeeded"
+
+
+def test_finished_jobs_are_purged_after_their_ttl():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'jobs8@example.com', 'secret')}"}
+    owner_id = client.get("/sync/versions", headers=headers).json()["owner_id"]
+    runner = JobRunner(result_ttl_seconds=3600)
+    old = utc_now() - timedelta(hours=2)
+
+    db = SessionLocal()
+    try:
+        common = {"owner_id": owner_id, "kind": "student_analytics", "params": "{}"}
+        rows = {
+            "old_succeeded": Job(**common, status="succeeded", finished_at=old),
+            "old_failed": Job(**common, status="failed", finished_at=old),
+            "recent": Job(**common, status="succeeded", finished_at=utc_now()),
+            "queued": Job(**common, status="queued", created_at=old),
+        }
+        db.add_all(rows.values())
+        db.commit()
+        ids = {name: job.id for name, job in rows.items()}
+    finally:
+        db.close()
+
+    assert runner.purge_finished_jobs() == 2
+    db = SessionLocal()
+    try:
+        assert sorted(job_id for (job_id,) in db.query(Job.id)) == [ids["recent"], ids["queued"]]
+    finally:
+        db.close()
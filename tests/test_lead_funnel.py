@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.models.timeline import TimelineEvent
+from backend.app.services import lead_funnel_reporting
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def create_lead(client: TestClient, headers: dict, status: str = "new") -> int:
+    resp = client.post("/leads/", json={"parent_name": "P", "student_name": "S", "status": status}, headers=headers)
+    assert resp.status_code == 200
+    return resp.json()["id"]
+
+
+def move(client: TestClient, headers: dict, lead_id: int, *statuses: str) -> None:
+    for status in statuses:
+        resp = client.put(f"/leads/{lead_id}", json={"status": status}, headers=headers)
+        assert resp.status_code == 200
+
+
+def backdate_transitions(lead_id: int, hours_in_stage: list) -> None:
+    """Space a lead's status events ``hours_in_stage`` apart, oldest first."""
+    db = SessionLocal()
+    try:
+        events = (
+            db.query(TimelineEvent)
+            .filter(TimelineEvent.lead_id == lead_id, TimelineEvent.to_status.isnot(None))
+            .order_by(TimelineEvent.id)
+            .all()
+        )
+        moment = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        for event, hours in zip(events, [0] + hours_in_stage):
+            moment += timedelta(hours=hours)
+            event.created_at = moment
+        db.commit()
+    finally:
+        db.close()
+
+
+def get_funnel(client: TestClient, headers: dict) -> dict:
+    resp = client.get("/admin/reports/lead-funnel", headers=headers)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_status_changes_record_from_and_to():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'funnel1@example.com', 'secret')}"}
+    lead_id = create_lead(client, headers)
+    move(client, headers, lead_id, "contacted")
+
+    events = client.get(f"/leads/{lead_id}/timeline", headers=headers).json()
+    assert [(e["event_type"], e["from_status"], e["to_status"]) for e in events] == [
+        ("lead_created", None, "new"),
+        ("status_changed", "new", "contacted"),
+    ]
+
+
+def test_funnel_counts_conversion_and_median_time_in_stage():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'funnel2@example.com', 'secret')}"}
+
+    enrolled = create_lead(client, headers)
+    move(client, headers, enrolled, "contacted", "trial_scheduled", "enrolled")
+    backdate_transitions(enrolled, [10, 20, 30])
+
+    trial = create_lead(client, headers)
+    move(client, headers, trial, "contacted", "trial_scheduled")
+    backdate_transitions(trial, [20, 40])
+
+    lost = create_lead(client, headers)
+    move(client, headers, lost, "contacted", "closed_lost")
+    backdate_transitions(lost, [30, 5])
+
+    create_lead(client, headers)
+    skipped = create_lead(client, headers, status="contacted")  # created straight into a later stage
+    move(client, headers, skipped, "closed_lost")
+    backdate_transitions(skipped, [60])
+
+    report = get_funnel(client, headers)
+    assert report["total_leads"] == 5
+    assert report["closed_lost_count"] == 2
+    stages = {s["stage"]: s for s in report["stages"]}
+    assert [s["stage"] for s in report["stages"]] == ["new", "contacted", "trial_scheduled", "enrolled"]
+    assert {k: s["current_count"] for k, s in stages.items()} == {"new": 1, "contacted": 0, "trial_scheduled": 1, "enrolled": 1}
+    assert {k: s["reached_count"] for k, s in stages.items()} == {"new": 5, "contacted": 4, "trial_scheduled": 2, "enrolled": 1}
+    assert stages["new"]["conversion_rate_to_next"] == "80.00"
+    assert stages["contacted"]["conversion_rate_to_next"] == "50.00"
+    assert stages["trial_scheduled"]["conversion_rate_to_next"] == "50.00"
+    assert stages["enrolled"]["conversion_rate_to_next"] is None
+    assert report["overall_conversion_rate"] == "20.00"
+
+    assert stages["new"]["median_hours_in_stage"] == "20.00"  # 10, 20, 30
+    assert stages["contacted"]["median_hours_in_stage"] == "30.00"  # 5, 20, 40, 60: mean of the middle two
+    assert stages["trial_scheduled"]["median_hours_in_stage"] == "30.00"  # the other trial has not ended
+    assert stages["enrolled"]["median_hours_in_stage"] is None
+
+
+def test_funnel_is_cached_until_lead_data_changes(monkeypatch):
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'funnel3@example.com', 'secret')}"}
+    other = {"Authorization": f"Bearer {register_and_login(client, 'funnel3b@example.com', 'secret')}"}
+    lead_id = create_lead(client, headers)
+    create_lead(client, other)
+
+    calls = []
+    compute = lead_funnel_reporting._compute_lead_funnel
+    monkeypatch.setattr(lead_funnel_reporting, "_compute_lead_funnel", lambda db, owner_id: calls.append(owner_id) or compute(db, owner_id))
+
+    first = get_funnel(client, headers)
+    assert get_funnel(client, headers) == first
+    assert len(calls) == 1
+    assert get_funnel(client, other)["total_leads"] == 1
+    assert len(calls) == 2
+
+    move(client, headers, lead_id, "contacted")
+    updated = get_funnel(client, headers)
+    assert len(calls) == 3
+    assert {s["stage"]: s["reached_count"] for s in updated["stages"]}["contacted"] == 1
+
+
+def test_funnel_etag_changes_with_lead_status():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'funnel4@example.com', 'secret')}"}
+    lead_id = create_lead(client, headers)
+
+    first = client.get("/admin/reports/lead-funnel", headers=headers)
+    etag = first.headers["etag"]
+    assert client.get("/admin/reports/lead-funnel", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    move(client, headers, lead_id, "contacted")
+    repeat = client.get("/admin/reports/lead-funnel", headers={**headers, "If-None-Match": etag})
+    assert repeat.status_code == 200
+    assert repeat.headers["etag"] != etag
+    assert {s["stage"]: s["reached_count"] for s in repeat.json()["stages"]}["contacted"] == 1
@@ -0,0 +1,197 @@
+from datetime import datetime, time
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db.base import Base
+from backend.app.db.init_db import init_db
+from backend.app.core.pagination import decode_cursor, keyset_page
+from backend.app.db.migrations import upgrade_schema
+from backend.app.models.lead import Lead
+from backend.app.models.note import Note
+from backend.app.models.session import Session as SessionModel
+from backend.app.models.timeline import TimelineEvent
+from backend.app.models.user import User
+
+
+@pytest.fixture
+def old_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=1, email="old@example.com", hashed_password="x"))
+    db.commit()
+    db.close()
+    yield engine
+    engine.dispose()
+
+
+def drop_column(engine, table: str, column: str) -> None:
+    """Rewind ``table`` to before ``column`` existed (indexes on it go too)."""
+    with engine.begin() as conn:
+        for index in inspect(conn).get_indexes(table):
+            if column in index["column_names"]:
+                conn.execute(text(f"DROP INDEX {index['name']}"))
+        conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+
+
+def test_upgrade_adds_and_backfills_lead_updated_at(old_engine):
+    drop_column(old_engine, "leads", "updated_at")
+    created = datetime(2025, 3, 1, 9, 30)
+    with old_engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO leads (parent_name, student_name, status, status_changed_at, created_at, owner_id) "
+                "VALUES ('P', 'S', 'new', :at, :at, 1)"
+            ),
+            {"at": created},
+        )
+
+    assert init_db(old_engine) == ["Added leads.updated_at"]
+    assert upgrade_schema(old_engine) == []
+
+    db = sessionmaker(bind=old_engine)()
+    try:
+        lead = db.query(Lead).one()
+        assert lead.updated_at == created
+        db.add(Lead(parent_name="P2", student_name="S2", owner_id=1))
+        db.commit()
+        assert db.query(Lead).count() == 2
+    finally:
+        db.close()
+
+
+def test_upgrade_backfills_timeline_statuses(old_engine):
+    drop_column(old_engine, "timeline_events", "to_status")
+    drop_column(old_engine, "timeline_events", "from_status")
+    at = datetime(2025, 3, 1, 9, 30)
+    with old_engine.begin() as conn:
+        for lead_id, status in ((1, "contacted"), (2, "new")):
+            conn.execute(
+                text(
+                    "INSERT INTO leads (id, parent_name, student_name, status, status_changed_at, created_at, updated_at, owner_id) "
+                    "VALUES (:id, 'P', 'S', :status, :at, :at, :at, 1)"
+                ),
+                {"id": lead_id, "status": status, "at": at},
+            )
+        events = [
+            (1, "lead_created", "Lead created"),
+            (1, "status_changed", "Status changed from new to trial_scheduled"),
+            (1, "note_added", "Note added: hi"),
+            (1, "status_changed", "Status changed from trial_scheduled to contacted"),
+            (2, "lead_created", "Lead created"),
+        ]
+        for lead_id, event_type, description in events:
+            conn.execute(
+                text(
+                    "INSERT INTO timeline_events (lead_id, owner_id, event_type, description, created_at) "
+                    "VALUES (:lead_id, 1, :event_type, :description, :at)"
+                ),
+                {"lead_id": lead_id, "event_type": event_type, "description": description, "at": at},
+            )
+
+    assert init_db(old_engine) == [
+        "Added timeline_events.from_status",
+        "Added timeline_events.to_status",
+        "Created index ix_timeline_events_owner_to_status_lead",
+    ]
+
+    db = sessionmaker(bind=old_engine)()
+    try:
+        rows = db.query(TimelineEvent.lead_id, TimelineEvent.from_status, TimelineEvent.to_status).order_by(TimelineEvent.id).all()
+    finally:
+        db.close()
+    assert rows == [
+        (1, None, "new"),
+        (1, "new", "trial_scheduled"),
+        (1, None, None),
+        (1, "trial_scheduled", "contacted"),
+        (2, None, "new"),
+    ]
+
+
+def test_upgrade_backfills_session_bounds(old_engine):
+    drop_column(old_engine, "sessions", "starts_at")
+    drop_column(old_engine, "sessions", "ends_at")
+    at = datetime(2025, 3, 1, 9, 30)
+    with old_engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO sessions (owner_id, student_id, subject, duration_minutes, session_date, start_time, "
+                "attendance, attendance_status, billing_status, is_billable, rate_plan, created_at, updated_at) "
+                "VALUES (1, 1, 'Math', 90, :day, :start, 'present', 'scheduled', 'not_applicable', 1, 'regular', :at, :at)"
+            ),
+            # Stored the way SQLAlchemy writes Time columns on SQLite.
+            {"day": datetime(2025, 3, 4), "start": time(16, 45).isoformat(timespec="microseconds"), "at": at},
+        )
+
+    assert init_db(old_engine) == [
+        "Added sessions.starts_at",
+        "Added sessions.ends_at",
+        "Created index ix_sessions_owner_starts_at",
+    ]
+
+    db = sessionmaker(bind=old_engine)()
+    try:
+        session = db.query(SessionModel).filter(SessionModel.starts_at >= datetime(2025, 3, 4)).one()
+        assert (session.starts_at, session.ends_at) == (datetime(2025, 3, 4, 16, 45), datetime(2025, 3, 4, 18, 15))
+    finally:
+        db.close()
+
+
+def test_upgrade_creates_missing_indexes(old_engine):
+    names = [
+        "ix_reminders_owner_completed_due_at",
+        "ix_notes_lead_created_at_id",
+        "ix_invoices_owner_created_at",
+        "ix_sessions_owner_session_date",
+    ]
+    with old_engine.begin() as conn:
+        for name in names:
+            conn.execute(text(f"DROP INDEX {name}"))
+
+    assert sorted(init_db(old_engine)) == sorted(f"Created index {name}" for name in names)
+    assert upgrade_schema(old_engine) == []
+    with old_engine.connect() as conn:
+        plan = conn.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM reminders "
+                "WHERE owner_id = 1 AND completed = 0 AND due_at < '2030-01-01' ORDER BY due_at"
+            )
+        ).fetchall()
+    assert "ix_reminders_owner_completed_due_at" in " ".join(row[-1] for row in plan)
+
+
+def test_upgrade_normalizes_second_precision_note_timestamps(old_engine):
+    at = datetime(2026, 1, 1, 10, 0)
+    with old_engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO leads (id, parent_name, student_name, status, status_changed_at, created_at, updated_at, owner_id) "
+                "VALUES (1, 'P', 'S', 'new', :at, :at, :at, 1)"
+            ),
+            {"at": at},
+        )
+        for i in range(5):
+            # Stored the way the old CURRENT_TIMESTAMP server default wrote them.
+            conn.execute(
+                text("INSERT INTO notes (lead_id, owner_id, content, created_at) VALUES (1, 1, :content, '2026-01-01 10:00:00')"),
+                {"content": f"note {i}"},
+            )
+
+    assert init_db(old_engine) == ["Normalized 5 notes.created_at values"]
+    assert upgrade_schema(old_engine) == []
+
+    db = sessionmaker(bind=old_engine)()
+    try:
+        seen, cursor = [], None
+        while True:
+            page, next_token = keyset_page(db.query(Note), Note.created_at, Note.id, cursor=cursor, limit=2)
+            seen += [note.id for note in page]
+            if next_token is None:
+                break
+            cursor = decode_cursor(next_token)
+    finally:
+        db.close()
+    assert seen == [1, 2, 3, 4, 5]
@@ -0,0 +1,62 @@
+import random
+from decimal import Decimal
+
+from backend.app.core.money import cents_to_decimal, divide_cents, format_cents, to_cents
+
+
+def _random_amount(rng: random.Random):
+    # Amounts come from Numeric(..., 2) columns, so never carry more than two decimals.
+    kind = rng.randrange(5)
+    if kind == 0:
+        return Decimal(rng.randrange(-10_000_000, 10_000_000)).scaleb(-2)
+    if kind == 1:
+        return Decimal(rng.randrange(-10_000_000, 10_000_000)).scaleb(-rng.randrange(0, 3))
+    if kind == 2:
+        return round(rng.uniform(-100_000, 100_000), rng.randrange(0, 3))
+    if kind == 3:
+        return rng.randrange(-5_000, 5_000)
+    return None
+
+
+def _legacy_total(values) -> str:
+    # The pre-cents reports summed the raw Decimals and quantized the total once.
+    total = sum((Decimal(str(v or 0)) for v in values), Decimal("0.00"))
+    return str(total.quantize(Decimal("0.01")))
+
+
+def test_cents_sum_matches_decimal_quantize_property():
+    rng = random.Random(20260126)
+    for _ in range(500):
+        values = [_random_amount(rng) for _ in range(rng.randrange(0, 60))]
+        assert format_cents(sum(to_cents(v) for v in values)) == _legacy_total(values)
+
+
+def test_cents_average_matches_decimal_division_property():
+    rng = random.Random(7)
+    for _ in range(2000):
+        values = [Decimal(rng.randrange(0, 1_000_000)).scaleb(-2) for _ in range(rng.randrange(1, 40))]
+        legacy_total = sum(values, Decimal("0.00"))
+        legacy_avg = (legacy_total / len(values)).quantize(Decimal("0.01"))
+        cents_avg = divide_cents(sum(to_cents(v) for v in values), len(values))
+        assert format_cents(cents_avg) == str(legacy_avg.quantize(Decimal("0.01")))
+
+
+def test_divide_cents_half_even_and_negative():
+    assert divide_cents(5, 2) == 2
+    assert divide_cents(7, 2) == 4
+    assert divide_cents(-5, 2) == -2
+    assert divide_cents(-7, 2) == -4
+    assert divide_cents(-1, 3) == 0
+    assert divide_cents(2, 3) == 1
+
+
+def test_format_and_round_trip():
+    assert format_cents(0) == "0.00"
+    assert format_cents(5) == "0.05"
+    assert format_cents(-5) == "-0.05"
+    assert format_cents(123456) == "1234.56"
+    assert to_cents(Decimal("12.345")) == 1234
+    assert to_cents(Decimal("12.355")) == 1236
+    assert to_cents("19.99") == 1999
+    assert to_cents(None) == 0
+    assert cents_to_decimal(1999) == Decimal("19.99")
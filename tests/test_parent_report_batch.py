@@ -0,0 +1,104 @@
+import concurrent.futures
+import io
+import zipfile
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.services import parent_report_batch_service
+from backend.app.services.parent_report_batch_service import build_parent_reports, iter_zip, render_parent_report_files
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def seed_roster(client: TestClient, headers: dict, count: int = 3) -> list[int]:
+    student_ids = []
+    for i in range(count):
+        student = client.post(
+            "/students", json={"parent_name": f"Parent {i}", "student_name": f"Student {i}"}, headers=headers
+        ).json()
+        student_ids.append(student["id"])
+        for day in range(1, i + 2):
+            resp = client.post(
+                "/sessions",
+                json={
+                    "student_id": student["id"],
+                    "subject": "Math",
+                    "duration_minutes": 60,
+                    "session_date": f"2030-01-{day:02d}T10:00:00Z",
+                    "start_time": "10:00:00",
+                    "rate_per_hour": 50,
+                },
+                headers=headers,
+            )
+            assert resp.status_code == 201
+    return student_ids
+
+
+def test_zip_matches_per_student_exports():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'batch1@example.com', 'secret')}"}
+    student_ids = seed_roster(client, headers)
+    params = {"today": "2030-01-20", "start_date": "2030-01-02", "end_date": "2030-01-31"}
+
+    resp = client.get("/admin/reports/parent-reports/export.zip", params=params, headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/zip"
+
+    archive = zipfile.ZipFile(io.BytesIO(resp.content))
+    assert archive.namelist() == [f"parent_report_{sid}.pdf" for sid in student_ids]
+    for sid in student_ids:
+        single = client.get(f"/admin/reports/parent-report/{sid}/export/pdf", params=params, headers=headers)
+        assert archive.read(f"parent_report_{sid}.pdf") == single.content
+
+
+def test_process_pool_rendering_matches_inline(monkeypatch):
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'batch2@example.com', 'secret')}"}
+    seed_roster(client, headers, count=4)
+    owner_id = client.get("/sync/versions", headers=headers).json()["owner_id"]
+
+    db = SessionLocal()
+    try:
+        reports = build_parent_reports(db, owner_id=owner_id, today=date(2030, 1, 20), start_date=None, end_date=None)
+    finally:
+        db.close()
+
+    inline = list(render_parent_report_files(reports, workers=1))
+    monkeypatch.setattr(parent_report_batch_service, "PROCESS_POOL_MIN_REPORTS", 0)
+    contexts = []
+    original_pool = concurrent.futures.ProcessPoolExecutor
+
+    def recording_pool(*args, **kwargs):
+        contexts.append(kwargs["mp_context"].get_start_method())
+        return original_pool(*args, **kwargs)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", recording_pool)
+    pooled = list(render_parent_report_files(reports, workers=2))
+    assert pooled == inline
+    assert contexts == ["spawn"]
+
+
+def test_iter_zip_streams_in_chunks():
+    files = [(f"f{i}.txt", b"x" * 1000) for i in range(5)]
+    chunks = list(iter_zip(files))
+    assert len(chunks) > 1
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert [archive.read(name) for name, _ in files] == [content for _, content in files]
@@ -0,0 +1,106 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.models.job import Job
+from backend.app.services import parent_report_export_service
+from backend.app.services.pdf_writer import PdfTemplate
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def assert_valid_pdf(pdf: bytes) -> int:
+    """Check header, xref offsets and trailer; return the page count."""
+    assert pdf.startswith(b"%PDF-1.4\n")
+    assert pdf.endswith(b"%%EOF\n")
+    xref_at = int(pdf.rsplit(b"startxref\n", 1)[1].split(b"\n")[0])
+    assert pdf[xref_at:].startswith(b"xref\n")
+    lines = pdf[xref_at:].split(b"\n")
+    size = int(lines[1].split()[1])
+    for number in range(1, size):
+        offset = int(lines[2 + number][:10])
+        assert pdf[offset:].startswith(b"%d 0 obj" % number)
+    return int(re.search(rb"/Type /Pages /Kids \[[^\]]*\] /Count (\d+)", pdf).group(1))
+
+
+def test_writer_paginates_wraps_and_escapes():
+    template = PdfTemplate(footer="Report")
+    blocks = [("title", "Report (draft)"), ("body", "Unbalanced ) paren \\ and café")]
+    blocks += [("body", "word " * 200)] + [("body", f"Line {i}") for i in range(120)]
+    chunks = list(template.iter_pdf(blocks))
+    pdf = b"".join(chunks)
+
+    assert len(chunks) > 3  # header, pages..., trailer
+    assert assert_valid_pdf(pdf) > 1
+    pdf.decode("ascii")
+    assert b"(Report (draft)) Tj" in pdf
+    assert b"(Unbalanced \\) paren \\\\ and caf\\351) Tj" in pdf
+    longest = max(len(line) for line in re.findall(rb"\((word[^)]*)\) Tj", pdf))
+    assert longest < len(b"word " * 200)
+
+
+def test_export_is_pdf_and_repeat_downloads_hit_cache(monkeypatch):
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'pdf1@example.com', 'secret')}"}
+    student = client.post("/students", json={"parent_name": "Pat", "student_name": "Sam"}, headers=headers).json()
+    url = f"/admin/reports/parent-report/{student['id']}/export/pdf"
+
+    builds = []
+    original = parent_report_export_service.get_parent_report_with_narrative
+
+    def counting(**kwargs):
+        builds.append(kwargs["student_id"])
+        return original(**kwargs)
+
+    monkeypatch.setattr(parent_report_export_service, "get_parent_report_with_narrative", counting)
+
+    first = client.get(url, params={"today": "2030-06-15"}, headers=headers)
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/pdf"
+    assert "content-length" not in first.headers  # streamed, not buffered
+    assert assert_valid_pdf(first.content) >= 1
+    assert b"(Student: Sam) Tj" in first.content
+
+    second = client.get(url, params={"today": "2030-06-15"}, headers=headers)
+    assert second.content == first.content
+    assert len(builds) == 1
+
+    client.get(url, params={"today": "2030-06-16"}, headers=headers)
+    assert len(builds) == 2  # different period, different key
+
+    client.put(f"/students/{student['id']}", json={"student_name": "Samantha"}, headers=headers)
+    third = client.get(url, params={"today": "2030-06-15"}, headers=headers)
+    assert len(builds) == 3
+    assert b"(Student: Samantha) Tj" in third.content
+
+
+def test_inline_export_streams_without_a_job():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'pdf2@example.com', 'secret')}"}
+    student = client.post("/students", json={"parent_name": "Pat", "student_name": "Sam"}, headers=headers).json()
+    url = f"/admin/reports/parent-report/{student['id']}/export/pdf"
+
+    assert client.get(url, headers=headers).headers["content-disposition"].endswith(f'parent_report_{student["id"]}.pdf"')
+    assert client.get("/admin/reports/parent-report/999999/export/pdf", headers=headers).status_code == 404
+    db = SessionLocal()
+    try:
+        assert db.query(Job).count() == 0
+    finally:
+        db.close()
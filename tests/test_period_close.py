@@ -0,0 +1,201 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.models.invoice import Invoice
+from backend.app.models.payment import Payment
+from backend.app.services import period_close
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def set_created_at(model, row_id: int, dt: datetime) -> None:
+    db = SessionLocal()
+    try:
+        db.get(model, row_id).created_at = dt
+        db.commit()
+    finally:
+        db.close()
+
+
+def bill(client: TestClient, headers: dict, student_id: int, invoiced_at: datetime, payments: list) -> int:
+    resp = client.post(
+        "/sessions",
+        json={
+            "student_id": student_id,
+            "subject": "Math",
+            "duration_minutes": 60,
+            "session_date": "2030-01-01T10:00:00Z",
+            "start_time": "10:00:00",
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    invoice = client.post(f"/invoices/{student_id}/generate", headers=headers).json()
+    set_created_at(Invoice, invoice["id"], invoiced_at)
+    for amount, paid_at in payments:
+        payment = client.post(
+            f"/invoices/{invoice['id']}/payments", json={"invoice_id": invoice["id"], "amount": amount}, headers=headers
+        ).json()
+        set_created_at(Payment, payment["id"], paid_at)
+    return invoice["id"]
+
+
+def setup_owner(client: TestClient, email: str) -> tuple:
+    headers = {"Authorization": f"Bearer {register_and_login(client, email, 'secret')}"}
+    student_id = client.post("/students", json={"parent_name": "P", "student_name": "S"}, headers=headers).json()["id"]
+    # Invoices of 60.00 each: January paid in full over two months, March half paid, April unpaid.
+    bill(
+        client,
+        headers,
+        student_id,
+        datetime(2025, 1, 10, tzinfo=timezone.utc),
+        [("40.00", datetime(2025, 1, 20, tzinfo=timezone.utc)), ("20.00", datetime(2025, 2, 3, tzinfo=timezone.utc))],
+    )
+    bill(client, headers, student_id, datetime(2025, 3, 5, tzinfo=timezone.utc), [("30.00", datetime(2025, 3, 6, tzinfo=timezone.utc))])
+    bill(client, headers, student_id, datetime(2025, 4, 1, tzinfo=timezone.utc), [])
+    return headers, student_id
+
+
+def revenue(client: TestClient, headers: dict, **params) -> list:
+    resp = client.get("/reports/monthly-revenue", params=params, headers=headers)
+    assert resp.status_code == 200
+    return [(row["year"], row["month"], row["total_revenue"]) for row in resp.json()]
+
+
+def test_closing_snapshots_every_month_up_to_the_target():
+    client = TestClient(app)
+    headers, _ = setup_owner(client, "close1@example.com")
+
+    resp = client.post("/reports/periods/close", json={"year": 2025, "month": 3}, headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["closed_through"] == {"year": 2025, "month": 3}
+    figures = [
+        (row["month"], row["revenue"], row["payment_count"], row["invoiced"], row["paid"], row["outstanding"])
+        for row in body["closed"]
+    ]
+    assert figures == [
+        (1, "40.00", 1, "60.00", "60.00", "0.00"),
+        (2, "20.00", 1, "0.00", "0.00", "0.00"),
+        (3, "30.00", 1, "60.00", "30.00", "30.00"),
+    ]
+
+    # Closing again through the same month is a no-op; a later month only adds what is new.
+    assert client.post("/reports/periods/close", json={"year": 2025, "month": 3}, headers=headers).json()["closed"] == []
+    later = client.post("/reports/periods/close", json={"year": 2025, "month": 5}, headers=headers).json()
+    assert [row["month"] for row in later["closed"]] == [4, 5]
+    assert [row["month"] for row in client.get("/reports/periods", headers=headers).json()] == [5, 4, 3, 2, 1]
+
+    assert client.post("/reports/periods/close", json={"year": 2999, "month": 1}, headers=headers).status_code == 400
+    other = {"Authorization": f"Bearer {register_and_login(client, 'close1b@example.com', 'secret')}"}
+    assert client.get("/reports/periods", headers=other).json() == []
+
+
+def test_racing_close_is_treated_as_done_or_conflict(monkeypatch):
+    client = TestClient(app)
+    headers, _ = setup_owner(client, "close4@example.com")
+    real_closed_through = period_close.closed_through
+    stale = []
+
+    def closed_through_before_other_request(db, owner_id):
+        # The first read misses the snapshots a concurrent request has just committed.
+        if stale:
+            return real_closed_through(db, owner_id)
+        stale.append(True)
+        return None
+
+    assert client.post("/reports/periods/close", json={"year": 2025, "month": 2}, headers=headers).status_code == 200
+
+    monkeypatch.setattr(period_close, "closed_through", closed_through_before_other_request)
+    resp = client.post("/reports/periods/close", json={"year": 2025, "month": 2}, headers=headers)
+    assert resp.status_code == 200
+    assert resp.json() == {"closed": [], "closed_through": {"year": 2025, "month": 2}}
+
+    stale.clear()
+    resp = client.post("/reports/periods/close", json={"year": 2025, "month": 3}, headers=headers)
+    assert resp.status_code == 409
+
+    monkeypatch.undo()
+    assert [row["month"] for row in client.get("/reports/periods", headers=headers).json()] == [2, 1]
+
+
+def test_closed_months_are_read_from_snapshots():
+    client = TestClient(app)
+    headers, student_id = setup_owner(client, "close2@example.com")
+    live = revenue(client, headers)
+    assert live == [(2025, 3, "30.00"), (2025, 2, "20.00"), (2025, 1, "40.00")]
+
+    client.post("/reports/periods/close", json={"year": 2025, "month": 2}, headers=headers)
+    # A payment backdated into a closed month no longer changes that month.
+    bill(client, headers, student_id, datetime(2025, 6, 1, tzinfo=timezone.utc), [("15.00", datetime(2025, 1, 25, tzinfo=timezone.utc))])
+    bill(client, headers, student_id, datetime(2025, 6, 1, tzinfo=timezone.utc), [("25.00", datetime(2025, 6, 2, tzinfo=timezone.utc))])
+
+    assert revenue(client, headers) == [(2025, 6, "25.00")] + live
+    # Edge months only partly inside the range are computed live.
+    assert revenue(client, headers, from_date="2025-01-21", to_date="2025-03-31") == [
+        (2025, 3, "30.00"),
+        (2025, 2, "20.00"),
+        (2025, 1, "15.00"),
+    ]
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        revenue(client, headers, from_date="2025-01-01", to_date="2025-02-28")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    payment_scans = [s for s in statements if "FROM payments" in s]
+    assert len(payment_scans) == 1 and "<" in payment_scans[0]
+
+    assert client.delete("/reports/periods/2025/2", headers=headers).json() == {"reopened": 1}
+    assert revenue(client, headers, from_date="2025-01-01", to_date="2025-02-28") == [(2025, 2, "20.00"), (2025, 1, "40.00")]
+    assert client.delete("/reports/periods/2025/1", headers=headers).json() == {"reopened": 1}
+    assert revenue(client, headers, from_date="2025-01-01", to_date="2025-02-28") == [(2025, 2, "20.00"), (2025, 1, "55.00")]
+
+
+def test_ytd_revenue_combines_closed_and_open_months():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'close3@example.com', 'secret')}"}
+    student_id = client.post("/students", json={"parent_name": "P", "student_name": "S"}, headers=headers).json()["id"]
+    now = datetime.now(timezone.utc)
+    if now.month == 1:
+        pytest.skip("needs a closed month earlier in the current year")
+    bill(
+        client,
+        headers,
+        student_id,
+        datetime(now.year, 1, 2, tzinfo=timezone.utc),
+        [
+            ("10.00", datetime(now.year - 1, 12, 30, tzinfo=timezone.utc)),
+            ("20.00", datetime(now.year, 1, 5, tzinfo=timezone.utc)),
+            ("30.00", now),
+        ],
+    )
+    before = client.get("/revenue/ytd", headers=headers).json()
+    assert before["ytd_revenue"] == "50.00"
+
+    client.post("/reports/periods/close", json={"year": now.year, "month": now.month - 1}, headers=headers)
+    assert client.get("/revenue/ytd", headers=headers).json() == before
@@ -0,0 +1,139 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.models.rate_history import RateHistory
+from backend.app.models.rate_settings import RateSettings
+from backend.app.models.user import User
+from backend.app.services.rate_resolution import get_owner_rates, load_owner_rates
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def create_session(client: TestClient, headers: dict, student_id: int, duration: int = 60) -> dict:
+    resp = client.post(
+        "/sessions",
+        json={
+            "student_id": student_id,
+            "subject": "Math",
+            "duration_minutes": duration,
+            "session_date": "2030-01-07T10:00:00Z",
+            "start_time": "10:00:00",
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def count_selects(fn) -> int:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return len(statements)
+
+
+def test_history_lookup_bisects_to_the_effective_rate():
+    db = SessionLocal()
+    try:
+        owner = User(email="resolve1@example.com", hashed_password="x")
+        db.add(owner)
+        db.flush()
+        db.add_all(
+            [
+                RateHistory(owner_id=owner.id, rate_per_hour=Decimal("80.00"), effective_at=datetime(2030, 1, 1, tzinfo=timezone.utc)),
+                RateHistory(owner_id=owner.id, rate_per_hour=Decimal("50.00"), effective_at=datetime(2020, 1, 1, tzinfo=timezone.utc)),
+                RateHistory(owner_id=owner.id, rate_per_hour=Decimal("65.00"), effective_at=datetime(2025, 6, 1, tzinfo=timezone.utc)),
+            ]
+        )
+        db.commit()
+        rates = load_owner_rates(db, owner.id)
+    finally:
+        db.close()
+
+    assert rates.hourly_rate_at(datetime(2019, 12, 31, tzinfo=timezone.utc)) == Decimal("60.00")
+    assert rates.hourly_rate_at(datetime(2020, 1, 1, tzinfo=timezone.utc)) == Decimal("50.00")
+    assert rates.hourly_rate_at(datetime(2025, 5, 31, 23, 59)) == Decimal("50.00")
+    assert rates.hourly_rate_at(datetime(2027, 3, 1, tzinfo=timezone.utc)) == Decimal("65.00")
+    assert rates.hourly_rate_at(datetime(2031, 1, 1, tzinfo=timezone.utc)) == Decimal("80.00")
+    assert rates.cost_at(45, datetime(2027, 3, 1, tzinfo=timezone.utc)) == Decimal("48.75")
+    # Defaults apply without a rate_settings row.
+    assert rates.session_rate("discount", 45) == Decimal("45.00")
+    assert rates.session_rate("regular", 90) is None
+    with pytest.raises(TypeError):
+        rates.matrix[("regular", 60)] = Decimal("1.00")
+
+
+def test_rates_are_cached_until_they_change():
+    db = SessionLocal()
+    try:
+        owner = User(email="resolve2@example.com", hashed_password="x")
+        db.add(owner)
+        db.commit()
+        first = get_owner_rates(db, owner.id)
+        # A cache hit is a single data-version lookup.
+        assert count_selects(lambda: get_owner_rates(db, owner.id)) == 1
+        assert get_owner_rates(db, owner.id) is first
+
+        db.add(RateSettings(owner_id=owner.id, regular_rate_60=Decimal("99.00")))
+        db.commit()
+        assert get_owner_rates(db, owner.id).session_rate("regular", 60) == Decimal("99.00")
+    finally:
+        db.close()
+
+
+def test_session_pricing_follows_rate_changes_without_writing_settings():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'resolve3@example.com', 'secret')}"}
+    student_id = client.post("/students", json={"parent_name": "P", "student_name": "S"}, headers=headers).json()["id"]
+
+    assert create_session(client, headers, student_id)["cost_total"] == 60.0
+    db = SessionLocal()
+    try:
+        assert db.query(RateSettings).count() == 0
+    finally:
+        db.close()
+
+    assert client.put("/settings/rates", json={"regular_rate_60": "85.00"}, headers=headers).status_code == 200
+    assert create_session(client, headers, student_id)["cost_total"] == 85.0
+    assert create_session(client, headers, student_id, duration=30)["cost_total"] == 30.0
+
+
+def test_current_rate_can_be_resolved_at_a_past_date():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'resolve4@example.com', 'secret')}"}
+    assert client.get("/rates/current", headers=headers).json() == {"rate_per_hour": 60.0}
+
+    client.post("/rates", json={"rate_per_hour": 50.0, "effective_at": "2020-01-01T00:00:00Z"}, headers=headers)
+    client.post("/rates", json={"rate_per_hour": 70.0, "effective_at": "2024-01-01T00:00:00Z"}, headers=headers)
+
+    assert client.get("/rates/current", headers=headers).json() == {"rate_per_hour": 70.0}
+    past = client.get("/rates/current", params={"at": "2023-06-01T00:00:00Z"}, headers=headers)
+    assert past.json() == {"rate_per_hour": 50.0}
@@ -0,0 +1,98 @@
+import pytest
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.db.snapshot import read_snapshot, snapshot_session
+from backend.app.models.student import Student
+from backend.app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def add_student(owner_id: int, name: str) -> None:
+    db = SessionLocal()
+    try:
+        db.add(Student(owner_id=owner_id, parent_name="P", student_name=name))
+        db.commit()
+    finally:
+        db.close()
+
+
+def setup_owner() -> int:
+    db = SessionLocal()
+    try:
+        owner = User(email="snapshot@example.com", hashed_password="x")
+        db.add(owner)
+        db.commit()
+        return owner.id
+    finally:
+        db.close()
+
+
+def student_count(db, owner_id: int) -> int:
+    return db.query(Student).filter(Student.owner_id == owner_id).count()
+
+
+def test_reads_inside_a_snapshot_ignore_later_commits():
+    owner_id = setup_owner()
+    add_student(owner_id, "Ada")
+    db = SessionLocal()
+    try:
+        with snapshot_session(db) as snapshot:
+            assert student_count(snapshot, owner_id) == 1
+            add_student(owner_id, "Ben")
+            assert student_count(snapshot, owner_id) == 1
+        assert student_count(db, owner_id) == 2
+    finally:
+        db.close()
+
+
+def test_nested_reports_share_the_outer_snapshot():
+    owner_id = setup_owner()
+    sessions = []
+
+    @read_snapshot
+    def inner(db):
+        sessions.append(db)
+        return student_count(db, owner_id)
+
+    @read_snapshot
+    def outer(db):
+        sessions.append(db)
+        before = inner(db)
+        add_student(owner_id, "Ada")
+        return before, inner(db)
+
+    db = SessionLocal()
+    try:
+        assert outer(db) == (0, 0)
+        assert sessions[0] is not db and len({id(s) for s in sessions}) == 1
+    finally:
+        db.close()
+
+
+def test_uncommitted_writes_stay_visible_to_the_report():
+    owner_id = setup_owner()
+    report = read_snapshot(lambda db: student_count(db, owner_id))
+    db = SessionLocal()
+    try:
+        db.add(Student(owner_id=owner_id, parent_name="P", student_name="Ada"))
+        db.flush()
+        assert report(db) == 1
+        db.rollback()
+        assert report(db) == 0
+    finally:
+        db.close()
+
+
+def test_sqlite_database_uses_wal():
+    if engine.dialect.name != "sqlite":
+        pytest.skip("SQLite only")
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
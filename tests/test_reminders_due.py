@@ -0,0 +1,224 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.services.reminders import (
+    ReminderScheduler,
+    register_notification_hook,
+    unregister_notification_hook,
+)
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def create_lead(client: TestClient, token: str) -> int:
+    resp = client.post("/leads", json={"parent_name": "Parent", "student_name": "Student"}, headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200
+    return resp.json()["id"]
+
+
+def create_reminder(client: TestClient, token: str, lead_id: int, title: str, due_at: datetime | None) -> dict:
+    body = {"title": title}
+    if due_at is not None:
+        body["due_at"] = due_at.isoformat()
+    resp = client.post(f"/reminders/leads/{lead_id}/reminders", json=body, headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def test_due_reminders_span_all_leads_and_split_overdue():
+    client = TestClient(app)
+    token = register_and_login(client, "due1@example.com", "secret")
+    headers = {"Authorization": f"Bearer {token}"}
+    now = datetime.now(timezone.utc)
+    lead_a, lead_b = create_lead(client, token), create_lead(client, token)
+
+    create_reminder(client, token, lead_a, "Late", now - timedelta(days=2))
+    create_reminder(client, token, lead_b, "Soon", now + timedelta(seconds=30))
+    create_reminder(client, token, lead_a, "Next week", now + timedelta(days=7))
+    create_reminder(client, token, lead_b, "Undated", None)
+    done = create_reminder(client, token, lead_b, "Done", now - timedelta(hours=1))
+    client.put(f"/reminders/{done['id']}", json={"completed": True}, headers=headers)
+
+    other = register_and_login(client, "due1b@example.com", "secret")
+    create_reminder(client, other, create_lead(client, other), "Not mine", now - timedelta(hours=1))
+
+    resp = client.get("/reminders/due", headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [r["title"] for r in data["overdue"]] == ["Late"]
+    soon = [r["title"] for r in data["due"]]
+    # "Soon" may spill into tomorrow when the test runs just before midnight UTC.
+    assert soon in (["Soon"], [])
+
+    week = client.get("/reminders/due", params={"until": (now + timedelta(days=8)).isoformat()}, headers=headers).json()
+    assert [r["title"] for r in week["overdue"] + week["due"]] == ["Late", "Soon", "Next week"]
+
+    upcoming = client.get(
+        "/reminders/due",
+        params={"until": (now + timedelta(days=8)).isoformat(), "include_overdue": "false"},
+        headers=headers,
+    ).json()
+    assert upcoming["overdue"] == []
+    assert [r["title"] for r in upcoming["due"]] == ["Soon", "Next week"]
+
+
+def test_due_reminders_query_uses_owner_index():
+    db = SessionLocal()
+    try:
+        plan = db.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM reminders "
+                "WHERE owner_id = 1 AND completed = 0 AND due_at < '2030-01-01' ORDER BY due_at"
+            )
+        ).fetchall()
+    finally:
+        db.close()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_reminders_owner_completed_due_at" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_scheduler_fires_in_due_order_and_skips_stale():
+    client = TestClient(app)
+    token = register_and_login(client, "due2@example.com", "secret")
+    headers = {"Authorization": f"Bearer {token}"}
+    lead_id = create_lead(client, token)
+    now = datetime.now(timezone.utc)
+
+    second = create_reminder(client, token, lead_id, "Second", now + timedelta(minutes=2))
+    first = create_reminder(client, token, lead_id, "First", now + timedelta(minutes=1))
+    completed = create_reminder(client, token, lead_id, "Completed", now + timedelta(minutes=3))
+    deleted = create_reminder(client, token, lead_id, "Deleted", now + timedelta(minutes=4))
+    moved = create_reminder(client, token, lead_id, "Moved", now + timedelta(minutes=5))
+    create_reminder(client, token, lead_id, "Later", now + timedelta(hours=2))
+
+    fired = []
+    hook = register_notification_hook(fired.append)
+    scheduler = ReminderScheduler(horizon=timedelta(minutes=30))
+    try:
+        assert scheduler.refresh(now) == 5
+        assert scheduler.next_due() == datetime.fromisoformat(first["due_at"])
+        assert scheduler.fire_due(now) == []
+
+        # Changes after the refresh are seen when the reminder pops.
+        client.put(f"/reminders/{completed['id']}", json={"completed": True}, headers=headers)
+        client.delete(f"/reminders/{deleted['id']}", headers=headers)
+        client.put(f"/reminders/{moved['id']}", json={"due_at": (now + timedelta(days=1)).isoformat()}, headers=headers)
+
+        payloads = scheduler.fire_due(now + timedelta(minutes=10))
+        assert [p["title"] for p in payloads] == ["First", "Second"]
+        assert fired == payloads
+        assert payloads[0]["id"] == first["id"] and payloads[1]["id"] == second["id"]
+
+        # Already fired reminders are not announced again after a refresh.
+        scheduler.refresh(now + timedelta(minutes=10))
+        assert scheduler.fire_due(now + timedelta(minutes=11)) == []
+    finally:
+        unregister_notification_hook(hook)
+
+
+def test_scheduler_tracks_reminders_created_after_refresh():
+    client = TestClient(app)
+    token = register_and_login(client, "due3@example.com", "secret")
+    lead_id = create_lead(client, token)
+    now = datetime.now(timezone.utc)
+
+    scheduler = ReminderScheduler(horizon=timedelta(minutes=30))
+    scheduler.refresh(now)
+    created = create_reminder(client, token, lead_id, "New", now + timedelta(minutes=5))
+    scheduler.schedule(created["id"], datetime.fromisoformat(created["due_at"]))
+    assert len(scheduler) == 1
+
+    scheduler.cancel(created["id"])
+    assert scheduler.next_due() is None
+
+    scheduler.schedule(created["id"], datetime.fromisoformat(created["due_at"]))
+    assert [p["id"] for p in scheduler.fire_due(now + timedelta(minutes=5))] == [created["id"]]
+
+
+def test_scheduler_thread_notifies_hook():
+    client = TestClient(app)
+    token = register_and_login(client, "due4@example.com", "secret")
+    lead_id = create_lead(client, token)
+
+    fired = []
+    hook = register_notification_hook(fired.append)
+    scheduler = ReminderScheduler(horizon=timedelta(minutes=5), refresh_interval=timedelta(milliseconds=50))
+    scheduler.start()
+    try:
+        reminder = create_reminder(client, token, lead_id, "Right away", datetime.now(timezone.utc) + timedelta(milliseconds=100))
+        deadline = datetime.now(timezone.utc) + timedelta(seconds=5)
+        while not fired and datetime.now(timezone.utc) < deadline:
+            time.sleep(0.05)
+    finally:
+        scheduler.stop()
+        unregister_notification_hook(hook)
+    assert [p["id"] for p in fired] == [reminder["id"]]
+
+
+def test_due_reminders_page_past_a_long_overdue_backlog():
+    client = TestClient(app)
+    token = register_and_login(client, "due5@example.com", "secret")
+    headers = {"Authorization": f"Bearer {token}"}
+    lead_id = create_lead(client, token)
+    now = datetime.now(timezone.utc)
+    for days in (3, 2, 1):
+        create_reminder(client, token, lead_id, f"Late {days}", now - timedelta(days=days))
+    create_reminder(client, token, lead_id, "Next week", now + timedelta(days=7))
+
+    params = {"until": (now + timedelta(days=8)).isoformat(), "limit": 2}
+    titles, cursor = [], None
+    for _ in range(3):
+        resp = client.get("/reminders/due", params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert resp.status_code == 200
+        page = resp.json()
+        titles.append([r["title"] for r in page["overdue"] + page["due"]])
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert titles == [["Late 3", "Late 2"], ["Late 1", "Next week"]]
+
+    assert client.get("/reminders/due", params={"cursor": "garbage"}, headers=headers).status_code == 400
+
+
+def test_each_reminder_is_announced_by_one_scheduler():
+    client = TestClient(app)
+    token = register_and_login(client, "due6@example.com", "secret")
+    headers = {"Authorization": f"Bearer {token}"}
+    lead_id = create_lead(client, token)
+    now = datetime.now(timezone.utc)
+    reminder = create_reminder(client, token, lead_id, "Once", now + timedelta(minutes=1))
+
+    # One scheduler per worker process, all watching the same database.
+    workers = [ReminderScheduler(horizon=timedelta(minutes=30)) for _ in range(3)]
+    for scheduler in workers:
+        scheduler.refresh(now)
+    announced = [p["id"] for scheduler in workers for p in scheduler.fire_due(now + timedelta(minutes=2))]
+    assert announced == [reminder["id"]]
+
+    # A rescheduled reminder is announced again for its new due time.
+    client.put(f"/reminders/{reminder['id']}", json={"due_at": (now + timedelta(minutes=5)).isoformat()}, headers=headers)
+    for scheduler in workers:
+        scheduler.refresh(now + timedelta(minutes=2))
+    announced = [p["id"] for scheduler in workers for p in scheduler.fire_due(now + timedelta(minutes=6))]
+    assert announced == [reminder["id"]]
@@ -0,0 +1,147 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.models.user import User
+from backend.app.services.report_batch import REPORT_HANDLERS, run_report_batch
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def setup_owner(client: TestClient) -> dict:
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'batch@example.com', 'secret')}"}
+    student_id = client.post("/students", json={"parent_name": "P", "student_name": "S"}, headers=headers).json()["id"]
+    client.post(
+        "/sessions",
+        json={
+            "student_id": student_id,
+            "subject": "Math",
+            "duration_minutes": 60,
+            "session_date": "2030-06-01T10:00:00Z",
+            "start_time": "10:00:00",
+        },
+        headers=headers,
+    )
+    invoice = client.post(f"/invoices/{student_id}/generate", headers=headers).json()
+    client.post(f"/invoices/{invoice['id']}/payments", json={"invoice_id": invoice["id"], "amount": "25.00"}, headers=headers)
+    return headers
+
+
+def test_batch_matches_the_individual_endpoints():
+    client = TestClient(app)
+    headers = setup_owner(client)
+    today = {"today": "2030-06-15"}
+    batch = [
+        ("dashboard_summary", today, "/admin/dashboard/summary", today),
+        ("aging_summary", {"as_of": "2030-06-15"}, "/admin/reports/aging-summary", {"as_of": "2030-06-15"}),
+        ("payment_analytics", today, "/admin/reports/payment-analytics", today),
+        ("invoice_pipeline", today, "/admin/reports/invoice-pipeline", today),
+        ("revenue_ytd", {}, "/revenue/ytd", {}),
+        ("financial_summary", {"start_date": "2030-01-01"}, "/admin/reports/financial-summary", {"start_date": "2030-01-01"}),
+    ]
+    resp = client.post(
+        "/admin/reports/batch",
+        json={"reports": [{"name": name, "params": params} for name, params, _, _ in batch]},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [result["name"] for result in body["results"]] == [name for name, _, _, _ in batch]
+    for result, (_, _, path, query) in zip(body["results"], batch):
+        assert result["status"] == "ok" and result["status_code"] == 200
+        assert result["elapsed_ms"] >= 0
+        assert result["data"] == client.get(path, params=query, headers=headers).json()
+    assert body["elapsed_ms"] >= 0
+
+
+def test_failed_reports_do_not_fail_the_batch():
+    client = TestClient(app)
+    headers = setup_owner(client)
+    resp = client.post(
+        "/admin/reports/batch",
+        json={
+            "reports": [
+                {"name": "activity_summary", "params": {"start_date": "2030-02-01", "end_date": "2030-01-01"}},
+                {"name": "aging_summary", "params": {"as_of": "not-a-date"}},
+                {"name": "lead_funnel"},
+            ]
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [(r["status"], r["status_code"]) for r in results] == [("error", 400), ("error", 400), ("ok", 200)]
+    assert results[1]["error"] == "Invalid as_of" and results[1]["data"] is None
+
+    unknown = client.post("/admin/reports/batch", json={"reports": [{"name": "nope"}]}, headers=headers)
+    assert unknown.status_code == 400
+    assert client.post("/admin/reports/batch", json={"reports": []}, headers=headers).status_code == 422
+    assert client.post("/admin/reports/batch", json={"reports": [{"name": "lead_funnel"}]}).status_code == 401
+
+
+def test_batch_loads_invoices_and_payments_once():
+    client = TestClient(app)
+    setup_owner(client)
+    loads = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        for table in ("invoices", "payments"):
+            if statement.lstrip().startswith(f"SELECT {table}.id AS {table}_id"):
+                loads.append(table)
+
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        owner_id = db.query(User.id).filter(User.email == "batch@example.com").scalar()
+        reports = [
+            {"name": name, "params": {"today": "2030-06-15"}}
+            for name in ("dashboard_summary", "aging_summary", "payment_analytics", "invoice_pipeline")
+        ]
+        results = run_report_batch(db, owner_id=owner_id, reports=reports)["results"]
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+        db.close()
+    assert [result["status"] for result in results] == ["ok"] * 4
+    assert sorted(loads) == ["invoices", "payments"]
+
+
+def test_a_failed_query_is_rolled_back_to_its_own_savepoint(monkeypatch):
+    client = TestClient(app)
+    setup_owner(client)
+
+    def broken(db, owner_id, params, data):
+        db.execute(text("SELECT * FROM nope"))
+
+    monkeypatch.setitem(REPORT_HANDLERS, "broken", broken)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        owner_id = db.query(User.id).filter(User.email == "batch@example.com").scalar()
+        reports = [{"name": "broken"}, {"name": "revenue_ytd"}]
+        results = run_report_batch(db, owner_id=owner_id, reports=reports)["results"]
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+        db.close()
+    assert [(r["status"], r["status_code"]) for r in results] == [("error", 500), ("ok", 200)]
+    assert any(statement.startswith("ROLLBACK TO SAVEPOINT") for statement in statements)
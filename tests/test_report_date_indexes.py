@@ -0,0 +1,84 @@
+from datetime import UTC, date, datetime
+
+import pytest
+from sqlalchemy import event
+
+from backend.app.core.time import date_range_filters, day_start
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.models.invoice import Invoice
+from backend.app.services.activity_reporting import get_activity_summary
+from backend.app.services.exports import iter_export
+from backend.app.services.period_close import monthly_revenue_cents
+from backend.app.services.reports import get_financial_summary_for_owner
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def query_plans(run) -> list[tuple[str, str]]:
+    """Run ``run(db)`` and return (statement, EXPLAIN QUERY PLAN details) for every SELECT it issued."""
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        run(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    try:
+        plans = []
+        for statement, parameters in captured:
+            rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plans.append((statement, " ".join(row[-1] for row in rows)))
+        return plans
+    finally:
+        db.close()
+
+
+def plan_for(plans: list[tuple[str, str]], table: str) -> str:
+    matching = [details for statement, details in plans if f"FROM {table}" in statement]
+    assert matching, f"no query against {table}"
+    return matching[0]
+
+
+def test_date_range_filters_are_half_open_over_whole_days():
+    lower, upper = date_range_filters(Invoice.created_at, date(2030, 1, 1), date(2030, 1, 31))
+    assert lower.right.value == datetime(2030, 1, 1, tzinfo=UTC)
+    assert upper.operator.__name__ == "lt" and upper.right.value == datetime(2030, 2, 1, tzinfo=UTC)
+    assert date_range_filters(Invoice.created_at) == []
+    assert day_start(date(2030, 1, 1)).tzinfo is UTC
+
+
+def test_activity_summary_ranges_use_timestamp_indexes():
+    plans = query_plans(lambda db: get_activity_summary(db, owner_id=1, start_date=date(2030, 1, 1)))
+    assert all("date(" not in statement.lower() for statement, _ in plans)
+    assert "ix_sessions_owner_session_date" in plan_for(plans, "sessions")
+    assert "ix_invoices_owner_created_at" in plan_for(plans, "invoices")
+
+
+def test_financial_summary_range_uses_invoice_index():
+    plans = query_plans(lambda db: get_financial_summary_for_owner(db, 1, start_date=date(2030, 1, 1)))
+    assert "ix_invoices_owner_created_at" in plan_for(plans, "invoices")
+
+
+def test_live_revenue_scan_uses_payment_index():
+    plans = query_plans(lambda db: monthly_revenue_cents(db, 1, date(2030, 1, 1), date(2030, 3, 31)))
+    assert "ix_payments_owner_created_at" in plan_for(plans, "payments")
+
+
+def test_session_export_range_uses_session_date_index():
+    export = lambda db: list(
+        iter_export(lambda: db, owner_id=1, dataset="sessions", start_date=date(2030, 1, 1), end_date=date(2030, 1, 31))
+    )
+    plans = query_plans(export)
+    assert "ix_sessions_owner_session_date" in plan_for(plans, "sessions")
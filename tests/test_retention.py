@@ -0,0 +1,185 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event as sa_event, insert
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.models.audit_log import AuditLog
+from backend.app.models.lead import Lead
+from backend.app.models.timeline import TimelineEvent
+from backend.app.models.user import User
+from backend.app.services.data_versions import get_owner_data_version
+from backend.app.services.retention import TIMELINE_POLICIES, RetentionPolicy, run_retention
+
+NOW = datetime(2031, 6, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def seed(db) -> tuple:
+    owner = User(email="retention@example.com", hashed_password="x")
+    db.add(owner)
+    db.flush()
+    leads = [Lead(owner_id=owner.id, parent_name="P", student_name=f"S{i}") for i in range(3)]
+    db.add_all(leads)
+    db.commit()
+    return owner.id, [lead.id for lead in leads]
+
+
+def event(lead_id: int, owner_id: int, event_type: str, created_at: datetime, description: str = "x") -> dict:
+    return {"lead_id": lead_id, "owner_id": owner_id, "event_type": event_type, "description": description, "created_at": created_at}
+
+
+def read_archive(path: str) -> list:
+    with gzip.open(path, "rt") as fh:
+        return [json.loads(line) for line in fh]
+
+
+def timeline(db, lead_id: int) -> list:
+    return (
+        db.query(TimelineEvent.event_type, TimelineEvent.description)
+        .filter(TimelineEvent.lead_id == lead_id)
+        .order_by(TimelineEvent.created_at, TimelineEvent.id)
+        .all()
+    )
+
+
+def test_old_lead_updates_are_compacted_per_lead_and_day(db, tmp_path):
+    owner_id, (lead_a, lead_b, _) = seed(db)
+    day = NOW - timedelta(days=60)
+    db.execute(
+        insert(TimelineEvent.__table__),
+        [
+            event(lead_a, owner_id, "lead_updated", day, "Lead updated: notes changed"),
+            event(lead_a, owner_id, "lead_updated", day + timedelta(hours=1), "Lead updated: grade_level changed; notes changed"),
+            event(lead_a, owner_id, "status_changed", day + timedelta(hours=2), "Status changed from new to contacted"),
+            event(lead_a, owner_id, "lead_updated", day + timedelta(hours=3), "Lead updated: parent_name changed"),
+            # A single update on a day is left alone.
+            event(lead_a, owner_id, "lead_updated", day + timedelta(days=1), "Lead updated: notes changed"),
+            # Recent updates are not compacted yet.
+            event(lead_b, owner_id, "lead_updated", NOW - timedelta(days=1), "Lead updated: notes changed"),
+            event(lead_b, owner_id, "lead_updated", NOW - timedelta(days=1, hours=-1), "Lead updated: notes changed"),
+        ],
+    )
+    db.commit()
+    version_before = get_owner_data_version(db, owner_id, ("leads",))
+
+    stats = run_retention(db, archive_dir=tmp_path, now=NOW, chunk_size=2)
+
+    assert stats["timeline_events"]["compacted_groups"] == 1
+    assert stats["timeline_events"]["compacted_rows"] == 3
+    assert timeline(db, lead_a) == [
+        ("status_changed", "Status changed from new to contacted"),
+        ("lead_updated_daily", "Lead updated 3 times: notes changed; grade_level changed; parent_name changed"),
+        ("lead_updated", "Lead updated: notes changed"),
+    ]
+    assert len(timeline(db, lead_b)) == 2
+    archived = read_archive(stats["timeline_events"]["archive"])
+    assert [row["event_type"] for row in archived] == ["lead_updated"] * 3
+    assert get_owner_data_version(db, owner_id, ("leads",)) > version_before
+
+
+def test_compaction_chunks_by_rows_not_leads(db, tmp_path):
+    owner_id, (busy, _, _) = seed(db)
+    quiet = [Lead(owner_id=owner_id, parent_name="P", student_name=f"Q{i}") for i in range(5)]
+    db.add_all(quiet)
+    db.commit()
+    day = NOW - timedelta(days=60)
+    rows = [event(busy, owner_id, "lead_updated", day + timedelta(minutes=i), "Lead updated: notes changed") for i in range(9)]
+    for lead in quiet:
+        rows += [event(lead.id, owner_id, "lead_updated", day + timedelta(minutes=i), "Lead updated: notes changed") for i in range(3)]
+    db.execute(insert(TimelineEvent.__table__), rows)
+    db.commit()
+
+    delete_sizes = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM timeline_events"):
+            delete_sizes.append(len(parameters))
+
+    sa_event.listen(engine, "before_cursor_execute", record)
+    try:
+        stats = run_retention(db, archive_dir=tmp_path, now=NOW, chunk_size=4)
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", record)
+
+    assert stats["timeline_events"]["compacted_groups"] == 6
+    assert stats["timeline_events"]["compacted_rows"] == 24
+    assert timeline(db, busy) == [("lead_updated_daily", "Lead updated 9 times: notes changed")]
+    assert delete_sizes and max(delete_sizes) <= 4
+
+
+def test_expired_rows_are_archived_then_deleted_in_chunks(db, tmp_path):
+    owner_id, (lead_id, _, _) = seed(db)
+    old = NOW - timedelta(days=400)
+    db.execute(
+        insert(TimelineEvent.__table__),
+        [event(lead_id, owner_id, "note_added", old + timedelta(minutes=i), f"Note {i}") for i in range(7)]
+        + [
+            event(lead_id, owner_id, "lead_created", old - timedelta(days=1), "Lead created"),
+            event(lead_id, owner_id, "status_changed", old, "Status changed from new to contacted"),
+            event(lead_id, owner_id, "note_added", NOW - timedelta(days=3), "Recent note"),
+        ],
+    )
+    db.execute(
+        insert(AuditLog.__table__),
+        [
+            {"owner_id": owner_id, "acting_user_id": owner_id, "action": "anonymize", "created_at": NOW - timedelta(days=800)},
+            {"owner_id": owner_id, "acting_user_id": owner_id, "action": "anonymize", "created_at": NOW - timedelta(days=10)},
+        ],
+    )
+    db.commit()
+
+    stats = run_retention(db, archive_dir=tmp_path, now=NOW, chunk_size=3)
+
+    assert stats["timeline_events"]["deleted"] == 7
+    assert [row["description"] for row in read_archive(stats["timeline_events"]["archive"])] == [f"Note {i}" for i in range(7)]
+    assert [description for _, description in timeline(db, lead_id)] == [
+        "Lead created",
+        "Status changed from new to contacted",
+        "Recent note",
+    ]
+    assert stats["audit_logs"]["deleted"] == 1
+    assert [row["action"] for row in read_archive(stats["audit_logs"]["archive"])] == ["anonymize"]
+    assert db.query(AuditLog).count() == 1
+
+    # Nothing left to do on a second run, and no empty archive files are written.
+    again = run_retention(db, archive_dir=tmp_path, now=NOW + timedelta(seconds=1))
+    assert again["timeline_events"]["deleted"] == 0 and again["timeline_events"]["archive"] is None
+    assert again["audit_logs"]["archive"] is None
+
+
+def test_policies_are_configurable_per_event_type(db, tmp_path):
+    owner_id, (lead_id, _, _) = seed(db)
+    db.execute(
+        insert(TimelineEvent.__table__),
+        [
+            event(lead_id, owner_id, "reminder_created", NOW - timedelta(days=40)),
+            event(lead_id, owner_id, "note_added", NOW - timedelta(days=40)),
+        ],
+    )
+    db.commit()
+
+    policies = {**TIMELINE_POLICIES, "reminder_created": RetentionPolicy(keep_days=30)}
+    stats = run_retention(db, archive_dir=tmp_path, now=NOW, timeline_policies=policies, audit_log_policy=RetentionPolicy())
+
+    assert stats["timeline_events"]["deleted"] == 1
+    assert [event_type for event_type, _ in timeline(db, lead_id)] == ["note_added"]
@@ -0,0 +1,163 @@
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.services.repricing import reprice_sessions
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def create_student(client: TestClient, headers: dict) -> int:
+    resp = client.post("/students", json={"parent_name": "Parent", "student_name": "Student"}, headers=headers)
+    return resp.json()["id"]
+
+
+def create_session(client: TestClient, headers: dict, student_id: int, day: str, duration: int = 60) -> int:
+    resp = client.post(
+        "/sessions",
+        json={
+            "student_id": student_id,
+            "subject": "Math",
+            "duration_minutes": duration,
+            "session_date": f"{day}T00:00:00Z",
+            "start_time": "10:00:00",
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def costs(client: TestClient, headers: dict) -> dict:
+    return {s["id"]: s["cost_total"] for s in client.get("/sessions", headers=headers).json()}
+
+
+def test_dry_run_reports_diff_without_writing():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'reprice1@example.com', 'secret')}"}
+    student_id = create_student(client, headers)
+    hour = create_session(client, headers, student_id, "2030-01-07")
+    half = create_session(client, headers, student_id, "2030-01-08", duration=30)
+    client.put("/settings/rates", json={"regular_rate_60": "80.00"}, headers=headers)
+
+    before = costs(client, headers)
+    resp = client.post("/sessions/reprice", json={"dry_run": True}, headers=headers)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert (report["matched"], report["changed"], report["updated"]) == (2, 1, 0)
+    assert (report["old_total"], report["new_total"], report["delta"]) == ("90.00", "110.00", "20.00")
+    assert [change["session_id"] for change in report["changes"]] == [hour]
+    assert report["changes"][0]["old_cost_total"] == "60.00" and report["changes"][0]["new_cost_total"] == "80.00"
+    assert costs(client, headers) == before
+
+    resp = client.post("/sessions/reprice", json={}, headers=headers)
+    assert resp.json()["updated"] == 1
+    assert costs(client, headers) == {hour: 80.0, half: 30.0}
+    assert client.post("/sessions/reprice", json={}, headers=headers).json()["changed"] == 0
+
+
+def test_filters_and_billed_sessions_are_respected():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'reprice2@example.com', 'secret')}"}
+    billed_student = create_student(client, headers)
+    other_student = create_student(client, headers)
+    billed = create_session(client, headers, billed_student, "2030-01-07")
+    assert client.post(f"/invoices/{billed_student}/generate", headers=headers).status_code == 201
+    january = create_session(client, headers, other_student, "2030-01-20")
+    february = create_session(client, headers, other_student, "2030-02-03")
+    client.put("/settings/rates", json={"regular_rate_60": "75.00"}, headers=headers)
+
+    report = client.post(
+        "/sessions/reprice", json={"start_date": "2030-01-01", "end_date": "2030-01-31"}, headers=headers
+    ).json()
+    assert report["matched"] == 1 and report["updated"] == 1
+    assert costs(client, headers) == {billed: 60.0, january: 75.0, february: 60.0}
+
+    report = client.post("/sessions/reprice", json={"student_id": other_student, "plan": "discount"}, headers=headers).json()
+    assert report["matched"] == 0
+
+    assert client.post("/sessions/reprice", json={"start_date": "2030-02-01", "end_date": "2030-01-01"}, headers=headers).status_code == 400
+    other = {"Authorization": f"Bearer {register_and_login(client, 'reprice2b@example.com', 'secret')}"}
+    assert client.post("/sessions/reprice", json={"student_id": other_student}, headers=other).status_code == 404
+
+
+def test_history_pricing_uses_rate_effective_on_session_date():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'reprice3@example.com', 'secret')}"}
+    student_id = create_student(client, headers)
+    old = create_session(client, headers, student_id, "2029-06-03", duration=45)
+    new = create_session(client, headers, student_id, "2030-06-03", duration=30)
+    client.post("/rates", json={"rate_per_hour": 40.0, "effective_at": "2029-01-01T00:00:00Z"}, headers=headers)
+    client.post("/rates", json={"rate_per_hour": 90.0, "effective_at": "2030-01-01T00:00:00Z"}, headers=headers)
+
+    report = client.post("/sessions/reprice", json={"pricing": "history"}, headers=headers).json()
+    assert report["updated"] == 2
+    sessions = {s["id"]: s for s in client.get("/sessions", headers=headers).json()}
+    assert (sessions[old]["rate_per_hour"], sessions[old]["cost_total"]) == (40.0, 30.0)
+    assert (sessions[new]["rate_per_hour"], sessions[new]["cost_total"]) == (90.0, 45.0)
+
+
+def test_updates_run_one_statement_per_chunk_and_bump_versions():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'reprice4@example.com', 'secret')}"}
+    student_id = create_student(client, headers)
+    for day in range(1, 8):
+        create_session(client, headers, student_id, f"2030-01-{day:02d}")
+    client.put("/settings/rates", json={"regular_rate_60": "70.00"}, headers=headers)
+    owner_id = client.get("/sync/versions", headers=headers).json()["owner_id"]
+    before = client.get("/sync/versions", headers=headers).json()["versions"]["sessions"]
+
+    updates = []
+
+    def count_updates(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE SESSIONS"):
+            updates.append(statement)
+
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", count_updates)
+    try:
+        report = reprice_sessions(db, owner_id=owner_id, chunk_size=3)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_updates)
+        db.close()
+    assert report["updated"] == 7
+    assert len(updates) == 3
+    assert client.get("/sync/versions", headers=headers).json()["versions"]["sessions"] > before
+
+
+def test_repricing_runs_as_background_job():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'reprice5@example.com', 'secret')}"}
+    student_id = create_student(client, headers)
+    session_id = create_session(client, headers, student_id, "2030-01-07")
+    client.put("/settings/rates", json={"regular_rate_60": "65.00"}, headers=headers)
+
+    job = client.post("/jobs", json={"kind": "session_repricing", "params": {"dry_run": True}}, headers=headers).json()
+    for _ in range(100):
+        status = client.get(f"/jobs/{job['id']}", headers=headers).json()["status"]
+        if status in ("succeeded", "failed"):
+            break
+        time.sleep(0.05)
+    assert status == "succeeded"
+    report = json.loads(client.get(f"/jobs/{job['id']}/result", headers=headers).content)
+    assert report["dry_run"] is True and report["changes"][0]["session_id"] == session_id
+    assert costs(client, headers) == {session_id: 60.0}
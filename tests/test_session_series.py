@@ -0,0 +1,133 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from backend.app.db.base import Base
+from backend.app.db.session import engine
+from backend.app.main import app
+
+DEFAULT_START_TIME = "10:00:00"
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def create_student(client: TestClient, headers: dict) -> int:
+    resp = client.post("/students", json={"parent_name": "Parent", "student_name": "Student"}, headers=headers)
+    return resp.json()["id"]
+
+
+def series_payload(student_id: int, **overrides) -> dict:
+    payload = {
+        "student_id": student_id,
+        "subject": "Math",
+        "duration_minutes": 60,
+        "session_date": "2030-01-07T10:00:00Z",
+        "start_time": DEFAULT_START_TIME,
+        "notes": "Semester",
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_weekly_series_with_count_creates_every_session():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'series1@example.com', 'secret')}"}
+    student_id = create_student(client, headers)
+
+    resp = client.post("/sessions/series", json=series_payload(student_id, count=16), headers=headers)
+    assert resp.status_code == 201
+    body = resp.json()
+    assert body["count"] == 16 and len(body["ids"]) == 16
+    assert body["first_session_date"].startswith("2030-01-07")
+    assert body["last_session_date"].startswith("2030-04-22")
+
+    sessions = client.get("/sessions", params={"student_id": student_id}, headers=headers).json()
+    assert sorted(s["id"] for s in sessions) == sorted(body["ids"])
+    assert {s["cost_total"] for s in sessions} == {60.0}
+    assert {s["rate_plan"] for s in sessions} == {"regular"}
+    assert {s["notes"] for s in sessions} == {"Semester"}
+    dates = sorted(s["session_date"][:10] for s in sessions)
+    assert dates[:3] == ["2030-01-07", "2030-01-14", "2030-01-21"]
+
+
+def test_biweekly_series_until_end_date_is_inclusive():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'series2@example.com', 'secret')}"}
+    student_id = create_student(client, headers)
+
+    resp = client.post(
+        "/sessions/series",
+        json=series_payload(student_id, frequency="biweekly", end_date="2030-02-18"),
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    ids = resp.json()["ids"]
+    dates = [client.get(f"/sessions/{session_id}", headers=headers).json()["session_date"][:10] for session_id in ids]
+    assert dates == ["2030-01-07", "2030-01-21", "2030-02-04", "2030-02-18"]
+
+
+def test_series_is_one_insert_and_bumps_sessions_version():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'series3@example.com', 'secret')}"}
+    student_id = create_student(client, headers)
+    before = client.get("/sync/versions", headers=headers).json()["versions"]["sessions"]
+
+    inserts = []
+
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO SESSIONS"):
+            inserts.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_inserts)
+    try:
+        resp = client.post("/sessions/series", json=series_payload(student_id, count=40), headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_inserts)
+    assert resp.status_code == 201
+    assert len(resp.json()["ids"]) == 40
+    assert len(inserts) == 1
+    assert client.get("/sync/versions", headers=headers).json()["versions"]["sessions"] > before
+
+
+@pytest.mark.parametrize(
+    "overrides, status_code",
+    [
+        ({}, 422),  # neither count nor end_date
+        ({"count": 3, "end_date": "2030-02-01"}, 422),
+        ({"end_date": "2029-12-01"}, 422),
+        ({"count": 101}, 422),
+        ({"end_date": "2032-01-01"}, 400),  # more than 100 weekly sessions
+        ({"count": 3, "duration_minutes": 90}, 400),
+    ],
+)
+def test_invalid_series_is_rejected(overrides, status_code):
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'series4@example.com', 'secret')}"}
+    student_id = create_student(client, headers)
+
+    resp = client.post("/sessions/series", json=series_payload(student_id, **overrides), headers=headers)
+    assert resp.status_code == status_code
+    assert client.get("/sessions", headers=headers).json() == []
+
+
+def test_series_rejects_other_owners_student():
+    client = TestClient(app)
+    owner = {"Authorization": f"Bearer {register_and_login(client, 'series5a@example.com', 'secret')}"}
+    other = {"Authorization": f"Bearer {register_and_login(client, 'series5b@example.com', 'secret')}"}
+    student_id = create_student(client, owner)
+
+    resp = client.post("/sessions/series", json=series_payload(student_id, count=2), headers=other)
+    assert resp.status_code == 404
@@ -0,0 +1,123 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import main
+from backend.app.core import dev_seed
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.models.user import User
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Cold boot of a worker in a fresh interpreter: importing the app the way
+# uvicorn does (create_app() builds every router) and the lifespan startup hooks. FastAPI,
+# SQLAlchemy and Pydantic are imported before the clock starts: their cost is
+# fixed and outside the app.
+BOOT_BUDGET_SECONDS = 1.0
+
+BOOT_SCRIPT = """
+import asyncio, os, sys, time
+import fastapi, pydantic, sqlalchemy.orm
+start = time.perf_counter()
+from backend.app.main import app, lifespan
+print(os.path.exists(sys.argv[1]))
+
+async def boot():
+    async with lifespan(app):
+        print(time.perf_counter() - start)
+
+asyncio.run(boot())
+"""
+
+
+@pytest.fixture
+def fresh_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_boot_is_fast_and_import_is_side_effect_free(tmp_path):
+    timings = []
+    # Best of three: a single cold start is at the mercy of the machine's load.
+    for run in range(3):
+        db_path = tmp_path / f"startup{run}.db"
+        env = {**os.environ, "COREBOX_DATABASE_URL": f"sqlite:///{db_path}"}
+        env.pop("PYTEST_CURRENT_TEST", None)
+        result = subprocess.run(
+            [sys.executable, "-c", BOOT_SCRIPT, str(db_path)],
+            cwd=PROJECT_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        db_touched_by_import, elapsed = result.stdout.strip().splitlines()[-2:]
+        assert db_touched_by_import == "False"
+        timings.append(float(elapsed))
+    assert min(timings) < BOOT_BUDGET_SECONDS
+
+
+def test_dev_seed_hashes_only_missing_users(fresh_db, monkeypatch):
+    calls = []
+
+    def fake_hash(password):
+        calls.append(password)
+        return "hashed"
+
+    monkeypatch.setattr(dev_seed, "get_password_hash", fake_hash)
+    db = SessionLocal()
+    try:
+        dev_seed.ensure_default_dev_owner(db, force=True)
+        assert len(calls) == 1
+        assert db.query(User).count() == len(dev_seed.DEFAULT_DEV_USERS)
+
+        dev_seed.ensure_default_dev_owner(db, force=True)
+        assert len(calls) == 1
+    finally:
+        db.close()
+
+
+def test_dev_seed_skipped_outside_development(fresh_db, monkeypatch):
+    monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+    monkeypatch.setattr(dev_seed.get_settings(), "environment", "production")
+    db = SessionLocal()
+    try:
+        dev_seed.ensure_default_dev_owner(db)
+        assert db.query(User).count() == 0
+    finally:
+        db.close()
+
+
+def test_startup_does_not_seed_unless_asked(fresh_db, monkeypatch):
+    monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+    settings = dev_seed.get_settings()
+    monkeypatch.setattr(settings, "environment", "development")
+    monkeypatch.setattr(settings, "seed_dev_users", False)
+    main.seed_default_dev_owner()
+    db = SessionLocal()
+    try:
+        assert db.query(User).count() == 0
+    finally:
+        db.close()
+
+    monkeypatch.setattr(settings, "seed_dev_users", True)
+    main.seed_default_dev_owner()
+    db = SessionLocal()
+    try:
+        assert db.query(User).count() == len(dev_seed.DEFAULT_DEV_USERS)
+    finally:
+        db.close()
+
+
+def test_create_app_mounts_every_router():
+    client = TestClient(main.create_app())
+    assert client.get("/leads").status_code == 401
+    assert client.get("/no-such-route").status_code == 404
+    assert "/admin/reports/batch" in client.get("/openapi.json").json()["paths"]
@@ -0,0 +1,302 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.models.data_version import StudentDataVersion
+from backend.app.models.student_kpi import StudentKpi
+from backend.app.services import student_kpis
+from backend.app.services.student_analytics_reporting import get_student_analytics
+from backend.app.services.student_kpis import list_student_kpis, refresh_student_kpis
+
+TODAY = date(2030, 6, 15)
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def create_student(client: TestClient, headers: dict, name: str) -> int:
+    resp = client.post("/students", json={"parent_name": f"{name}'s parent", "student_name": name}, headers=headers)
+    assert resp.status_code in (200, 201)
+    return resp.json()["id"]
+
+
+def create_session(client: TestClient, headers: dict, student_id: int, session_date: str, duration: int = 60) -> dict:
+    resp = client.post(
+        "/sessions",
+        json={
+            "student_id": student_id,
+            "subject": "Math",
+            "duration_minutes": duration,
+            "session_date": f"{session_date}T10:00:00Z",
+            "start_time": "10:00:00",
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def pay(client: TestClient, headers: dict, student_id: int, amount: str) -> None:
+    invoice = client.post(f"/invoices/{student_id}/generate", headers=headers).json()
+    resp = client.post(
+        f"/invoices/{invoice['id']}/payments", json={"invoice_id": invoice["id"], "amount": amount}, headers=headers
+    )
+    assert resp.status_code == 201
+
+
+def dashboard(client: TestClient, headers: dict, **params) -> dict:
+    resp = client.get("/admin/dashboard/students", params={"today": TODAY.isoformat(), **params}, headers=headers)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def snapshot_count() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(StudentKpi).count()
+    finally:
+        db.close()
+
+
+def stale_snapshots() -> set:
+    """Students whose snapshot was computed from an older version of their data."""
+    db = SessionLocal()
+    try:
+        rows = db.query(
+            StudentKpi.student_id, StudentKpi.data_version, func.coalesce(StudentDataVersion.version, 0)
+        ).outerjoin(StudentDataVersion, StudentDataVersion.student_id == StudentKpi.student_id)
+        return {student_id for student_id, stored, current in rows if stored != current}
+    finally:
+        db.close()
+
+
+def setup_owner(client: TestClient) -> tuple:
+    token = register_and_login(client, "kpis@example.com", "secret")
+    headers = {"Authorization": f"Bearer {token}"}
+    ada = create_student(client, headers, "Ada")
+    ben = create_student(client, headers, "Ben")
+    cy = create_student(client, headers, "Cy")
+    for day in ("2030-05-20", "2030-05-27", "2030-06-03", "2030-06-10", "2030-06-12"):
+        create_session(client, headers, ada, day)
+    create_session(client, headers, ben, "2030-04-01", duration=45)
+    create_session(client, headers, ben, "2030-06-11", duration=30)
+    pay(client, headers, ada, "100.00")
+    return headers, ada, ben, cy
+
+
+def test_snapshots_match_student_analytics():
+    client = TestClient(app)
+    headers, ada, ben, cy = setup_owner(client)
+    body = dashboard(client, headers)
+    assert body["total"] == 3
+
+    db = SessionLocal()
+    try:
+        analytics = {row["student_id"]: row for row in get_student_analytics(db, owner_id=1, today=TODAY)["students"]}
+    finally:
+        db.close()
+    for row in body["students"]:
+        kpis = analytics[row["student_id"]]["kpis"]
+        assert row["total_sessions_all_time"] == kpis["total_sessions"]
+        assert row["total_hours_all_time"] == kpis["total_hours"]
+        assert row["consistency_score_0_100"] == kpis["consistency_score_0_100"]
+        assert row["current_session_streak_weeks"] == kpis["current_session_streak_weeks"]
+        assert row["total_invoiced_all_time"] == kpis["total_invoiced"]
+        assert row["total_paid_all_time"] == kpis["total_paid"]
+        assert row["total_outstanding_all_time"] == kpis["total_outstanding"]
+    by_id = {row["student_id"]: row for row in body["students"]}
+    assert by_id[ada]["current_session_streak_weeks"] == 4
+    assert by_id[cy]["total_sessions_all_time"] == 0
+
+
+def test_writes_leave_snapshots_stale_until_refreshed():
+    client = TestClient(app)
+    headers, ada, ben, cy = setup_owner(client)
+    dashboard(client, headers)
+    # The refresh runs as a background task after the first read.
+    assert snapshot_count() == 3 and stale_snapshots() == set()
+
+    session = create_session(client, headers, cy, "2030-06-14")
+    assert stale_snapshots() == {cy}
+    row = next(row for row in dashboard(client, headers)["students"] if row["student_id"] == cy)
+    assert row["total_sessions_all_time"] == 1 and row["current_session_streak_weeks"] == 1
+    assert stale_snapshots() == set()
+
+    client.delete(f"/sessions/{session['id']}", headers=headers)
+    pay(client, headers, ben, "10.00")
+    rows = {row["student_id"]: row for row in dashboard(client, headers)["students"]}
+    assert rows[cy]["total_sessions_all_time"] == 0
+    assert rows[ben]["total_paid_all_time"] == "10.00"
+
+    resp = client.post(
+        "/sessions/series",
+        json={
+            "student_id": cy,
+            "subject": "Math",
+            "duration_minutes": 60,
+            "session_date": "2030-06-01T10:00:00Z",
+            "start_time": "10:00:00",
+            "frequency": "weekly",
+            "count": 2,
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    rows = {row["student_id"]: row for row in dashboard(client, headers)["students"]}
+    assert rows[cy]["total_sessions_all_time"] == 2
+
+
+def test_a_write_recomputes_and_rebuilds_only_its_students(monkeypatch):
+    client = TestClient(app)
+    headers, ada, ben, cy = setup_owner(client)
+    dashboard(client, headers)
+    create_session(client, headers, cy, "2030-06-14")
+    pay(client, headers, ben, "10.00")
+    assert stale_snapshots() == {ben, cy}
+
+    computed = []
+    compute = student_kpis._compute_snapshots
+
+    def record(db, owner_id, versions, today):
+        computed.append(sorted(versions))
+        return compute(db, owner_id, versions, today)
+
+    monkeypatch.setattr(student_kpis, "_compute_snapshots", record)
+    params = {"sort_by": "total_sessions", "sort_order": "desc", "limit": 2}
+    db = SessionLocal()
+    try:
+        # Ada's fresh row comes from the snapshot table, Ben and Cy are computed for the read.
+        stale_page = list_student_kpis(db, owner_id=1, today=TODAY, **params)
+        assert computed == [[ben, cy]]
+        assert refresh_student_kpis(db, 1, TODAY) == 2
+        assert computed == [[ben, cy], [ben, cy]]
+        assert list_student_kpis(db, owner_id=1, today=TODAY, **params) == stale_page
+    finally:
+        db.close()
+    assert computed == [[ben, cy], [ben, cy]]
+    assert stale_page["total"] == 3
+    assert [row["student_id"] for row in stale_page["students"]] == [ada, ben]
+    assert stale_page["students"][1]["total_paid_all_time"] == "10.00"
+
+
+def test_rows_rebuilt_from_data_a_write_has_since_changed_are_ignored():
+    client = TestClient(app)
+    headers, ada, _, cy = setup_owner(client)
+    dashboard(client, headers)
+    db = SessionLocal()
+    try:
+        before = [
+            {column.name: getattr(kpi, column.name) for column in StudentKpi.__table__.columns}
+            for kpi in db.query(StudentKpi).order_by(StudentKpi.student_id)
+        ]
+    finally:
+        db.close()
+
+    create_session(client, headers, cy, "2030-06-14")
+    # A refresh that read before the write commits its rows after it.
+    db = SessionLocal()
+    try:
+        db.query(StudentKpi).delete()
+        db.bulk_insert_mappings(StudentKpi, before)
+        db.commit()
+    finally:
+        db.close()
+
+    row = next(row for row in dashboard(client, headers)["students"] if row["student_id"] == cy)
+    assert row["total_sessions_all_time"] == 1
+
+
+def test_listing_never_writes():
+    client = TestClient(app)
+    headers, ada, ben, _ = setup_owner(client)
+    db = SessionLocal()
+    try:
+        body = list_student_kpis(db, owner_id=1, today=TODAY, sort_by="total_sessions", sort_order="desc", limit=2)
+    finally:
+        db.close()
+    assert snapshot_count() == 0
+    assert body["total"] == 3
+    assert [row["student_id"] for row in body["students"]] == [ada, ben]
+
+    # The stale fallback and the snapshot table agree on order and paging.
+    dashboard(client, headers)
+    assert snapshot_count() == 3
+    db = SessionLocal()
+    try:
+        assert list_student_kpis(db, owner_id=1, today=TODAY, sort_by="total_sessions", sort_order="desc", limit=2) == body
+    finally:
+        db.close()
+
+
+def test_rolling_figures_follow_the_requested_week():
+    client = TestClient(app)
+    headers, ada, _, _ = setup_owner(client)
+    current = next(row for row in dashboard(client, headers)["students"] if row["student_id"] == ada)
+    later = client.get(
+        "/admin/dashboard/students", params={"today": "2030-08-15"}, headers=headers
+    ).json()["students"]
+    assert current["consistency_score_0_100"] == 50
+    assert next(row for row in later if row["student_id"] == ada)["consistency_score_0_100"] == 0
+
+
+def test_sorting_and_paging():
+    client = TestClient(app)
+    headers, ada, ben, cy = setup_owner(client)
+
+    by_sessions = dashboard(client, headers, sort_by="total_sessions", sort_order="desc")
+    assert [row["student_id"] for row in by_sessions["students"]] == [ada, ben, cy]
+    by_name = dashboard(client, headers, sort_by="student_display_name", sort_order="desc")
+    assert [row["student_display_name"] for row in by_name["students"]] == ["Cy", "Ben", "Ada"]
+
+    page = dashboard(client, headers, sort_by="total_outstanding", sort_order="desc", skip=1, limit=1)
+    assert page["total"] == 3 and len(page["students"]) == 1
+    assert dashboard(client, headers, skip=10)["total"] == 3
+
+    for params in ({"sort_by": "nope"}, {"sort_order": "sideways"}):
+        resp = client.get("/admin/dashboard/students", params=params, headers=headers)
+        assert resp.status_code == 400
+
+
+def test_filters_apply_to_dashboard_and_analytics():
+    client = TestClient(app)
+    headers, ada, ben, cy = setup_owner(client)
+    client.put(f"/students/{cy}", json={"status": "inactive"}, headers=headers)
+
+    def ids(path: str, **params) -> list:
+        resp = client.get(path, params={"today": TODAY.isoformat(), **params}, headers=headers)
+        assert resp.status_code == 200
+        return [row["student_id"] for row in resp.json()["students"]]
+
+    for path in ("/admin/dashboard/students", "/admin/reports/student-analytics"):
+        assert ids(path, status="inactive") == [cy]
+        assert ids(path, min_consistency=25) == [ada]
+        assert ids(path, max_consistency=0) == [cy]
+        assert ids(path, min_outstanding="0.01", sort_by="total_outstanding", sort_order="desc") == [ada, ben]
+        assert ids(path, last_session_before="2030-06-12") == [ben, cy]
+
+    page = client.get(
+        "/admin/reports/student-analytics",
+        params={"today": TODAY.isoformat(), "sort_by": "total_sessions", "sort_order": "desc", "limit": 2},
+        headers=headers,
+    ).json()
+    assert page["total"] == 3
+    assert [row["student_id"] for row in page["students"]] == [ada, ben]
+    assert len(page["students"][0]["weekly_activity_last_8_weeks"]) == 8
+    assert client.get("/admin/reports/student-analytics", params={"min_consistency": 101}, headers=headers).status_code == 422
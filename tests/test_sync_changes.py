@@ -0,0 +1,94 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.db.base import Base
+from backend.app.db.session import engine
+from backend.app.main import app
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def get_changes(client: TestClient, headers: dict, since: str | None = None) -> dict:
+    params = {"since": since} if since else {}
+    resp = client.get("/sync/changes", params=params, headers=headers)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_full_snapshot_without_token():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'delta1@example.com', 'secret')}"}
+    client.post("/leads/", json={"parent_name": "P", "student_name": "S"}, headers=headers)
+    client.post("/students", json={"parent_name": "P", "student_name": "S"}, headers=headers)
+
+    body = get_changes(client, headers)
+    assert body["token"]
+    assert len(body["leads"]["updated"]) == 1
+    assert len(body["students"]["updated"]) == 1
+    assert body["sessions"] == {"updated": [], "deleted": []}
+    assert body["invoices"] == {"updated": [], "deleted": []}
+
+
+def test_changes_since_token_include_updates_and_deletes():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'delta2@example.com', 'secret')}"}
+    lead = client.post("/leads/", json={"parent_name": "P", "student_name": "S"}, headers=headers).json()
+    student = client.post("/students", json={"parent_name": "P", "student_name": "S"}, headers=headers).json()
+    session = client.post(
+        "/sessions",
+        json={
+            "student_id": student["id"],
+            "subject": "Math",
+            "duration_minutes": 60,
+            "session_date": "2030-01-01T10:00:00Z",
+            "start_time": "10:00:00",
+        },
+        headers=headers,
+    ).json()
+    token = get_changes(client, headers)["token"]
+
+    client.put(f"/leads/{lead['id']}", json={"parent_name": "Renamed"}, headers=headers)
+    client.delete(f"/sessions/{session['id']}", headers=headers)
+    client.delete(f"/students/{student['id']}", headers=headers)
+
+    body = get_changes(client, headers, token)
+    assert [row["parent_name"] for row in body["leads"]["updated"]] == ["Renamed"]
+    assert body["sessions"]["deleted"] == [session["id"]]
+    assert body["students"]["updated"] == []
+    assert body["students"]["deleted"] == [student["id"]]
+
+    client.delete(f"/leads/{lead['id']}", headers=headers)
+    body = get_changes(client, headers, token)
+    assert body["leads"] == {"updated": [], "deleted": [lead["id"]]}
+
+
+def test_changes_are_owner_scoped():
+    client = TestClient(app)
+    headers_a = {"Authorization": f"Bearer {register_and_login(client, 'delta3a@example.com', 'secret')}"}
+    headers_b = {"Authorization": f"Bearer {register_and_login(client, 'delta3b@example.com', 'secret')}"}
+    lead = client.post("/leads/", json={"parent_name": "P", "student_name": "S"}, headers=headers_a).json()
+    token_b = get_changes(client, headers_b)["token"]
+    client.delete(f"/leads/{lead['id']}", headers=headers_a)
+
+    body = get_changes(client, headers_b, token_b)
+    assert body["leads"] == {"updated": [], "deleted": []}
+
+
+def test_invalid_token_is_rejected():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'delta4@example.com', 'secret')}"}
+    resp = client.get("/sync/changes", params={"since": "not-a-token"}, headers=headers)
+    assert resp.status_code == 400
@@ -0,0 +1,131 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.models.user import User
+from backend.app.services.data_versions import bump_owner_data_versions, get_owner_data_version, get_owner_data_versions
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def get_versions(client: TestClient, token: str) -> dict:
+    resp = client.get("/sync/versions", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200
+    return resp.json()["versions"]
+
+
+def test_versions_start_at_zero():
+    client = TestClient(app)
+    token = register_and_login(client, "sync1@example.com", "secret")
+    assert get_versions(client, token) == {"leads": 0, "students": 0, "sessions": 0, "billing": 0, "rates": 0}
+
+
+def test_writes_bump_only_their_domain():
+    client = TestClient(app)
+    token = register_and_login(client, "sync2@example.com", "secret")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    lead = client.post("/leads/", json={"parent_name": "P", "student_name": "S"}, headers=headers).json()
+    after_lead = get_versions(client, token)
+    assert after_lead["leads"] > 0
+    assert after_lead["students"] == 0 and after_lead["sessions"] == 0 and after_lead["billing"] == 0
+
+    student = client.post("/students", json={"parent_name": "P", "student_name": "S"}, headers=headers).json()
+    after_student = get_versions(client, token)
+    assert after_student["students"] == 1
+    assert after_student["leads"] == after_lead["leads"]
+
+    client.post(
+        "/sessions",
+        json={
+            "student_id": student["id"],
+            "subject": "Math",
+            "duration_minutes": 60,
+            "session_date": "2030-01-01T10:00:00Z",
+            "start_time": "10:00:00",
+        },
+        headers=headers,
+    )
+    after_session = get_versions(client, token)
+    assert after_session["sessions"] == 1
+
+    resp = client.post(f"/invoices/{student['id']}/generate", headers=headers)
+    assert resp.status_code == 201
+    after_invoice = get_versions(client, token)
+    assert after_invoice["billing"] > 0
+    assert after_invoice["sessions"] > after_session["sessions"]  # billing_status flipped to invoiced
+
+    # No-op update does not bump anything.
+    client.put(f"/leads/{lead['id']}", json={"parent_name": "P"}, headers=headers)
+    assert get_versions(client, token) == after_invoice
+
+
+def test_versions_are_owner_scoped():
+    client = TestClient(app)
+    token_a = register_and_login(client, "sync3a@example.com", "secret")
+    token_b = register_and_login(client, "sync3b@example.com", "secret")
+
+    client.post("/students", json={"parent_name": "P", "student_name": "S"}, headers={"Authorization": f"Bearer {token_a}"})
+    assert get_versions(client, token_a)["students"] == 1
+    assert get_versions(client, token_b)["students"] == 0
+
+    db = SessionLocal()
+    try:
+        owner_a = client.get("/sync/versions", headers={"Authorization": f"Bearer {token_a}"}).json()["owner_id"]
+        assert get_owner_data_version(db, owner_a, ("students",)) == 1
+        assert get_owner_data_version(db, owner_a, ("leads", "billing")) == 0
+    finally:
+        db.close()
+
+
+def test_lead_write_keeps_report_etag():
+    client = TestClient(app)
+    token = register_and_login(client, "sync4@example.com", "secret")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/admin/reports/aging-summary", headers=headers)
+    client.post("/leads/", json={"parent_name": "P", "student_name": "S"}, headers=headers)
+    repeat = client.get("/admin/reports/aging-summary", headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert repeat.status_code == 304
+
+
+def test_bump_is_a_single_upsert():
+    db = SessionLocal()
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        owner = User(email="sync5@example.com", hashed_password="x")
+        db.add(owner)
+        db.commit()
+        owner_id = owner.id
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            bump_owner_data_versions(db.connection(), [(owner_id, "leads"), (owner_id, "billing")])
+            bump_owner_data_versions(db.connection(), [(owner_id, "leads")])
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        db.commit()
+        assert len(statements) == 2 and all("ON CONFLICT" in statement for statement in statements)
+        versions = get_owner_data_versions(db, owner_id)
+        assert (versions["leads"], versions["billing"], versions["students"]) == (2, 1, 0)
+    finally:
+        db.close()
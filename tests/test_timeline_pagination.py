@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, text
+
+from backend.app.db.base import Base
+from backend.app.db.session import SessionLocal, engine
+from backend.app.main import app
+from backend.app.models.timeline import TimelineEvent
+from backend.app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def create_lead(client: TestClient, headers: dict) -> int:
+    resp = client.post("/leads/", json={"parent_name": "P", "student_name": "S"}, headers=headers)
+    assert resp.status_code == 200
+    return resp.json()["id"]
+
+
+def owner_id_for(email: str) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(User.id).filter(User.email == email).scalar()
+    finally:
+        db.close()
+
+
+def add_rows(model, rows: list) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(insert(model.__table__), rows)
+        db.commit()
+    finally:
+        db.close()
+
+
+def add_events(lead_id: int, owner_id: int, count: int, start: datetime, step: timedelta = timedelta(minutes=1)) -> None:
+    add_rows(
+        TimelineEvent,
+        [
+            {
+                "lead_id": lead_id,
+                "owner_id": owner_id,
+                "event_type": "automated",
+                "description": f"Event {i}",
+                # Pairs of events share a timestamp so pages must break ties on id.
+                "created_at": start + step * (i // 2),
+            }
+            for i in range(count)
+        ],
+    )
+
+
+def read_all_pages(client: TestClient, url: str, headers: dict, **params) -> tuple:
+    items, pages, cursor = [], 0, None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        resp = client.get(url, params=query, headers=headers)
+        assert resp.status_code == 200
+        items.extend(resp.json())
+        pages += 1
+        cursor = resp.headers.get("x-next-cursor")
+        if not cursor:
+            return items, pages
+
+
+def test_timeline_pages_follow_cursor_in_order():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'page1@example.com', 'secret')}"}
+    lead_id = create_lead(client, headers)
+    add_events(lead_id, owner_id_for("page1@example.com"), 45, datetime(2030, 1, 1, tzinfo=timezone.utc))
+
+    first = client.get(f"/leads/{lead_id}/timeline", params={"limit": 10}, headers=headers)
+    assert len(first.json()) == 10
+    assert first.headers["x-next-cursor"]
+
+    events, pages = read_all_pages(client, f"/leads/{lead_id}/timeline", headers, limit=10)
+    assert pages == 5
+    assert len(events) == 46  # plus the lead_created event
+    assert len({e["id"] for e in events}) == 46
+    keys = [(e["created_at"], e["id"]) for e in events]
+    assert keys == sorted(keys)
+
+    everything = client.get(f"/leads/{lead_id}/timeline", params={"limit": 100}, headers=headers)
+    assert "x-next-cursor" not in everything.headers
+    assert [e["id"] for e in everything.json()] == [e["id"] for e in events]
+
+
+def test_notes_pages_follow_cursor():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'page2@example.com', 'secret')}"}
+    lead_id = create_lead(client, headers)
+    for i in range(7):
+        assert client.post(f"/leads/{lead_id}/notes", json={"content": f"Note {i}"}, headers=headers).status_code == 200
+
+    notes, pages = read_all_pages(client, f"/leads/{lead_id}/notes", headers, limit=3)
+    assert pages == 3
+    assert [n["content"] for n in notes] == [f"Note {i}" for i in range(7)]
+
+
+def test_invalid_cursor_is_rejected():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'page3@example.com', 'secret')}"}
+    lead_id = create_lead(client, headers)
+    for url in (f"/leads/{lead_id}/timeline", f"/leads/{lead_id}/notes", "/leads/activity/recent"):
+        assert client.get(url, params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+
+
+def test_recent_activity_merges_leads_newest_first():
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {register_and_login(client, 'page4@example.com', 'secret')}"}
+    owner_id = owner_id_for("page4@example.com")
+    leads = [create_lead(client, headers) for _ in range(3)]
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    for offset, lead_id in enumerate(leads):
+        add_events(lead_id, owner_id, 20, start + timedelta(seconds=offset * 20), step=timedelta(minutes=offset + 1))
+
+    other_headers = {"Authorization": f"Bearer {register_and_login(client, 'page4b@example.com', 'secret')}"}
+    create_lead(client, other_headers)
+
+    feed, _ = read_all_pages(client, "/leads/activity/recent", headers, limit=7)
+    assert len(feed) == 63  # 3 x (20 automated + lead_created)
+    assert {e["lead_id"] for e in feed} == set(leads)
+    keys = [(e["created_at"], e["id"]) for e in feed]
+    assert keys == sorted(keys, reverse=True)
+
+    chosen = leads[:2]
+    merged, pages = read_all_pages(client, "/leads/activity/recent", headers, limit=7, lead_id=chosen)
+    assert pages == 6
+    assert [e["id"] for e in merged] == [e["id"] for e in feed if e["lead_id"] in chosen]
+
+    # Leads of another owner contribute nothing.
+    foreign = client.get("/leads/activity/recent", params={"lead_id": leads}, headers=other_headers)
+    assert foreign.json() == []
+
+
+def test_pagination_queries_use_lead_created_at_indexes():
+    db = SessionLocal()
+    try:
+        for table, index in (
+            ("timeline_events", "ix_timeline_events_lead_created_at_id"),
+            ("notes", "ix_notes_lead_created_at_id"),
+        ):
+            plan = db.execute(
+                text(
+                    f"EXPLAIN QUERY PLAN SELECT * FROM {table} WHERE lead_id = 1 "
+                    "AND (created_at > '2030-01-01' OR (created_at = '2030-01-01' AND id > 5)) "
+                    "ORDER BY created_at, id LIMIT 101"
+                )
+            ).fetchall()
+            details = " ".join(row[-1] for row in plan)
+            assert index in details
+            assert "TEMP B-TREE" not in details
+    finally:
+        db.close()